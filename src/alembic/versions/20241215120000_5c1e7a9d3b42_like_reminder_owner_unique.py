@@ -0,0 +1,62 @@
+"""like and reminder owner unique indexes
+
+Revision ID: 5c1e7a9d3b42
+Revises: 2917cb03834d
+Create Date: 2024-12-15 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e7a9d3b42"
+down_revision: Union[str, None] = "2917cb03834d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    ("project_like", "project_id", "project", "likes"),
+    ("news_like", "news_id", "news", "likes"),
+    ("clip_like", "clip_id", "clip", "likes"),
+    ("news_reminder", "news_id", "news", "reminder"),
+)
+OWNERS = ("user_id", "staff_id")
+
+
+def upgrade() -> None:
+    for table, target, counted, counter in TABLES:
+        # Drop duplicates left by the old check-then-insert flow
+        for owner in OWNERS:
+            duplicates = f"""
+                DELETE FROM {table} a
+                USING {table} b
+                WHERE a.{owner} = b.{owner}
+                  AND a.{target} = b.{target}
+                  AND a.ctid > b.ctid
+            """
+            op.execute(duplicates)
+            op.create_index(
+                f"ix_{table}_{owner}_{target}",
+                table,
+                [owner, target],
+                unique=True,
+                postgresql_where=sa.text(f"{owner} IS NOT NULL"),
+            )
+
+        # Keep the denormalized counters in line with the remaining rows
+        recount = f"""
+            UPDATE {counted}
+            SET {counter} = (
+                SELECT count(*) FROM {table} WHERE {table}.{target} = {counted}.id
+            )
+        """
+        op.execute(recount)
+
+
+def downgrade() -> None:
+    for table, target, _, _ in reversed(TABLES):
+        for owner in reversed(OWNERS):
+            op.drop_index(f"ix_{table}_{owner}_{target}", table_name=table)
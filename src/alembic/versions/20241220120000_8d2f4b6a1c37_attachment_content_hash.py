@@ -0,0 +1,37 @@
+"""attachment content hash and reference count
+
+Revision ID: 8d2f4b6a1c37
+Revises: 5c1e7a9d3b42
+Create Date: 2024-12-20 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2f4b6a1c37"
+down_revision: Union[str, None] = "5c1e7a9d3b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "attachment", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+    op.add_column(
+        "attachment",
+        sa.Column("ref_count", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.create_index(
+        "ix_attachment_content_hash", "attachment", ["content_hash"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attachment_content_hash", table_name="attachment")
+    op.drop_column("attachment", "ref_count")
+    op.drop_column("attachment", "content_hash")
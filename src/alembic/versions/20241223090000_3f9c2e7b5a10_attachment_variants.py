@@ -0,0 +1,30 @@
+"""attachment image variants
+
+Revision ID: 3f9c2e7b5a10
+Revises: 8d2f4b6a1c37
+Create Date: 2024-12-23 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c2e7b5a10"
+down_revision: Union[str, None] = "8d2f4b6a1c37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "attachment",
+        sa.Column("variants", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("attachment", "variants")
@@ -0,0 +1,54 @@
+"""news reminder due queue
+
+Revision ID: b7e3a1c5d9f2
+Revises: 6a4d8e2f1b93
+Create Date: 2024-12-27 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3a1c5d9f2"
+down_revision: Union[str, None] = "6a4d8e2f1b93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "news_reminder",
+        sa.Column(
+            "notify_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "news_reminder",
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Reminders queued before were held by workers, schedule them from the news date
+    op.execute(
+        "UPDATE news_reminder SET notify_at = news.date - interval '1 day' "
+        "FROM news WHERE news.id = news_reminder.news_id"
+    )
+    # The old flow already mailed reminders that came due, don't send them again
+    op.execute("UPDATE news_reminder SET sent_at = now() WHERE notify_at <= now()")
+    op.create_index(
+        "ix_news_reminder_due",
+        "news_reminder",
+        ["notify_at"],
+        unique=False,
+        postgresql_where=sa.text("sent_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_news_reminder_due", table_name="news_reminder")
+    op.drop_column("news_reminder", "sent_at")
+    op.drop_column("news_reminder", "notify_at")
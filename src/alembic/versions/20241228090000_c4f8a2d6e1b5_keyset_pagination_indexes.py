@@ -0,0 +1,37 @@
+"""keyset pagination indexes
+
+Revision ID: c4f8a2d6e1b5
+Revises: b7e3a1c5d9f2
+Create Date: 2024-12-28 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4f8a2d6e1b5"
+down_revision: Union[str, None] = "b7e3a1c5d9f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("attachment", "created_at"),
+    ("project", "created_at"),
+    ("project", "start_date"),
+    ("news", "created_at"),
+    ("news", "date"),
+    ("clip", "created_at"),
+    ("clip", "date"),
+]
+
+
+def upgrade() -> None:
+    for table, column in INDEXES:
+        op.create_index(f"ix_{table}_{column}_id", table, [column, "id"], unique=False)
+
+
+def downgrade() -> None:
+    for table, column in reversed(INDEXES):
+        op.drop_index(f"ix_{table}_{column}_id", table_name=table)
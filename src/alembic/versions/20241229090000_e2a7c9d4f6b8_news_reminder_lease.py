@@ -0,0 +1,29 @@
+"""news reminder lease
+
+Revision ID: e2a7c9d4f6b8
+Revises: c4f8a2d6e1b5
+Create Date: 2024-12-29 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a7c9d4f6b8"
+down_revision: Union[str, None] = "c4f8a2d6e1b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "news_reminder",
+        sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("news_reminder", "claimed_until")
@@ -1,10 +1,14 @@
 from collections.abc import AsyncIterator, Callable
+from typing import Any
 
 from a8t_tools.db import pagination, sorting
 from a8t_tools.security.tokens import override_user_token
 from fastapi import Depends, Query
 from fastapi.security import OAuth2PasswordBearer
 
+from app.domain.common.enums import CountModes
+from app.domain.common.pagination import KeysetPagination, OffsetPagination
+
 
 def user_token_dep_factory(
     reusable_oauth2: OAuth2PasswordBearer,
@@ -20,15 +24,34 @@ def user_token_dep_factory(
 
 def get_skip_limit_pagination_dep(
     schema: type[pagination.SchemaType],
-) -> Callable[[int, int], pagination.PaginationCallable[pagination.SchemaType]]:
+    default_count: CountModes = CountModes.exact,
+) -> Callable[[int, int, CountModes], OffsetPagination[pagination.SchemaType]]:
     def get_skip_limit_pagination(
-        skip: int = Query(0), limit: int = Query(100)
-    ) -> pagination.PaginationCallable[pagination.SchemaType]:
-        return pagination.skip_limit_pagination_factory(schema, skip, limit)
+        skip: int = Query(0),
+        limit: int = Query(100),
+        count: CountModes = Query(default_count),
+    ) -> OffsetPagination[pagination.SchemaType]:
+        return OffsetPagination(schema, skip, limit, count)
 
     return get_skip_limit_pagination
 
 
+def get_cursor_pagination_dep(
+    schema: type[pagination.SchemaType],
+    sorting_dep: Callable[..., sorting.SortingData[Any]],
+    default_count: CountModes = CountModes.none,
+) -> Callable[..., KeysetPagination[pagination.SchemaType]]:
+    def get_cursor_pagination(
+        cursor: str | None = Query(None),
+        limit: int = Query(100, ge=1, le=1000),
+        count: CountModes = Query(default_count),
+        sorting_data: sorting.SortingData[Any] = Depends(sorting_dep),
+    ) -> KeysetPagination[pagination.SchemaType]:
+        return KeysetPagination(schema, sorting_data, cursor, limit, count)
+
+    return get_cursor_pagination
+
+
 def get_sort_order_sorting_dep(
     sort_field_type: type[sorting.SortFieldType],
     default_field: sorting.SortFieldType | None = None,
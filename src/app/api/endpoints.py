@@ -12,6 +12,7 @@ import app.domain.users.registration.views
 import app.domain.users.staff.views
 import app.domain.vk.views
 from app.api import schemas
+from app.domain.common.enums import ResponseCacheScopes
 
 auth = APIRouter(prefix="/authentication")
 auth.include_router(
@@ -94,3 +95,14 @@ router.include_router(directions)
 router.include_router(management)
 router.include_router(storage_router)
 router.include_router(vk)
+
+# Public reads served by ResponseCacheMiddleware, by path prefix. The project
+# details and staff list embed staff profiles, which change outside of the
+# projects scope, so they are left out.
+cached_routes = {
+    "/news/v1/get": ResponseCacheScopes.news,
+    "/directions/v1/get": ResponseCacheScopes.news,
+    "/clips/v1/get": ResponseCacheScopes.clips,
+    "/projects/v1/get/list": ResponseCacheScopes.projects,
+    "/projects/v1/get/attachment/list": ResponseCacheScopes.projects,
+}
@@ -0,0 +1,157 @@
+import hashlib
+from collections.abc import Mapping
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.domain.common.enums import ResponseCacheScopes
+from app.domain.common.response_cache import CachedResponse, ResponseCache
+
+
+class ResponseCacheMiddleware:
+    """Answers GET requests of ``routes`` from the ``ResponseCache``.
+
+    ``routes`` maps path prefixes to the scope their responses belong to.
+    Successful JSON responses to anonymous callers are kept as bytes under
+    (path, query) and are served with a strong ETag; a matching
+    ``If-None-Match`` gets a bodiless 304. Requests carrying a token pass
+    through, since their bodies hold the caller's own ``liked`` and
+    ``reminded`` flags. Anything else passes through untouched as well.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: ResponseCache,
+        routes: Mapping[str, ResponseCacheScopes],
+    ) -> None:
+        self.app = app
+        self.cache = cache
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not self.cache.enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        cache_scope = self._match(scope["path"])
+        if cache_scope is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if headers.get("authorization") or headers.get("token"):
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], scope["query_string"])
+        response = self.cache.get(key)
+        if response is None:
+            if scope["method"] != "GET":
+                await self.app(scope, receive, send)
+                return
+            response = await self._render(scope, receive, send, key, cache_scope)
+            if response is None:
+                return
+
+        await self._send_cached(response, headers, scope["method"] == "HEAD", send)
+
+    def _match(self, path: str) -> ResponseCacheScopes | None:
+        for prefix, cache_scope in self.routes.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return cache_scope
+        return None
+
+    async def _render(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        key: tuple[str, bytes],
+        cache_scope: ResponseCacheScopes,
+    ) -> CachedResponse | None:
+        # Taken before the handler runs: a change committed meanwhile leaves
+        # the entry already outdated instead of hiding the change
+        version = self.cache.version(cache_scope)
+        start: Message | None = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def capture(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                response_headers = Headers(raw=message["headers"])
+                passthrough = (
+                    message["status"] != 200
+                    or "set-cookie" in response_headers
+                    or not response_headers.get("content-type", "").startswith(
+                        "application/json"
+                    )
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+            elif passthrough:
+                await send(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        if start is None:
+            return None
+
+        body = b"".join(chunks)
+        response = CachedResponse(
+            scope=cache_scope,
+            version=version,
+            etag='"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest(),
+            body=body,
+            headers=[
+                (name, value)
+                for name, value in start["headers"]
+                if name.lower() in (b"content-type", b"vary")
+            ],
+        )
+        self.cache.set(key, response)
+        return response
+
+    async def _send_cached(
+        self,
+        response: CachedResponse,
+        headers: Headers,
+        head: bool,
+        send: Send,
+    ) -> None:
+        response_headers = MutableHeaders(raw=list(response.headers))
+        response_headers["etag"] = response.etag
+        response_headers["cache-control"] = "no-cache"
+        response_headers.add_vary_header("Authorization, Token")
+        if self._not_modified(response.etag, headers.get("if-none-match")):
+            del response_headers["content-type"]
+            await send(
+                dict(
+                    type="http.response.start",
+                    status=304,
+                    headers=response_headers.raw,
+                )
+            )
+            await send(dict(type="http.response.body", body=b""))
+            return
+
+        response_headers["content-length"] = str(len(response.body))
+        await send(
+            dict(type="http.response.start", status=200, headers=response_headers.raw)
+        )
+        await send(dict(type="http.response.body", body=b"" if head else response.body))
+
+    @staticmethod
+    def _not_modified(etag: str, if_none_match: str | None) -> bool:
+        if not if_none_match:
+            return False
+        candidates = [x.strip().removeprefix("W/") for x in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
@@ -3,7 +3,7 @@ from typing import Any
 
 from dotenv import load_dotenv
 from passlib.context import CryptContext
-from pydantic import Field, field_validator
+from pydantic import AliasChoices, Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 load_dotenv()
@@ -33,6 +33,14 @@ class SecuritySettings(BaseSettings):
     access_expiration_min: int = Field(default=15)
     refresh_expiration_min: int = Field(default=60 * 24 * 7)
 
+    hashing_pool_size: int = Field(default=4)
+    hashing_max_pending: int = Field(default=64)
+    hashing_use_processes: bool = Field(default=False)
+
+    token_cache_enabled: bool = Field(default=True)
+    token_cache_max_entries: int = Field(default=10000)
+    token_cache_ttl_seconds: int = Field(default=900)
+
     model_config = SettingsConfigDict(env_prefix="SECURITY_")
 
 
@@ -56,6 +64,79 @@ class DatabaseSettings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="DB_")
 
 
+class UserCacheSettings(BaseSettings):
+    enabled: bool = Field(default=True)
+    ttl_seconds: int = Field(default=60)
+    max_entries: int = Field(default=10000)
+    broadcast_channel: str | None = Field(default="user_cache")
+    model_config = SettingsConfigDict(env_prefix="USER_CACHE_")
+
+
+class ResponseCacheSettings(BaseSettings):
+    enabled: bool = Field(default=False)
+    ttl_seconds: int = Field(default=300)
+    max_entries: int = Field(default=2000)
+    max_body_bytes: int = Field(default=1024 * 1024)
+    broadcast_channel: str | None = Field(default=None)
+
+    # Without the channel other workers keep serving a scope after a change
+    @model_validator(mode="after")
+    def enabled_cache_needs_channel(self) -> "ResponseCacheSettings":
+        if self.enabled and not self.broadcast_channel:
+            raise ValueError("RESPONSE_CACHE_BROADCAST_CHANNEL is required")
+        return self
+
+    model_config = SettingsConfigDict(env_prefix="RESPONSE_CACHE_")
+
+
+class EmailSettings(BaseSettings):
+    host: str = Field(default="smtp.yandex.ru")
+    port: int = Field(default=465)
+    address: str = Field(default=..., description="Sender mailbox and SMTP login")
+    password: str | None = Field(default=None)
+    use_tls: bool = Field(default=True)
+    pool_size: int = Field(default=2)
+    idle_timeout_seconds: float = Field(default=60)
+    timeout_seconds: float = Field(default=30)
+    outbox_batch_size: int = Field(default=50)
+    outbox_max_attempts: int = Field(default=8)
+    outbox_retry_seconds: int = Field(default=30)
+    model_config = SettingsConfigDict(env_prefix="EMAIL_")
+
+
+class NewsSettings(BaseSettings):
+    reminder_lead_hours: int = Field(default=24)
+    reminder_page_size: int = Field(default=200)
+    reminder_lease_seconds: int = Field(default=3600)
+    model_config = SettingsConfigDict(env_prefix="NEWS_")
+
+
+class LikesSettings(BaseSettings):
+    buffer_enabled: bool = Field(default=False)
+    flush_interval_ms: int = Field(default=500)
+    flush_max_events: int = Field(default=1000)
+    flush_max_entities: int = Field(default=10000)
+    flush_on_shutdown: bool = Field(default=True)
+    model_config = SettingsConfigDict(env_prefix="LIKES_")
+
+
+class VkSettings(BaseSettings):
+    api_uri: str = Field(default="https://api.vk.com")
+    token: str | None = Field(
+        default=None, validation_alias=AliasChoices("VK_TOKEN", "TOKEN")
+    )
+    group_id: str | None = Field(
+        default=None, validation_alias=AliasChoices("VK_GROUP_ID", "GROUP_ID")
+    )
+    version: str = Field(
+        default="5.199", validation_alias=AliasChoices("VK_VERSION", "VERSION")
+    )
+    followers_ttl_seconds: float = Field(default=300)
+    followers_retry_seconds: float = Field(default=30)
+    timeout_seconds: float = Field(default=5)
+    model_config = SettingsConfigDict(env_prefix="VK_")
+
+
 class MessageQueueSettings(BaseSettings):
     broker_uri: str | None = Field(default=None)
     model_config = SettingsConfigDict(env_prefix="MQ_")
@@ -76,6 +157,13 @@ class StorageSettings(BaseSettings):
 
     default_bucket: str = Field(default="department-of-educational-programs-bucket")
     use_s3: bool = Field(default=True)
+    multipart_part_size: int = Field(default=8 * 1024 * 1024)
+    multipart_max_in_flight: int = Field(default=4)
+    image_variant_sizes: list[int] = Field(default=[160, 480, 1280])
+    image_variant_quality: int = Field(default=80)
+    presign_expires_seconds: int = Field(default=900)
+    batch_upload_concurrency: int = Field(default=4)
+    batch_upload_max_files: int = Field(default=20)
     local_storage: LocalConnectionSettings = LocalConnectionSettings()
     s3_storage: S3ConnectionSettings = S3ConnectionSettings()
     model_config = SettingsConfigDict(env_prefix="STORAGE_")
@@ -84,9 +172,16 @@ class StorageSettings(BaseSettings):
 class TasksSettings(BaseSettings):
     params: dict[str, Any] = {
         "activate_user": {"time_limit": 7200},
-        "reminder_news": {"time_limit": 7200},
+        "send_due_reminders": {"time_limit": 600},
+        "send_reminder_group": {"time_limit": 3600},
+        "generate_attachment_variants": {"time_limit": 300},
+        "drain_email_outbox": {"time_limit": 600},
     }
-    schedules: list[dict[str, Any]] = []
+    # Beat polls the database-backed queues (due reminders, email outbox)
+    schedules: list[dict[str, Any]] = [
+        {"name": "send_due_reminders", "cron": "* * * * *"},
+        {"name": "drain_email_outbox", "cron": "* * * * *"},
+    ]
 
     model_config = SettingsConfigDict(env_prefix="TASKS_")
 
@@ -99,6 +194,12 @@ class Settings(BaseSettings):
     mq: MessageQueueSettings = MessageQueueSettings()
     storage: StorageSettings = StorageSettings()
     tasks: TasksSettings = TasksSettings()
+    likes: LikesSettings = LikesSettings()
+    user_cache: UserCacheSettings = UserCacheSettings()
+    response_cache: ResponseCacheSettings = ResponseCacheSettings()
+    email: EmailSettings = EmailSettings()
+    news: NewsSettings = NewsSettings()
+    vk: VkSettings = VkSettings()
 
     class Config:
         extra = "allow"
@@ -15,10 +15,20 @@ from dependency_injector import containers, providers
 
 from app.config import Settings
 from app.domain.clips.containers import ClipContainer
+from app.domain.common.counters import LikeCounterBuffer
+from app.domain.common.response_cache import ResponseCache
 from app.domain.news.containers import NewsContainer
+from app.domain.notifications.transport import SmtpConnectionPool
 from app.domain.projects.containers import ProjectContainer
 from app.domain.storage.attachments.containers import AttachmentContainer
+from app.domain.storage.attachments.downloads import ObjectReader
+from app.domain.storage.attachments.presigned import PresignedStorage
+from app.domain.storage.attachments.uploads import AsyncS3Client, StreamingUploader
+from app.domain.users.auth.cache import VerifiedTokenCache
+from app.domain.users.auth.hashing import PasswordHashingExecutor
 from app.domain.users.containers import UserContainer
+from app.domain.users.core.cache import UserCache
+from app.domain.vk.cache import VkFollowersCache
 
 
 class Container(containers.DeclarativeContainer):
@@ -40,6 +50,72 @@ class Container(containers.DeclarativeContainer):
 
     unit_of_work = providers.Factory(UnitOfWork, transaction=transaction)
 
+    user_cache = providers.Singleton(
+        UserCache,
+        enabled=config.user_cache.enabled,
+        ttl_seconds=config.user_cache.ttl_seconds,
+        max_entries=config.user_cache.max_entries,
+        broadcast_channel=config.user_cache.broadcast_channel,
+        dsn=config.db.dsn,
+    )
+
+    response_cache = providers.Singleton(
+        ResponseCache,
+        transaction=transaction,
+        enabled=config.response_cache.enabled,
+        ttl_seconds=config.response_cache.ttl_seconds,
+        max_entries=config.response_cache.max_entries,
+        max_body_bytes=config.response_cache.max_body_bytes,
+        broadcast_channel=config.response_cache.broadcast_channel,
+        dsn=config.db.dsn,
+    )
+
+    verified_token_cache = providers.Singleton(
+        VerifiedTokenCache,
+        enabled=config.security.token_cache_enabled,
+        max_entries=config.security.token_cache_max_entries,
+        ttl_seconds=config.security.token_cache_ttl_seconds,
+    )
+
+    password_hashing_executor = providers.Singleton(
+        PasswordHashingExecutor,
+        pool_size=config.security.hashing_pool_size,
+        max_pending=config.security.hashing_max_pending,
+        use_processes=config.security.hashing_use_processes,
+    )
+
+    mail_transport = providers.Singleton(
+        SmtpConnectionPool,
+        hostname=config.email.host,
+        port=config.email.port,
+        username=config.email.address,
+        password=config.email.password,
+        use_tls=config.email.use_tls,
+        pool_size=config.email.pool_size,
+        idle_timeout=config.email.idle_timeout_seconds,
+        timeout=config.email.timeout_seconds,
+    )
+
+    vk_followers = providers.Singleton(
+        VkFollowersCache,
+        api_uri=config.vk.api_uri,
+        token=config.vk.token,
+        group_id=config.vk.group_id,
+        version=config.vk.version,
+        ttl_seconds=config.vk.followers_ttl_seconds,
+        retry_seconds=config.vk.followers_retry_seconds,
+        timeout_seconds=config.vk.timeout_seconds,
+    )
+
+    like_counter_buffer = providers.Singleton(
+        LikeCounterBuffer,
+        transaction=transaction,
+        enabled=config.likes.buffer_enabled,
+        flush_interval_ms=config.likes.flush_interval_ms,
+        flush_max_events=config.likes.flush_max_events,
+        flush_max_entities=config.likes.flush_max_entities,
+    )
+
     celery_app: providers.Provider[Celery] = providers.Singleton(
         Celery, "worker", broker=config.mq.broker_uri
     )
@@ -86,9 +162,46 @@ class Container(containers.DeclarativeContainer):
         ),
     )
 
+    streaming_uploader = providers.Singleton(
+        StreamingUploader,
+        file_storage=file_storage,
+        use_s3=config.storage.use_s3,
+        s3_uri=config.storage.s3_storage.endpoint_uri,
+        access_key_id=config.storage.s3_storage.access_key_id,
+        secret_access_key=config.storage.s3_storage.secret_access_key,
+        public_storage_uri=config.storage.s3_storage.public_storage_uri,
+        part_size=config.storage.multipart_part_size,
+        max_in_flight=config.storage.multipart_max_in_flight,
+    )
+
+    object_reader = providers.Singleton(
+        ObjectReader,
+        use_s3=config.storage.use_s3,
+        s3=streaming_uploader.provided.s3,
+        local_base_path=config.storage.local_storage.base_path,
+    )
+
+    presigned_storage = providers.Singleton(
+        PresignedStorage,
+        use_s3=config.storage.use_s3,
+        s3=streaming_uploader.provided.s3,
+        signer=providers.Singleton(
+            AsyncS3Client,
+            s3_uri=config.storage.s3_storage.public_storage_uri,
+            access_key_id=config.storage.s3_storage.access_key_id,
+            secret_access_key=config.storage.s3_storage.secret_access_key,
+        ),
+        secret_key=config.security.secret_key,
+        expires_in=config.storage.presign_expires_seconds,
+    )
+
     user = providers.Container(
         UserContainer,
         transaction=transaction,
+        user_cache=user_cache,
+        password_hashing_executor=password_hashing_executor,
+        verified_token_cache=verified_token_cache,
+        mail_transport=mail_transport,
         task_producer=task_producer,
         secret_key=config.security.secret_key,
         private_key=config.security.private_key,
@@ -96,25 +209,53 @@ class Container(containers.DeclarativeContainer):
         pwd_context=config.security.pwd_context,
         access_expiration_time=config.security.access_expiration_min,
         refresh_expiration_time=config.security.refresh_expiration_min,
+        email_address=config.email.address,
+        email_outbox_batch_size=config.email.outbox_batch_size,
+        email_outbox_max_attempts=config.email.outbox_max_attempts,
+        email_outbox_retry_seconds=config.email.outbox_retry_seconds,
     )
 
     project = providers.Container(
-        ProjectContainer, transaction=transaction, user_container=user
+        ProjectContainer,
+        transaction=transaction,
+        response_cache=response_cache,
+        like_counter_buffer=like_counter_buffer,
+        user_container=user,
     )
 
     news = providers.Container(
-        NewsContainer, transaction=transaction, user_container=user
+        NewsContainer,
+        transaction=transaction,
+        response_cache=response_cache,
+        like_counter_buffer=like_counter_buffer,
+        reminder_lead_hours=config.news.reminder_lead_hours,
+        reminder_page_size=config.news.reminder_page_size,
+        reminder_lease_seconds=config.news.reminder_lease_seconds,
+        user_container=user,
     )
 
     clip = providers.Container(
-        ClipContainer, transaction=transaction, user_container=user
+        ClipContainer,
+        transaction=transaction,
+        response_cache=response_cache,
+        like_counter_buffer=like_counter_buffer,
+        user_container=user,
     )
 
     attachment = providers.Container(
         AttachmentContainer,
         transaction=transaction,
+        response_cache=response_cache,
         file_storage=file_storage,
+        uploader=streaming_uploader,
+        reader=object_reader,
+        presigned_storage=presigned_storage,
+        task_producer=task_producer,
         bucket=config.storage.default_bucket,
+        variant_sizes=config.storage.image_variant_sizes,
+        variant_quality=config.storage.image_variant_quality,
+        batch_concurrency=config.storage.batch_upload_concurrency,
+        batch_max_files=config.storage.batch_upload_max_files,
         user_container=user,
         project_container=project,
         news_container=news,
@@ -1,20 +1,23 @@
 from fastapi import HTTPException
 
 from app.domain.clips import schemas
-from app.domain.clips.queries import ClipRetrieveQuery
 from app.domain.clips.repositories import ClipRepository, LikeClipRepository
 from app.domain.clips.schemas import ClipCreate
+from app.domain.common.enums import ResponseCacheScopes
 from app.domain.common.exceptions import NotFoundError
-from app.domain.projects.schemas import Like
-from app.domain.users.auth.queries import CurrentUserQuery
+from app.domain.common.response_cache import ResponseCache
+from app.domain.projects.schemas import Like, LikesCount
+from app.domain.users.auth.queries import CurrentPrincipalQuery
 
 
 class ClipCreateCommand:
     def __init__(
         self,
         clip_repository: ClipRepository,
+        response_cache: ResponseCache,
     ) -> None:
         self.clip_repository = clip_repository
+        self.response_cache = response_cache
 
     async def __call__(self, payload: ClipCreate) -> None:
         create_clip = schemas.ClipCreate(
@@ -24,11 +27,17 @@ class ClipCreateCommand:
         )
 
         await self.clip_repository.create_clip(create_clip)
+        await self.response_cache.invalidate(ResponseCacheScopes.clips)
 
 
 class ClipPartialUpdateCommand:
-    def __init__(self, clip_repository: ClipRepository):
+    def __init__(
+        self,
+        clip_repository: ClipRepository,
+        response_cache: ResponseCache,
+    ):
         self.clip_repository = clip_repository
+        self.response_cache = response_cache
 
     async def __call__(
         self, clip_id: int, payload: schemas.ClipPartialUpdate
@@ -46,6 +55,7 @@ class ClipPartialUpdateCommand:
             print("Произошла ошибка при обновлении новости:", e)
             raise
 
+        await self.response_cache.invalidate(ResponseCacheScopes.clips)
         return schemas.ClipDetailsFull.model_validate(user)
 
 
@@ -54,79 +64,57 @@ class ClipDeleteCommand:
         self,
         clip_repository: ClipRepository,
         clip_like_repository: LikeClipRepository,
+        response_cache: ResponseCache,
     ) -> None:
         self.clip_repository = clip_repository
         self.clip_like_repository = clip_like_repository
+        self.response_cache = response_cache
 
     async def __call__(self, clip_id: int) -> None:
         # await self.clip_like_repository.delete_like_clip(clip_id)
-        return await self.clip_repository.delete_clip(clip_id)
+        await self.clip_repository.delete_clip(clip_id)
+        await self.response_cache.invalidate(ResponseCacheScopes.clips)
 
 
 class LikeTheClipCommand:
     def __init__(
         self,
         clip_like_repository: LikeClipRepository,
-        clip_retrieve_by_id_query: ClipRetrieveQuery,
-        current_user_query: CurrentUserQuery,
-        clip_repository: ClipRepository,
+        current_principal_query: CurrentPrincipalQuery,
     ) -> None:
         self.clip_like_repository = clip_like_repository
-        self.clip_retrieve_by_id_query = clip_retrieve_by_id_query
-        self.current_user_query = current_user_query
-        self.clip_repository = clip_repository
+        self.current_principal_query = current_principal_query
 
-    async def __call__(self, payload: Like) -> None:
-        clip_id = payload.clip_id
-        current_user = await self.current_user_query()
-        user_id = current_user.id
+    async def __call__(self, payload: Like) -> LikesCount:
+        principal = await self.current_principal_query()
 
-        clip = await self.clip_retrieve_by_id_query(clip_id)
+        likes = await self.clip_like_repository.add_like(
+            payload.clip_id, principal.sub, principal.kind
+        )
 
-        if clip is None:
+        if likes is None:
             raise HTTPException(status_code=404, detail="Clip not found")
 
-        clip_likes_count = clip.likes + 1
-
-        create_like_the_clip = schemas.LikeTheClip(
-            clip_id=clip_id,
-            user_id=user_id,
-        )
-        await self.clip_like_repository.create_like_clip(create_like_the_clip)
-
-        await self.clip_repository.update_clip_likes(clip_id, clip_likes_count)
+        return LikesCount(likes=likes)
 
 
 class UnlikeTheClipCommand:
     def __init__(
         self,
         clip_like_repository: LikeClipRepository,
-        clip_retrieve_by_id_query: ClipRetrieveQuery,
-        current_user_query: CurrentUserQuery,
-        clip_repository: ClipRepository,
+        current_principal_query: CurrentPrincipalQuery,
     ) -> None:
         self.clip_like_repository = clip_like_repository
-        self.clip_retrieve_by_id_query = clip_retrieve_by_id_query
-        self.current_user_query = current_user_query
-        self.clip_repository = clip_repository
-
-    async def __call__(self, payload: Like) -> None:
-        clip_id = payload.clip_id
-        current_user = await self.current_user_query()
-        user_id = current_user.id
+        self.current_principal_query = current_principal_query
 
-        clip = await self.clip_retrieve_by_id_query(clip_id)
+    async def __call__(self, payload: Like) -> LikesCount:
+        principal = await self.current_principal_query()
 
-        if clip is None:
-            raise HTTPException(status_code=404, detail="Clip not found")
-
-        new_likes_count = clip.likes - 1
-
-        like_exists = await self.clip_like_repository.check_like_exists(
-            clip_id, user_id
+        likes = await self.clip_like_repository.remove_like(
+            payload.clip_id, principal.sub, principal.kind
         )
-        if not like_exists:
+
+        if likes is None:
             raise HTTPException(status_code=404, detail="Like not found")
 
-        await self.clip_repository.update_clip_likes(clip_id, new_likes_count)
-        await self.clip_like_repository.delete_like_clip(clip_id, user_id)
+        return LikesCount(likes=likes)
@@ -14,16 +14,26 @@ from app.domain.clips.queries import (
     ClipRetrieveQuery,
 )
 from app.domain.clips.repositories import ClipRepository, LikeClipRepository
+from app.domain.common.counters import LikeCounterBuffer
+from app.domain.common.response_cache import ResponseCache
 from app.domain.users.containers import UserContainer
 
 
 class ClipContainer(containers.DeclarativeContainer):
     transaction = providers.Dependency(instance_of=AsyncDbTransaction)
+    like_counter_buffer = providers.Dependency(instance_of=LikeCounterBuffer)
+    response_cache = providers.Dependency(instance_of=ResponseCache)
 
-    clip_repository = providers.Factory(ClipRepository, transaction=transaction)
+    clip_repository = providers.Factory(
+        ClipRepository,
+        transaction=transaction,
+        counter_buffer=like_counter_buffer,
+    )
 
     clip_like_repository = providers.Factory(
-        LikeClipRepository, transaction=transaction
+        LikeClipRepository,
+        transaction=transaction,
+        counter_buffer=like_counter_buffer,
     )
 
     user_container = providers.Container(UserContainer)
@@ -31,6 +41,7 @@ class ClipContainer(containers.DeclarativeContainer):
     create_command = providers.Factory(
         ClipCreateCommand,
         clip_repository=clip_repository,
+        response_cache=response_cache,
     )
 
     current_clip_query = providers.Factory(
@@ -40,6 +51,7 @@ class ClipContainer(containers.DeclarativeContainer):
     clip_partial_update_command = providers.Factory(
         ClipPartialUpdateCommand,
         clip_repository=clip_repository,
+        response_cache=response_cache,
     )
 
     clip_retrieve_by_id_query = providers.Factory(
@@ -50,6 +62,8 @@ class ClipContainer(containers.DeclarativeContainer):
     clip_list_query = providers.Factory(
         ClipListQuery,
         clip_repository=clip_repository,
+        clip_like_repository=clip_like_repository,
+        token_payload_query=user_container.current_user_token_payload_query,
     )
 
     management_list_query = providers.Factory(
@@ -61,20 +75,17 @@ class ClipContainer(containers.DeclarativeContainer):
         ClipDeleteCommand,
         clip_repository=clip_repository,
         clip_like_repository=clip_like_repository,
+        response_cache=response_cache,
     )
 
     like_the_clip_command = providers.Factory(
         LikeTheClipCommand,
         clip_like_repository=clip_like_repository,
-        clip_retrieve_by_id_query=clip_retrieve_by_id_query,
-        current_user_query=user_container.current_user_query,
-        clip_repository=clip_repository,
+        current_principal_query=user_container.current_principal_query,
     )
 
     unlike_the_clip_command = providers.Factory(
         UnlikeTheClipCommand,
         clip_like_repository=clip_like_repository,
-        clip_retrieve_by_id_query=clip_retrieve_by_id_query,
-        current_user_query=user_container.current_user_query,
-        clip_repository=clip_repository,
+        current_principal_query=user_container.current_principal_query,
     )
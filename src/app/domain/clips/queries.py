@@ -1,8 +1,9 @@
 from a8t_tools.db.pagination import Paginated
 
 from app.domain.clips import schemas
-from app.domain.clips.repositories import ClipRepository
+from app.domain.clips.repositories import ClipRepository, LikeClipRepository
 from app.domain.clips.schemas import ClipListRequestSchema
+from app.domain.users.auth.queries import CurrentUserTokenPayloadQuery
 
 
 class ClipRetrieveQuery:
@@ -17,18 +18,41 @@ class ClipRetrieveQuery:
 
 
 class ClipListQuery:
-    def __init__(self, clip_repository: ClipRepository):
+    def __init__(
+        self,
+        clip_repository: ClipRepository,
+        clip_like_repository: LikeClipRepository,
+        token_payload_query: CurrentUserTokenPayloadQuery,
+    ):
         self.clip_repository = clip_repository
+        self.clip_like_repository = clip_like_repository
+        self.token_payload_query = token_payload_query
 
     async def __call__(
         self, payload: schemas.ClipListRequestSchema
-    ) -> Paginated[schemas.Clip]:
-        return await self.clip_repository.get_clip(payload.pagination, payload.sorting)
+    ) -> Paginated[schemas.ClipDetailsFull]:
+        result = await self.clip_repository.get_clip(
+            payload.pagination, payload.sorting
+        )
+
+        token_payload = await self.token_payload_query()
+        if token_payload is not None:
+            liked_ids = await self.clip_like_repository.get_liked_target_ids(
+                [item.id for item in result.items],
+                token_payload.sub,
+                token_payload.kind,
+            )
+            for item in result.items:
+                item.liked = item.id in liked_ids
+
+        return result
 
 
 class ClipManagementListQuery:
     def __init__(self, query: ClipListQuery) -> None:
         self.query = query
 
-    async def __call__(self, payload: ClipListRequestSchema) -> Paginated[schemas.Clip]:
+    async def __call__(
+        self, payload: ClipListRequestSchema
+    ) -> Paginated[schemas.ClipDetailsFull]:
         return await self.query(payload)
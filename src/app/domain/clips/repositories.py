@@ -4,12 +4,14 @@ from a8t_tools.db.pagination import Paginated, PaginationCallable
 from a8t_tools.db.sorting import SortingData
 from a8t_tools.db.transactions import AsyncDbTransaction
 from a8t_tools.db.utils import CrudRepositoryMixin
-from sqlalchemy import ColumnElement, and_, delete, insert, select, update
+from sqlalchemy import ColumnElement, and_, delete
 from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.base import ExecutableOption
 
 from app.domain.clips import schemas
 from app.domain.common import models
+from app.domain.common.counters import LikeCounterBuffer
+from app.domain.common.repositories import LikeRepositoryMixin
 from app.domain.common.schemas import IdContainerTables
 
 
@@ -18,24 +20,29 @@ class ClipRepository(CrudRepositoryMixin[models.Clip]):
         selectinload(models.Clip.clip_attachment),
     ]
 
-    def __init__(self, transaction: AsyncDbTransaction):
+    def __init__(
+        self, transaction: AsyncDbTransaction, counter_buffer: LikeCounterBuffer
+    ):
         self.model = models.Clip
         self.transaction = transaction
+        self.counter_buffer = counter_buffer
 
     async def create_clip(self, payload: schemas.ClipCreate) -> IdContainerTables:
         return IdContainerTables(id=await self._create(payload))
 
     async def get_clip(
         self,
-        pagination: PaginationCallable[schemas.Clip] | None = None,
+        pagination: PaginationCallable[schemas.ClipDetailsFull] | None = None,
         sorting: SortingData[schemas.ClipSorts] | None = None,
-    ) -> Paginated[schemas.Clip]:
-        return await self._get_list(
-            schemas.Clip,
+    ) -> Paginated[schemas.ClipDetailsFull]:
+        result = await self._get_list(
+            schemas.ClipDetailsFull,
             pagination=pagination,
             sorting=sorting,
             options=self.load_options,
         )
+        self.counter_buffer.merge(models.Clip, result.items)
+        return result
 
     async def partial_update_clip(
         self, clip_id: UUID, payload: schemas.ClipPartialUpdate
@@ -45,11 +52,14 @@ class ClipRepository(CrudRepositoryMixin[models.Clip]):
     async def get_clip_by_filter_or_none(
         self, where: schemas.ClipWhere
     ) -> schemas.ClipDetailsFull | None:
-        return await self._get_or_none(
+        result = await self._get_or_none(
             schemas.ClipDetailsFull,
             condition=await self._format_filters(where),
             options=self.load_options,
         )
+        if result is not None:
+            self.counter_buffer.merge(models.Clip, [result])
+        return result
 
     async def _format_filters(self, where: schemas.ClipWhere) -> ColumnElement[bool]:
         filters: list[ColumnElement[bool]] = []
@@ -59,16 +69,6 @@ class ClipRepository(CrudRepositoryMixin[models.Clip]):
 
         return and_(*filters)
 
-    async def update_clip_likes(self, clip_id: int, clip_likes_count: int) -> None:
-        async with self.transaction.use() as session:
-            stmt = (
-                update(models.Clip)
-                .where(models.Clip.id == clip_id)
-                .values(likes=clip_likes_count)
-            )
-            await session.execute(stmt)
-            await session.commit()
-
     async def delete_clip(self, payload=schemas.ClipDelete) -> None:
         async with self.transaction.use() as session:
             stmt = delete(models.Clip).where(
@@ -80,67 +80,14 @@ class ClipRepository(CrudRepositoryMixin[models.Clip]):
             await session.commit()
 
 
-class LikeClipRepository(CrudRepositoryMixin[models.ClipLike]):
-    def __init__(self, transaction: AsyncDbTransaction):
+class LikeClipRepository(LikeRepositoryMixin, CrudRepositoryMixin[models.ClipLike]):
+    like_model = models.ClipLike
+    target_model = models.Clip
+    target_field = "clip_id"
+
+    def __init__(
+        self, transaction: AsyncDbTransaction, counter_buffer: LikeCounterBuffer
+    ):
         self.model = models.ClipLike
         self.transaction = transaction
-
-    async def create_like_clip(self, payload: schemas.LikeTheClip) -> IdContainerTables:
-        async with self.transaction.use() as session:
-            try:
-                like_query = select(models.ClipLike).where(
-                    (models.ClipLike.user_id == payload.user_id)
-                    & (models.ClipLike.clip_id == payload.clip_id)
-                )
-                like_exists = await session.execute(like_query)
-                existing_like = like_exists.scalar_one_or_none()
-
-                if existing_like:
-                    return
-
-                staff_query = select(models.Staff).where(
-                    models.Staff.id == payload.user_id
-                )
-                staff_exists = await session.execute(staff_query)
-
-                if staff_exists.first():
-                    stmt = insert(models.ClipLike).values(
-                        {
-                            "staff_id": payload.user_id,
-                            "clip_id": payload.clip_id,
-                        }
-                    )
-                else:
-                    stmt = insert(models.ClipLike).values(
-                        {
-                            "user_id": payload.user_id,
-                            "clip_id": payload.clip_id,
-                        }
-                    )
-
-                await session.execute(stmt)
-
-            except Exception as e:
-                print(f"Error creating like info: {e}")
-
-    async def delete_like_clip(self, payload=schemas.ClipDelete) -> None:
-        async with self.transaction.use() as session:
-            stmt = delete(models.ClipLike).where(
-                and_(
-                    models.ClipLike.clip_id == payload.clip_id,
-                    models.ClipLike.user_id == payload.user_id,
-                )
-            )
-            await session.execute(stmt)
-            await session.commit()
-
-    async def check_like_exists(self, clip_id: int, user_id: int) -> bool:
-        async with self.transaction.use() as session:
-            stmt = select(models.ClipLike).where(
-                and_(
-                    models.ClipLike.clip_id == clip_id,
-                    models.ClipLike.user_id == user_id,
-                )
-            )
-            result = await session.execute(stmt)
-            return result.first() is not None
+        self.counter_buffer = counter_buffer
@@ -28,6 +28,7 @@ class ClipCreate(APIModel):
 
 class ClipDetailsFull(Clip):
     clip_attachment: Attachment | None = None
+    liked: bool = False
 
 
 class ClipPartialUpdate(APIModel):
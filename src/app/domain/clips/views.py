@@ -3,7 +3,7 @@ from contextlib import asynccontextmanager
 from a8t_tools.db import pagination, sorting
 from a8t_tools.security.tokens import override_user_token
 from dependency_injector import wiring
-from fastapi import APIRouter, Depends, Header, UploadFile
+from fastapi import APIRouter, Depends, Header, Query, Request, UploadFile
 from fastapi.params import Form
 
 from app.api import deps
@@ -17,16 +17,29 @@ from app.domain.clips.commands import (
 )
 from app.domain.clips.queries import ClipManagementListQuery, ClipRetrieveQuery
 from app.domain.clips.schemas import ClipCreate, ClipDelete
+from app.domain.common.pagination import CursorPaginationResults
 from app.domain.projects.schemas import Like
 from app.domain.storage.attachments import schemas as AttachmentSchema
-from app.domain.storage.attachments.commands import NewsAttachmentCreateCommand
+from app.domain.storage.attachments.commands import (
+    ClipAttachmentCreateCommand,
+    NewsAttachmentCreateCommand,
+)
 
 router = APIRouter()
 
+clip_sorting = deps.get_sort_order_sorting_dep(
+    schemas.ClipSorts, schemas.ClipSorts.created_at, sorting.SortOrders.desc
+)
+
 
 @asynccontextmanager
-async def user_token(token: str):
-    async with override_user_token(token or ""):
+async def user_token(token: str | None):
+    if token is None:
+        # Keep whatever the Authorization header resolved to
+        yield
+        return
+
+    async with override_user_token(token):
         yield
 
 
@@ -64,9 +77,29 @@ async def create_clip_attachment(
         )
 
 
+@router.post("/create/attachment/stream", response_model=AttachmentSchema.Attachment)
+@wiring.inject
+async def stream_clip_attachment(
+    request: Request,
+    clip_id: int = Query(...),
+    name: str | None = Query(None),
+    token: str = Header(...),
+    command: ClipAttachmentCreateCommand = Depends(
+        wiring.Provide[Container.attachment.clip_create_command]
+    ),
+) -> AttachmentSchema.Attachment:
+    payload = Like(clip_id=clip_id)
+
+    async with user_token(token):
+        return await command(
+            payload,
+            AttachmentSchema.AttachmentCreate(file=request.stream(), name=name),
+        )
+
+
 @router.get(
     "/get/list",
-    response_model=pagination.CountPaginationResults[schemas.ClipDetailsFull],
+    response_model=CursorPaginationResults[schemas.ClipDetailsFull],
 )
 @wiring.inject
 async def get_clip_list(
@@ -74,19 +107,15 @@ async def get_clip_list(
         wiring.Provide[Container.clip.management_list_query]
     ),
     pagination: pagination.PaginationCallable[schemas.ClipDetailsFull] = Depends(
-        deps.get_skip_limit_pagination_dep(schemas.ClipDetailsFull)
+        deps.get_cursor_pagination_dep(schemas.ClipDetailsFull, clip_sorting)
     ),
-    sorting: sorting.SortingData[schemas.ClipSorts] = Depends(
-        deps.get_sort_order_sorting_dep(
-            schemas.ClipSorts,
-            schemas.ClipSorts.created_at,
-            sorting.SortOrders.desc,
+    sorting: sorting.SortingData[schemas.ClipSorts] = Depends(clip_sorting),
+    token: str | None = Header(None),
+) -> CursorPaginationResults[schemas.ClipDetailsFull]:
+    async with user_token(token):
+        return await query(
+            schemas.ClipListRequestSchema(pagination=pagination, sorting=sorting)
         )
-    ),
-) -> pagination.Paginated[schemas.ClipDetailsFull]:
-    return await query(
-        schemas.ClipListRequestSchema(pagination=pagination, sorting=sorting)
-    )
 
 
 @router.get("/get/{clip_id}", response_model=None)
@@ -0,0 +1,129 @@
+import asyncio
+import contextvars
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from a8t_tools.db.transactions import AsyncDbTransaction
+from loguru import logger
+from sqlalchemy import Integer, column, update, values
+
+
+class LikeCounterBuffer:
+    """Write-behind buffer for the ``likes`` counters of projects, news and clips.
+
+    Like toggles only record a per-entity delta here; a background task
+    applies all accumulated deltas with one ``UPDATE ... FROM (VALUES ...)``
+    per table every ``flush_interval_ms`` or as soon as ``flush_max_events``
+    deltas or ``flush_max_entities`` distinct entities are pending.
+    Readers add ``pending()`` to the stored counter to stay consistent.
+    """
+
+    def __init__(
+        self,
+        transaction: AsyncDbTransaction,
+        enabled: bool = False,
+        flush_interval_ms: int = 500,
+        flush_max_events: int = 1000,
+        flush_max_entities: int = 10000,
+    ) -> None:
+        self.transaction = transaction
+        self.enabled = enabled
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_events = flush_max_events
+        self.flush_max_entities = flush_max_entities
+
+        self._deltas: dict[Any, dict[Any, int]] = defaultdict(dict)
+        self._in_flight: dict[Any, dict[Any, int]] = defaultdict(dict)
+        self._events = 0
+        self._wakeup = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+
+    def add(self, model: Any, entity_id: Any, delta: int) -> None:
+        deltas = self._deltas[model]
+        deltas[entity_id] = deltas.get(entity_id, 0) + delta
+        self._events += 1
+
+        self._ensure_flusher()
+        if (
+            self._events >= self.flush_max_events
+            or self._entities_count() >= self.flush_max_entities
+        ):
+            self._wakeup.set()
+
+    def pending(self, model: Any, entity_id: Any) -> int:
+        return self._deltas[model].get(entity_id, 0) + self._in_flight[model].get(
+            entity_id, 0
+        )
+
+    def merge(self, model: Any, items: Iterable[Any]) -> None:
+        if not self.enabled:
+            return
+
+        for item in items:
+            item.likes += self.pending(model, item.id)
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._events:
+                return
+
+            self._in_flight, self._deltas = self._deltas, defaultdict(dict)
+            self._events = 0
+
+            try:
+                async with self.transaction.use() as session:
+                    for model, deltas in self._in_flight.items():
+                        if deltas:
+                            await session.execute(self._flush_statement(model, deltas))
+            except Exception:
+                logger.exception("Failed to flush buffered like counters")
+                for model, deltas in self._in_flight.items():
+                    for entity_id, delta in deltas.items():
+                        self._deltas[model][entity_id] = (
+                            self._deltas[model].get(entity_id, 0) + delta
+                        )
+                        self._events += 1
+            finally:
+                self._in_flight = defaultdict(dict)
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            # Run detached from the request context so the flusher never
+            # reuses the session of the request that happened to start it.
+            self._flusher = asyncio.create_task(
+                self._run(), context=contextvars.Context()
+            )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _entities_count(self) -> int:
+        return sum(len(deltas) for deltas in self._deltas.values())
+
+    @staticmethod
+    def _flush_statement(model: Any, deltas: dict[Any, int]) -> Any:
+        pending = values(
+            column("id", model.id.type),
+            column("delta", Integer),
+            name="pending",
+        ).data(list(deltas.items()))
+
+        return (
+            update(model)
+            .where(model.id == pending.c.id)
+            .values(likes=model.likes + pending.c.delta)
+        )
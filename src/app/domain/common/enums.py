@@ -7,6 +7,9 @@ class ErrorCodes(enum.StrEnum):
     auth_error = enum.auto()
     permission_error = enum.auto()
     database_error = enum.auto()
+    service_busy = enum.auto()
+    unsupported = enum.auto()
+    invalid_cursor = enum.auto()
 
 
 class AuthErrorCodes(enum.StrEnum):
@@ -22,9 +25,42 @@ class UserStatuses(enum.StrEnum):
     banned = enum.auto()
 
 
+class PrincipalKinds(enum.StrEnum):
+    user = enum.auto()
+    staff = enum.auto()
+
+
+class EmailKinds(enum.StrEnum):
+    email_verification = enum.auto()
+    registration = enum.auto()
+    password_reset = enum.auto()
+    news_reminder = enum.auto()
+
+
+class EmailOutboxStatuses(enum.StrEnum):
+    pending = enum.auto()
+    sent = enum.auto()
+    failed = enum.auto()
+
+
+class CountModes(enum.StrEnum):
+    exact = enum.auto()
+    estimated = enum.auto()
+    none = enum.auto()
+
+
+class ResponseCacheScopes(enum.StrEnum):
+    news = enum.auto()
+    projects = enum.auto()
+    clips = enum.auto()
+
+
 class TaskNames(enum.StrEnum):
     activate_user = enum.auto()
-    reminder_news = enum.auto()
+    send_due_reminders = enum.auto()
+    send_reminder_group = enum.auto()
+    generate_attachment_variants = enum.auto()
+    drain_email_outbox = enum.auto()
 
 
 class TaskQueues(enum.StrEnum):
@@ -56,3 +56,21 @@ class UserPermissionError(GenericApiError):
     code: ErrorCodes = ErrorCodes.permission_error
     message: str = "Permission Error"
     status_code: int = 403
+
+
+class ServiceBusyError(GenericApiError):
+    code: ErrorCodes = ErrorCodes.service_busy
+    message: str = "Service is busy, try again later"
+    status_code: int = 503
+
+
+class UnsupportedError(GenericApiError):
+    code: ErrorCodes = ErrorCodes.unsupported
+    message: str = "Operation is not supported"
+    status_code: int = 501
+
+
+class InvalidCursorError(GenericApiError):
+    code: ErrorCodes = ErrorCodes.invalid_cursor
+    message: str = "Invalid pagination cursor"
+    status_code: int = 400
@@ -5,10 +5,26 @@ import uuid
 
 import sqlalchemy as sa
 from sqlalchemy import Column, ForeignKey, Integer, String, orm
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from app.domain.common.enums import PrincipalKinds
+
+
+def owner_unique_indexes(table: str, target: str) -> tuple[sa.Index, sa.Index]:
+    """One row per (owner, target) for tables owned by either a user or a staff member."""
+    return tuple(  # type: ignore [return-value]
+        sa.Index(
+            f"ix_{table}_{owner}_{target}",
+            owner,
+            target,
+            unique=True,
+            postgresql_where=sa.text(f"{owner} IS NOT NULL"),
+        )
+        for owner in ("user_id", "staff_id")
+    )
+
 
 @orm.as_declarative()
 class Base:
@@ -27,10 +43,19 @@ class Base:
 
 class Attachment(Base):
     __tablename__ = "attachment"
+    __table_args__ = (
+        sa.Index("ix_attachment_content_hash", "content_hash", unique=True),
+        sa.Index("ix_attachment_created_at_id", "created_at", "id"),
+    )
 
     name: orm.Mapped[str]
     path: orm.Mapped[str]
     uri: orm.Mapped[str | None]
+    content_hash: orm.Mapped[str | None] = orm.mapped_column(String(64))
+    ref_count: orm.Mapped[int] = orm.mapped_column(
+        Integer, default=1, server_default="1"
+    )
+    variants: orm.Mapped[list[dict] | None] = orm.mapped_column(JSONB)
     projects = relationship("ProjectAttachment", back_populates="attachment")
 
 
@@ -57,6 +82,7 @@ class ProjectAttachment(Base):
 
 class User(Base):
     __tablename__ = "user"
+    kind = PrincipalKinds.user
 
     firstname = Column(String, unique=False, nullable=True)
     lastname = Column(String, unique=False, nullable=True)
@@ -84,6 +110,7 @@ class User(Base):
 
 class Staff(Base):
     __tablename__ = "staff"
+    kind = PrincipalKinds.staff
 
     firstname = Column(String, unique=False, nullable=True)
     lastname = Column(String, unique=False, nullable=True)
@@ -176,6 +203,10 @@ class EmailCode(Base):
 
 class Project(Base):
     __tablename__ = "project"
+    __table_args__ = (
+        sa.Index("ix_project_created_at_id", "created_at", "id"),
+        sa.Index("ix_project_start_date_id", "start_date", "id"),
+    )
 
     name: orm.Mapped[str] = orm.mapped_column(String, nullable=False)
     start_date: orm.Mapped[datetime.datetime] = orm.mapped_column(
@@ -232,6 +263,7 @@ class ProjectStaff(Base):
 
 class ProjectLike(Base):
     __tablename__ = "project_like"
+    __table_args__ = owner_unique_indexes("project_like", "project_id")
 
     user_id = Column(
         UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=True
@@ -250,6 +282,10 @@ class ProjectLike(Base):
 
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        sa.Index("ix_news_created_at_id", "created_at", "id"),
+        sa.Index("ix_news_date_id", "date", "id"),
+    )
 
     name: orm.Mapped[str] = orm.mapped_column(String, nullable=False)
     date: orm.Mapped[datetime.datetime] = orm.mapped_column(
@@ -282,6 +318,14 @@ class News(Base):
 
 class NewsReminder(Base):
     __tablename__ = "news_reminder"
+    __table_args__ = (
+        *owner_unique_indexes("news_reminder", "news_id"),
+        sa.Index(
+            "ix_news_reminder_due",
+            "notify_at",
+            postgresql_where=sa.text("sent_at IS NULL"),
+        ),
+    )
 
     user_id = Column(
         UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=True
@@ -292,6 +336,15 @@ class NewsReminder(Base):
     news_id = Column(
         UUID(as_uuid=True), ForeignKey("news.id", ondelete="CASCADE"), nullable=False
     )
+    notify_at: orm.Mapped[datetime.datetime] = orm.mapped_column(
+        sa.DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    sent_at: orm.Mapped[datetime.datetime | None] = orm.mapped_column(
+        sa.DateTime(timezone=True)
+    )
+    claimed_until: orm.Mapped[datetime.datetime | None] = orm.mapped_column(
+        sa.DateTime(timezone=True)
+    )
 
     user = relationship("User", backref="news_reminders")
     staff = relationship("Staff", backref="news_reminders")
@@ -300,6 +353,7 @@ class NewsReminder(Base):
 
 class NewsLike(Base):
     __tablename__ = "news_like"
+    __table_args__ = owner_unique_indexes("news_like", "news_id")
 
     user_id = Column(
         UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=True
@@ -318,6 +372,10 @@ class NewsLike(Base):
 
 class Clip(Base):
     __tablename__ = "clip"
+    __table_args__ = (
+        sa.Index("ix_clip_created_at_id", "created_at", "id"),
+        sa.Index("ix_clip_date_id", "date", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     name: orm.Mapped[str] = orm.mapped_column(String, nullable=False)
@@ -346,6 +404,7 @@ class Clip(Base):
 
 class ClipLike(Base):
     __tablename__ = "clip_like"
+    __table_args__ = owner_unique_indexes("clip_like", "clip_id")
 
     id = Column(Integer, primary_key=True)
     user_id = Column(
@@ -359,3 +418,35 @@ class ClipLike(Base):
     user = relationship("User", backref="clip_likes")
     staff = relationship("Staff", backref="clip_likes")
     clip = relationship("Clip", backref="clip_likes")
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        sa.Index("ix_email_outbox_dedupe_key", "dedupe_key", unique=True),
+        sa.Index(
+            "ix_email_outbox_due",
+            "next_attempt_at",
+            postgresql_where=sa.text("status = 'pending'"),
+        ),
+    )
+
+    kind: orm.Mapped[str] = orm.mapped_column(String, nullable=False)
+    recipient: orm.Mapped[str] = orm.mapped_column(String, nullable=False)
+    params: orm.Mapped[dict] = orm.mapped_column(
+        JSONB, nullable=False, server_default="{}"
+    )
+    dedupe_key: orm.Mapped[str | None] = orm.mapped_column(String)
+    status: orm.Mapped[str] = orm.mapped_column(
+        String, nullable=False, server_default="pending"
+    )
+    attempts: orm.Mapped[int] = orm.mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    next_attempt_at: orm.Mapped[datetime.datetime] = orm.mapped_column(
+        sa.DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_error: orm.Mapped[str | None] = orm.mapped_column(String)
+    sent_at: orm.Mapped[datetime.datetime | None] = orm.mapped_column(
+        sa.DateTime(timezone=True)
+    )
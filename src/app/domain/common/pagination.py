@@ -0,0 +1,230 @@
+import base64
+import binascii
+import json
+from typing import Any, Generic
+
+import sqlalchemy as sa
+from a8t_tools.db.pagination import SchemaType
+from a8t_tools.db.sorting import SortingData, SortOrders
+from a8t_tools.schemas.pydantic import APIModel
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import orm
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.domain.common.enums import CountModes
+from app.domain.common.exceptions import InvalidCursorError
+
+
+class OffsetPaginationResults(APIModel, Generic[SchemaType]):
+    items: list[SchemaType]
+    has_more: bool = False
+    count: int | None = None
+
+
+class CursorPaginationResults(APIModel, Generic[SchemaType]):
+    items: list[SchemaType]
+    next_cursor: str | None = None
+    has_more: bool = False
+    count: int | None = None
+
+
+async def count_rows(
+    session: AsyncSession, query: sa.Select[Any], mode: CountModes
+) -> int | None:
+    """Total of ``query`` for ``mode``; ``None`` when no count was asked for.
+
+    ``estimated`` takes ``pg_class.reltuples`` for a whole table and the
+    planner's row estimate for a filtered query; it is exact only right
+    after ``ANALYZE`` but costs no scan. When no estimate is available the
+    rows are counted.
+    """
+    if mode == CountModes.none:
+        return None
+
+    query = query.order_by(None).limit(None).offset(None).options(orm.lazyload("*"))
+    if mode == CountModes.estimated:
+        estimate = await _estimate_rows(session, query)
+        if estimate is not None:
+            return estimate
+
+    count = sa.select(sa.func.count()).select_from(query.subquery())
+    return (await session.execute(count)).scalar_one()
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a query, compiled with its bound params."""
+
+    inherit_cache = False
+
+    def __init__(self, query: sa.Select[Any]) -> None:
+        self.query = query
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.query, **kw)
+
+
+async def _estimate_rows(session: AsyncSession, query: sa.Select[Any]) -> int | None:
+    connection = await session.connection()
+    froms = query.get_final_froms()
+    if query.whereclause is None and len(froms) == 1 and isinstance(froms[0], sa.Table):
+        reltuples = sa.text(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"
+        )
+        estimate = (
+            await connection.execute(reltuples, dict(name=froms[0].fullname))
+        ).scalar_one_or_none()
+        # -1 until the table was first vacuumed or analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    plan = (await connection.execute(_Explain(query))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class OffsetPagination(Generic[SchemaType]):
+    """SKIP/LIMIT pagination callable with a selectable kind of total count.
+
+    One extra row is fetched to tell whether another page follows, so
+    ``has_more`` is known even when the count is skipped.
+    """
+
+    def __init__(
+        self,
+        schema: type[SchemaType],
+        skip: int = 0,
+        limit: int = 100,
+        count: CountModes = CountModes.exact,
+    ) -> None:
+        self.schema = schema
+        self.skip = skip
+        self.limit = limit
+        self.count = count
+
+    async def __call__(
+        self, session: AsyncSession, query: sa.Select[Any]
+    ) -> OffsetPaginationResults[SchemaType]:
+        page = query.offset(self.skip).limit(self.limit + 1)
+        rows = (await session.execute(page)).scalars().all()
+        return OffsetPaginationResults(
+            items=[self.schema.model_validate(x) for x in rows[: self.limit]],
+            has_more=len(rows) > self.limit,
+            count=await count_rows(session, query, self.count),
+        )
+
+
+class KeysetPagination(Generic[SchemaType]):
+    """Pagination callable walking the list by (sort column, id) instead of OFFSET.
+
+    The query is re-ordered by the sort column with ``id`` as tie-breaker and
+    continues after the last row of the previous page, so with a composite
+    index on (column, id) every page is a short index range scan. The cursor
+    is opaque to clients and carries the sort it was issued for; it is
+    rejected when the sort changes. Postgres puts NULLs last in ascending and
+    first in descending order, and nullable columns follow the same rule.
+    """
+
+    def __init__(
+        self,
+        schema: type[SchemaType],
+        sorting: SortingData[Any] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        count: CountModes = CountModes.none,
+    ) -> None:
+        self.schema = schema
+        self.count = count
+        self.field = str(sorting.field) if sorting and sorting.field else None
+        self.order = str(sorting.order if sorting else SortOrders.asc)
+        self.cursor = cursor
+        self.limit = limit
+
+    async def __call__(
+        self, session: AsyncSession, query: sa.Select[Any]
+    ) -> CursorPaginationResults[SchemaType]:
+        entity = query.column_descriptions[0]["entity"]
+        columns = sa.inspect(entity).columns
+        id_column = columns["id"]
+        key_column = columns[self.field] if self.field else None
+        keys = [key_column, id_column] if key_column is not None else [id_column]
+
+        count = await count_rows(session, query, self.count)
+        descending = self.order == str(SortOrders.desc)
+        query = query.order_by(None).order_by(
+            *(x.desc() if descending else x.asc() for x in keys)
+        )
+        if self.cursor is not None:
+            values = self._decode(self.cursor, keys)
+            query = query.where(self._after(keys, values, descending))
+
+        rows = (await session.execute(query.limit(self.limit + 1))).scalars().all()
+        items = [self.schema.model_validate(x) for x in rows[: self.limit]]
+
+        next_cursor = None
+        if len(rows) > self.limit:
+            last = rows[self.limit - 1]
+            next_cursor = self._encode([getattr(last, x.key) for x in keys], keys)
+        return CursorPaginationResults(
+            items=items,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
+            count=count,
+        )
+
+    def _after(
+        self, keys: list[sa.Column[Any]], values: list[Any], descending: bool
+    ) -> sa.ColumnElement[bool]:
+        def beyond(columns: list[sa.Column[Any]], bounds: list[Any]) -> Any:
+            left = sa.tuple_(*columns)
+            right = sa.tuple_(*(sa.literal(v, c.type) for c, v in zip(columns, bounds)))
+            return left < right if descending else left > right
+
+        if len(keys) == 1 or not keys[0].nullable:
+            return beyond(keys, values)
+
+        key, id_column = keys
+        value, id_value = values
+        if value is None:
+            # Inside the NULL block only the id decides
+            rest = sa.and_(key.is_(None), beyond([id_column], [id_value]))
+            return sa.or_(key.is_not(None), rest) if descending else rest
+        rest = beyond(keys, values)
+        return rest if descending else sa.or_(rest, key.is_(None))
+
+    def _encode(self, values: list[Any], keys: list[sa.Column[Any]]) -> str:
+        payload = [
+            self.field,
+            self.order,
+            [
+                TypeAdapter(column.type.python_type).dump_python(value, mode="json")
+                for column, value in zip(keys, values)
+            ],
+        ]
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+    def _decode(self, cursor: str, keys: list[sa.Column[Any]]) -> list[Any]:
+        try:
+            data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            field, order, raw = json.loads(data)
+        except (binascii.Error, ValueError, TypeError):
+            raise InvalidCursorError()
+
+        if field != self.field or order != self.order or len(raw) != len(keys):
+            raise InvalidCursorError(message="Cursor was issued for another sorting")
+
+        try:
+            return [
+                (
+                    None
+                    if value is None
+                    else TypeAdapter(column.type.python_type).validate_python(value)
+                )
+                for column, value in zip(keys, raw)
+            ]
+        except ValidationError:
+            raise InvalidCursorError()
@@ -0,0 +1,224 @@
+from collections.abc import Sequence
+from typing import Any
+
+from a8t_tools.db.transactions import AsyncDbTransaction
+from sqlalchemy import (
+    ColumnElement,
+    any_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
+
+from app.domain.common import models
+from app.domain.common.counters import LikeCounterBuffer
+from app.domain.common.enums import PrincipalKinds
+
+
+class LikeRepositoryMixin:
+    """Like-toggle engine shared by the project, news and clip like repositories.
+
+    The like row change runs in a data-modifying CTE and the counter is bumped
+    in place (``likes = likes + delta``) by the same statement, so one click is
+    one round-trip and concurrent clicks can not overwrite each other.
+    The owner column is picked from the caller's principal kind; the Staff
+    lookup is only done in SQL when the kind is unknown.
+    Duplicate likes are rejected by the partial unique indexes on
+    (owner, target); inserts use ``ON CONFLICT DO NOTHING`` so a lost race
+    simply yields a zero delta.
+    Every method returns the new counter value or ``None`` when nothing changed
+    because the target does not exist.
+
+    When the ``counter_buffer`` is enabled only the like row is written here;
+    the counter delta is handed to the buffer once the surrounding transaction
+    commits, so a rolled back like never reaches the counter.
+    """
+
+    transaction: AsyncDbTransaction
+    counter_buffer: LikeCounterBuffer
+    like_model: Any
+    target_model: Any
+    target_field: str
+
+    async def toggle_like(
+        self, target_id: Any, owner_id: Any, kind: PrincipalKinds | None = None
+    ) -> int | None:
+        deleted = self._delete_like(target_id, owner_id, kind).cte("deleted")
+        inserted = self._insert_like(
+            target_id, owner_id, kind, ~exists(select(deleted.c.id))
+        ).cte("inserted")
+
+        return await self._apply_delta(
+            target_id, self._count(inserted) - self._count(deleted), deleted, inserted
+        )
+
+    async def add_like(
+        self, target_id: Any, owner_id: Any, kind: PrincipalKinds | None = None
+    ) -> int | None:
+        inserted = self._insert_like(target_id, owner_id, kind).cte("inserted")
+
+        return await self._apply_delta(target_id, self._count(inserted), inserted)
+
+    async def remove_like(
+        self, target_id: Any, owner_id: Any, kind: PrincipalKinds | None = None
+    ) -> int | None:
+        deleted = self._delete_like(target_id, owner_id, kind).cte("deleted")
+
+        return await self._apply_delta(
+            target_id,
+            -self._count(deleted),
+            deleted,
+            condition=exists(select(deleted.c.id)),
+        )
+
+    async def check_like_exists(
+        self, target_id: Any, owner_id: Any, kind: PrincipalKinds | None = None
+    ) -> bool:
+        stmt = select(
+            exists().where(
+                self._target_column == target_id,
+                self._owner_matches(owner_id, kind),
+            )
+        )
+        async with self.transaction.use() as session:
+            return bool((await session.execute(stmt)).scalar())
+
+    async def get_liked_target_ids(
+        self,
+        target_ids: Sequence[Any],
+        owner_id: Any,
+        kind: PrincipalKinds | None = None,
+    ) -> set[Any]:
+        if not target_ids:
+            return set()
+
+        ids = bindparam(
+            "target_ids", list(target_ids), type_=ARRAY(self._target_column.type)
+        )
+        stmt = select(self._target_column).where(
+            self._target_column == any_(ids), self._owner_matches(owner_id, kind)
+        )
+        async with self.transaction.use() as session:
+            return set((await session.execute(stmt)).scalars())
+
+    @property
+    def _target_column(self) -> Any:
+        return getattr(self.like_model, self.target_field)
+
+    def _owner_matches(
+        self, owner_id: Any, kind: PrincipalKinds | None
+    ) -> ColumnElement[bool]:
+        if kind == PrincipalKinds.staff:
+            return self.like_model.staff_id == owner_id
+        if kind == PrincipalKinds.user:
+            return self.like_model.user_id == owner_id
+
+        return or_(
+            self.like_model.user_id == owner_id,
+            self.like_model.staff_id == owner_id,
+        )
+
+    def _delete_like(
+        self, target_id: Any, owner_id: Any, kind: PrincipalKinds | None
+    ) -> Any:
+        return (
+            delete(self.like_model)
+            .where(
+                self._target_column == target_id,
+                self._owner_matches(owner_id, kind),
+            )
+            .returning(self.like_model.id)
+        )
+
+    def _insert_like(
+        self,
+        target_id: Any,
+        owner_id: Any,
+        kind: PrincipalKinds | None,
+        condition: ColumnElement[bool] | None = None,
+    ) -> Any:
+        owner = literal(owner_id, UUID(as_uuid=True))
+        if kind is None:
+            # Tokens issued before the kind claim: resolve it in SQL
+            is_staff: Any = exists().where(models.Staff.id == owner_id)
+            user_id = case((is_staff, null()), else_=owner)
+            staff_id = case((is_staff, owner), else_=null())
+        elif kind == PrincipalKinds.staff:
+            user_id, staff_id = cast(null(), owner.type), owner
+        else:
+            user_id, staff_id = owner, cast(null(), owner.type)
+
+        source = select(
+            user_id,
+            staff_id,
+            literal(target_id, self._target_column.type),
+        ).where(exists().where(self.target_model.id == target_id))
+        if condition is not None:
+            source = source.where(condition)
+
+        return (
+            insert(self.like_model)
+            .from_select(["user_id", "staff_id", self.target_field], source)
+            .on_conflict_do_nothing()
+            .returning(self.like_model.id)
+        )
+
+    async def _apply_delta(
+        self,
+        target_id: Any,
+        delta: Any,
+        *ctes: Any,
+        condition: ColumnElement[bool] | None = None,
+    ) -> int | None:
+        conditions = [self.target_model.id == target_id]
+        if condition is not None:
+            conditions.append(condition)
+
+        if not self.counter_buffer.enabled:
+            stmt = (
+                update(self.target_model)
+                .where(*conditions)
+                .values(likes=self.target_model.likes + delta)
+                .returning(self.target_model.likes)
+                .add_cte(*ctes)
+            )
+            async with self.transaction.use() as session:
+                return (await session.execute(stmt)).scalar_one_or_none()
+
+        stmt = (
+            select(self.target_model.likes, delta.label("delta"))
+            .where(*conditions)
+            .add_cte(*ctes)
+        )
+        async with self.transaction.use() as session:
+            row = (await session.execute(stmt)).one_or_none()
+            if row is None:
+                return None
+
+            # Read before the delta is buffered: it only reaches the buffer
+            # once the like row is committed.
+            likes: int = (
+                row.likes
+                + row.delta
+                + self.counter_buffer.pending(self.target_model, target_id)
+            )
+            if row.delta:
+                model, row_delta = self.target_model, row.delta
+                self.transaction.on_commit(
+                    lambda: self.counter_buffer.add(model, target_id, row_delta)
+                )
+
+        return likes
+
+    @staticmethod
+    def _count(cte: Any) -> Any:
+        return select(func.count()).select_from(cte).scalar_subquery()
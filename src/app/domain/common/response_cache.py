@@ -0,0 +1,101 @@
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+import asyncpg
+from a8t_tools.db.transactions import AsyncDbTransaction
+from loguru import logger
+from sqlalchemy import func, select
+
+from app.domain.common.cache import TTLCache
+from app.domain.common.enums import ResponseCacheScopes
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    scope: ResponseCacheScopes
+    version: int
+    etag: str
+    body: bytes
+    headers: list[tuple[bytes, bytes]]
+
+
+class ResponseCache:
+    """Serialized responses of the public read endpoints, grouped into scopes.
+
+    Every scope has a version; the commands changing a scope bump it through
+    ``invalidate`` and entries stored under an older version are treated as
+    missing. With a broadcast channel configured the bump is also published
+    with ``pg_notify``, so other workers drop the scope once it commits.
+    Likes and reminders do not bump a scope, so cached counts lag by up to
+    the TTL.
+    """
+
+    def __init__(
+        self,
+        transaction: AsyncDbTransaction,
+        enabled: bool = True,
+        ttl_seconds: float = 300,
+        max_entries: int = 2000,
+        max_body_bytes: int = 1024 * 1024,
+        broadcast_channel: str | None = None,
+        dsn: str | None = None,
+    ) -> None:
+        self.transaction = transaction
+        self.enabled = enabled
+        self.max_body_bytes = max_body_bytes
+        self.broadcast_channel = broadcast_channel
+        self.dsn = dsn
+        self.records: TTLCache[CachedResponse] = TTLCache(max_entries, ttl_seconds)
+        self.versions: dict[ResponseCacheScopes, int] = {}
+        self._listener: Any = None
+
+    def version(self, scope: ResponseCacheScopes) -> int:
+        return self.versions.get(scope, 0)
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        if not self.enabled:
+            return None
+        response = self.records.get(key)
+        if response is None or response.version != self.version(response.scope):
+            return None
+        return response
+
+    def set(self, key: Hashable, response: CachedResponse) -> None:
+        if self.enabled and len(response.body) <= self.max_body_bytes:
+            self.records.set(key, response)
+
+    def evict(self, scope: ResponseCacheScopes) -> None:
+        self.versions[scope] = self.version(scope) + 1
+
+    async def invalidate(self, scope: ResponseCacheScopes) -> None:
+        self.evict(scope)
+
+        if self.enabled and self.broadcast_channel:
+            stmt = select(func.pg_notify(self.broadcast_channel, str(scope)))
+            async with self.transaction.use() as session:
+                await session.execute(stmt)
+
+    def stats(self) -> dict[str, int]:
+        return self.records.stats()
+
+    async def start_listener(self) -> None:
+        if not self.enabled or not self.broadcast_channel or self._listener:
+            return
+
+        assert self.dsn
+        self._listener = await asyncpg.connect(self.dsn.replace("+asyncpg", ""))
+        await self._listener.add_listener(self.broadcast_channel, self._on_notify)
+
+    async def stop_listener(self) -> None:
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.evict(ResponseCacheScopes(payload))
+        except ValueError:
+            logger.warning(
+                "Ignoring malformed response cache invalidation: {}", payload
+            )
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 
 from app.api import deps
 from app.containers import Container
+from app.domain.common.pagination import OffsetPaginationResults
 from app.domain.news import schemas
 from app.domain.news.queries import NewsManagementListQuery
 
@@ -12,7 +13,7 @@ router = APIRouter()
 
 @router.get(
     "/get",
-    response_model=pagination.CountPaginationResults[schemas.NewsDetailsFull],
+    response_model=OffsetPaginationResults[schemas.NewsDetailsFull],
 )
 @wiring.inject
 async def get_directions_list(
@@ -29,7 +30,7 @@ async def get_directions_list(
             sorting.SortOrders.desc,
         )
     ),
-) -> pagination.Paginated[schemas.NewsDetailsFull]:
+) -> OffsetPaginationResults[schemas.NewsDetailsFull]:
     return await query(
         schemas.NewsListRequestSchema(pagination=pagination, sorting=sorting)
     )
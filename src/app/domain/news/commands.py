@@ -1,59 +1,35 @@
-import datetime
-import smtplib
+import asyncio
 from datetime import timedelta
-from email.mime.text import MIMEText
 from uuid import UUID
 
 from a8t_tools.bus.producer import TaskProducer
-from celery.worker.control import revoke
 from fastapi import HTTPException
+from loguru import logger
 
 from app.domain.common import enums
 from app.domain.common.exceptions import NotFoundError
-from app.domain.common.schemas import IdContainer
+from app.domain.common.response_cache import ResponseCache
 from app.domain.news import schemas
-from app.domain.news.queries import NewsRetrieveQuery, TaskNewsRetrieveQuery
+from app.domain.news.queries import NewsRetrieveQuery
 from app.domain.news.repositories import (
     LikeNewsRepository,
     NewsRepository,
     ReminderNewsRepository,
 )
 from app.domain.news.schemas import NewsCreate, NewsDelete, ReminderTheNews
-from app.domain.projects.schemas import Like
-from app.domain.users.auth.queries import CurrentUserQuery
-
-# @shared_task
-# def send_news_reminder_email(user_email: str, news_name: str, news_description: str):
-#     print("Выполняется celery")
-#
-#     subject = f"Напоминание о новости: {news_name}"
-#     message = f"Не забудьте прочитать новость: {news_description}"
-#
-#     # Отправка email
-#     send_email_reminder(user_email, subject, message)
-
-
-async def send_email_reminder(to_email: str, subject: str, message: str):
-    print("Выполняется Отправка на почту")
-
-    msg = MIMEText(message)
-    msg["Subject"] = subject
-    msg["From"] = "tikhonov.igor2028@yandex.ru"
-    msg["To"] = to_email
-
-    # Настройте SMTP-сервер
-    with smtplib.SMTP("smtp.yandex.ru", 465) as server:
-        server.starttls()
-        server.login("tikhonov.igor2028@yandex.ru", "abqiulywjvibrefg")
-        server.send_message(msg)
+from app.domain.notifications.commands import EmailOutbox, EmailSender
+from app.domain.projects.schemas import Like, LikesCount
+from app.domain.users.auth.queries import CurrentPrincipalQuery, CurrentUserQuery
 
 
 class NewsCreateCommand:
     def __init__(
         self,
         news_repository: NewsRepository,
+        response_cache: ResponseCache,
     ) -> None:
         self.news_repository = news_repository
+        self.response_cache = response_cache
 
     async def __call__(self, payload: NewsCreate) -> None:
         create_news = schemas.NewsCreate(
@@ -63,28 +39,48 @@ class NewsCreateCommand:
         )
 
         await self.news_repository.create_news(create_news)
+        await self.response_cache.invalidate(enums.ResponseCacheScopes.news)
 
 
 class NewsDeleteCommand:
     def __init__(
         self,
         news_repository: NewsRepository,
+        response_cache: ResponseCache,
     ) -> None:
         self.news_repository = news_repository
+        self.response_cache = response_cache
 
     async def __call__(self, payload: NewsDelete) -> None:
-        return await self.news_repository.delete_news(payload)
+        await self.news_repository.delete_news(payload)
+        await self.response_cache.invalidate(enums.ResponseCacheScopes.news)
 
 
 class NewsPartialUpdateCommand:
-    def __init__(self, news_repository: NewsRepository):
+    """Updates a news item; a new ``date`` also moves its pending reminders."""
+
+    def __init__(
+        self,
+        news_repository: NewsRepository,
+        reminder_news_repository: ReminderNewsRepository,
+        response_cache: ResponseCache,
+        lead_time: timedelta = timedelta(days=1),
+    ):
         self.news_repository = news_repository
+        self.reminder_news_repository = reminder_news_repository
+        self.response_cache = response_cache
+        self.lead_time = lead_time
 
     async def __call__(
         self, news_id: UUID, payload: schemas.NewsPartialUpdate
     ) -> schemas.NewsDetailsFull:
         try:
-            await self.news_repository.partial_update_news(news_id, payload)
+            async with self.news_repository.transaction.use():
+                await self.news_repository.partial_update_news(news_id, payload)
+                if payload.date is not None:
+                    await self.reminder_news_repository.reschedule_pending(
+                        news_id, payload.date - self.lead_time
+                    )
             user = await self.news_repository.get_news_by_filter_or_none(
                 schemas.NewsWhere(id=news_id)
             )
@@ -96,6 +92,7 @@ class NewsPartialUpdateCommand:
             print("Произошла ошибка при обновлении новости:", e)
             raise
 
+        await self.response_cache.invalidate(enums.ResponseCacheScopes.news)
         return schemas.NewsDetailsFull.model_validate(user)
 
 
@@ -106,13 +103,13 @@ class ReminderTheNewsCommand:
         current_user_query: CurrentUserQuery,
         news_repository: NewsRepository,
         reminder_news_repository: ReminderNewsRepository,
-        task_producer: TaskProducer,
+        lead_time: timedelta = timedelta(days=1),
     ) -> None:
         self.news_retrieve_by_id_query = news_retrieve_by_id_query
         self.current_user_query = current_user_query
         self.news_repository = news_repository
         self.reminder_news_repository = reminder_news_repository
-        self.task_producer = task_producer
+        self.lead_time = lead_time
 
     async def __call__(self, payload: ReminderTheNews) -> None:
         news_id = payload.news_id
@@ -124,152 +121,188 @@ class ReminderTheNewsCommand:
         if news is None:
             raise HTTPException(status_code=404, detail="News not found")
 
-        new_reminder_count = news.reminder + 1
         create_reminder_the_news = schemas.ReminderCreate(
             news_id=news_id,
             user_id=user_id,
+            notify_at=news.date - self.lead_time,
         )
-        reminder_id_container = await self.reminder_news_repository.create_reminder(
-            create_reminder_the_news
-        )
-
-        await self.news_repository.update_news_reminder(news_id, new_reminder_count)
-
-        notification_time = news.date - timedelta(days=1)
-
-        await self._enqueue_news_reminder(reminder_id_container, notification_time)
-
-    async def _enqueue_news_reminder(
-        self, reminder_id_container: IdContainer, notification_time: datetime
-    ) -> None:
-        await self.task_producer.fire_task(
-            enums.TaskNames.reminder_news,
-            queue=enums.TaskQueues.main_queue,
-            reminder_id_container_dict=reminder_id_container.json_dict(),
-            execution_time=notification_time.isoformat(),
-        )
+        async with self.reminder_news_repository.transaction.use():
+            reminder_id_container = await self.reminder_news_repository.create_reminder(
+                create_reminder_the_news
+            )
+            if reminder_id_container is None:
+                # Already subscribed
+                return
+            await self.news_repository.increment_news_reminder(news_id)
 
 
 class DeleteReminderTheNewsCommand:
     def __init__(
         self,
-        news_retrieve_by_id_query: NewsRetrieveQuery,
-        task_news_query: TaskNewsRetrieveQuery,
         current_user_query: CurrentUserQuery,
         news_repository: NewsRepository,
         reminder_news_repository: ReminderNewsRepository,
-        task_producer: TaskProducer,
     ) -> None:
-        self.news_retrieve_by_id_query = news_retrieve_by_id_query
-        self.task_news_query = task_news_query
         self.current_user_query = current_user_query
         self.news_repository = news_repository
         self.reminder_news_repository = reminder_news_repository
-        self.task_producer = task_producer
 
     async def __call__(self, payload: ReminderTheNews) -> None:
         news_id = payload.news_id
-
         current_user = await self.current_user_query()
-        user_id = current_user.id
 
-        task = await self.task_news_query(news_id, user_id)
-        task_id = str(task.id)  # UUID в строку
+        async with self.reminder_news_repository.transaction.use():
+            deleted = await self.reminder_news_repository.delete_reminder(
+                news_id, current_user.id
+            )
+            if deleted:
+                await self.news_repository.increment_news_reminder(news_id, -1)
 
-        news = await self.news_retrieve_by_id_query(news_id)
 
-        if news is None:
-            raise HTTPException(status_code=404, detail="News not found")
+class NewsReminderDispatchCommand:
+    """Starts one send job per (news, time) group of due reminders.
 
-        create_reminder_the_news = schemas.ReminderCreate(
-            news_id=news_id,
-            user_id=user_id,
-        )
+    Reminders wait in ``news_reminder`` until their ``notify_at``; this runs
+    periodically, so the broker carries a message per group and tick, not
+    per reminder. Dispatched groups are leased for ``lease_seconds``, so
+    later ticks skip them while their job is still running.
+    """
 
-        # Логирование
-        print("Перед удалением user_id: ", create_reminder_the_news.user_id)
-        print("Перед удалением news_id: ", create_reminder_the_news.news_id)
-        print("task_id: ", type(task_id))
-        print("task_id: ", task_id)
+    def __init__(
+        self,
+        reminder_news_repository: ReminderNewsRepository,
+        task_producer: TaskProducer,
+        max_groups: int = 100,
+        lease_seconds: int = 3600,
+    ) -> None:
+        self.reminder_news_repository = reminder_news_repository
+        self.task_producer = task_producer
+        self.max_groups = max_groups
+        self.lease_seconds = lease_seconds
+
+    async def __call__(self) -> int:
+        groups = await self.reminder_news_repository.claim_due_groups(
+            self.max_groups, timedelta(seconds=self.lease_seconds)
+        )
+        for group in groups:
+            await self.task_producer.fire_task(
+                enums.TaskNames.send_reminder_group,
+                queue=enums.TaskQueues.main_queue,
+                group_dict=group.json_dict(),
+            )
+        return len(groups)
 
-        # Удаление напоминания
-        await self.reminder_news_repository.delete_reminder(news_id, news_id)
 
-        # Отправка запроса на отмену, передача task_id как списка
-        revoke(state=None, task_id=[task_id], terminate=True)
+class NewsReminderGroupSendCommand:
+    """Sends the reminders of one group page by page over the SMTP pool.
 
+    The message is the same for the whole group, so it is rendered once.
+    Each page is claimed in a short transaction and sent after it commits,
+    so no row locks are held during SMTP round trips, and several workers
+    can share a group. Recipients whose send failed are handed to the email
+    outbox, which retries them.
+    """
 
-class LikeTheNewsCommand:
     def __init__(
         self,
-        news_like_repository: LikeNewsRepository,
-        news_retrieve_by_id_query: NewsRetrieveQuery,
-        current_user_query: CurrentUserQuery,
+        reminder_news_repository: ReminderNewsRepository,
         news_repository: NewsRepository,
+        sender: EmailSender,
+        email_outbox: EmailOutbox,
+        page_size: int = 200,
     ) -> None:
-        self.news_like_repository = news_like_repository
-        self.news_retrieve_by_id_query = news_retrieve_by_id_query
-        self.current_user_query = current_user_query
+        self.reminder_news_repository = reminder_news_repository
         self.news_repository = news_repository
+        self.sender = sender
+        self.email_outbox = email_outbox
+        self.page_size = page_size
 
-    async def __call__(self, payload: Like) -> None:
-        news_id = payload.news_id
-        current_user = await self.current_user_query()
-        user_id = current_user.id
+    async def __call__(self, group: schemas.ReminderGroup) -> int:
+        news = await self.news_repository.get_news_by_filter_or_none(
+            schemas.NewsWhere(id=group.news_id)
+        )
+        if news is None:
+            return 0
+        params = dict(name=news.name, description=news.description or "")
+
+        sent = 0
+        failed = False
+        while True:
+            async with self.reminder_news_repository.transaction.use():
+                page = await self.reminder_news_repository.claim_group_page(
+                    group, self.page_size
+                )
+            if not page:
+                break
+            recipients = [x for x in page if x.email]
+            results = await asyncio.gather(
+                *(
+                    self.sender.send(enums.EmailKinds.news_reminder, x.email, params)
+                    for x in recipients
+                ),
+                return_exceptions=True,
+            )
+            retries = [
+                (x.email, f"news_reminder:{x.id}")
+                for x, result in zip(recipients, results)
+                if isinstance(result, BaseException)
+            ]
+            if retries:
+                logger.warning(
+                    "{} reminders of news {} failed, queued for retry",
+                    len(retries),
+                    group.news_id,
+                )
+                await self.email_outbox.enqueue_many(
+                    enums.EmailKinds.news_reminder, retries, params
+                )
+                failed = True
+            sent += len(recipients) - len(retries)
+
+        if failed:
+            await self.email_outbox.kick()
+        return sent
 
-        news = await self.news_retrieve_by_id_query(news_id)
 
-        if news is None:
-            raise HTTPException(status_code=404, detail="News not found")
+class LikeTheNewsCommand:
+    def __init__(
+        self,
+        news_like_repository: LikeNewsRepository,
+        current_principal_query: CurrentPrincipalQuery,
+    ) -> None:
+        self.news_like_repository = news_like_repository
+        self.current_principal_query = current_principal_query
 
-        like_exists = await self.news_like_repository.check_like_exists(
-            news_id, user_id
+    async def __call__(self, payload: Like) -> LikesCount:
+        principal = await self.current_principal_query()
+
+        likes = await self.news_like_repository.toggle_like(
+            payload.news_id, principal.sub, principal.kind
         )
 
-        if like_exists:
-            new_likes_count = news.likes - 1
-            await self.news_like_repository.delete_like_news(news_id, user_id)
-        else:
-            new_likes_count = news.likes + 1
-            create_like_the_news = schemas.LikeTheNews(
-                news_id=news_id,
-                user_id=user_id,
-            )
-            await self.news_like_repository.create_like_news(create_like_the_news)
+        if likes is None:
+            raise HTTPException(status_code=404, detail="News not found")
 
-        await self.news_repository.update_news_likes(news_id, new_likes_count)
+        return LikesCount(likes=likes)
 
 
 class UnlikeTheNewsCommand:
     def __init__(
         self,
         news_like_repository: LikeNewsRepository,
-        news_retrieve_by_id_query: NewsRetrieveQuery,
-        current_user_query: CurrentUserQuery,
-        news_repository: NewsRepository,
+        current_principal_query: CurrentPrincipalQuery,
     ) -> None:
         self.news_like_repository = news_like_repository
-        self.news_retrieve_by_id_query = news_retrieve_by_id_query
-        self.current_user_query = current_user_query
-        self.news_repository = news_repository
-
-    async def __call__(self, payload: Like) -> None:
-        news_id = payload.news_id
-        current_user = await self.current_user_query()
-        user_id = current_user.id
+        self.current_principal_query = current_principal_query
 
-        news = await self.news_retrieve_by_id_query(news_id)
+    async def __call__(self, payload: Like) -> LikesCount:
+        principal = await self.current_principal_query()
 
-        if news is None:
-            raise HTTPException(status_code=404, detail="News not found")
-
-        like_exists = await self.news_like_repository.check_like_exists(
-            news_id, user_id
+        likes = await self.news_like_repository.remove_like(
+            payload.news_id, principal.sub, principal.kind
         )
-        if not like_exists:
-            raise HTTPException(status_code=404, detail="Like not found")
 
-        new_likes_count = max(news.likes - 1, 0)
+        if likes is None:
+            raise HTTPException(status_code=404, detail="Like not found")
 
-        await self.news_like_repository.delete_like_news(news_id, user_id)
-        await self.news_repository.update_news_likes(news_id, new_likes_count)
+        return LikesCount(likes=likes)
@@ -1,12 +1,18 @@
+from datetime import timedelta
+
 from a8t_tools.db.transactions import AsyncDbTransaction
 from dependency_injector import containers, providers
 
+from app.domain.common.counters import LikeCounterBuffer
+from app.domain.common.response_cache import ResponseCache
 from app.domain.news.commands import (
     DeleteReminderTheNewsCommand,
     LikeTheNewsCommand,
     NewsCreateCommand,
     NewsDeleteCommand,
     NewsPartialUpdateCommand,
+    NewsReminderDispatchCommand,
+    NewsReminderGroupSendCommand,
     ReminderTheNewsCommand,
     UnlikeTheNewsCommand,
 )
@@ -14,7 +20,6 @@ from app.domain.news.queries import (
     NewsListQuery,
     NewsManagementListQuery,
     NewsRetrieveQuery,
-    TaskNewsRetrieveQuery,
 )
 from app.domain.news.repositories import (
     LikeNewsRepository,
@@ -26,23 +31,33 @@ from app.domain.users.containers import UserContainer
 
 class NewsContainer(containers.DeclarativeContainer):
     transaction = providers.Dependency(instance_of=AsyncDbTransaction)
-
-    news_repository = providers.Factory(NewsRepository, transaction=transaction)
+    like_counter_buffer = providers.Dependency(instance_of=LikeCounterBuffer)
+    response_cache = providers.Dependency(instance_of=ResponseCache)
+    reminder_lead_hours = providers.Dependency(instance_of=int)
+    reminder_page_size = providers.Dependency(instance_of=int)
+    reminder_lease_seconds = providers.Dependency(instance_of=int)
+
+    news_repository = providers.Factory(
+        NewsRepository,
+        transaction=transaction,
+        counter_buffer=like_counter_buffer,
+    )
 
     news_like_repository = providers.Factory(
-        LikeNewsRepository, transaction=transaction
+        LikeNewsRepository,
+        transaction=transaction,
+        counter_buffer=like_counter_buffer,
     )
     reminder_news_repository = providers.Factory(
         ReminderNewsRepository, transaction=transaction
     )
 
-    active_tasks = {}
-
     user_container = providers.Container(UserContainer)
 
     create_command = providers.Factory(
         NewsCreateCommand,
         news_repository=news_repository,
+        response_cache=response_cache,
     )
 
     current_news_query = providers.Factory(
@@ -52,6 +67,9 @@ class NewsContainer(containers.DeclarativeContainer):
     news_partial_update_command = providers.Factory(
         NewsPartialUpdateCommand,
         news_repository=news_repository,
+        reminder_news_repository=reminder_news_repository,
+        response_cache=response_cache,
+        lead_time=providers.Factory(timedelta, hours=reminder_lead_hours),
     )
 
     news_retrieve_by_id_query = providers.Factory(
@@ -62,6 +80,9 @@ class NewsContainer(containers.DeclarativeContainer):
     news_list_query = providers.Factory(
         NewsListQuery,
         news_repository=news_repository,
+        news_like_repository=news_like_repository,
+        reminder_news_repository=reminder_news_repository,
+        token_payload_query=user_container.current_user_token_payload_query,
     )
 
     management_list_query = providers.Factory(
@@ -69,14 +90,10 @@ class NewsContainer(containers.DeclarativeContainer):
         query=news_list_query,
     )
 
-    task_news_query = providers.Factory(
-        TaskNewsRetrieveQuery,
-        reminder_news_repository=reminder_news_repository,
-    )
-
     delete_news = providers.Factory(
         NewsDeleteCommand,
         news_repository=news_repository,
+        response_cache=response_cache,
     )
 
     reminder_the_news_command = providers.Factory(
@@ -85,32 +102,40 @@ class NewsContainer(containers.DeclarativeContainer):
         current_user_query=user_container.current_user_query,
         news_repository=news_repository,
         reminder_news_repository=reminder_news_repository,
-        task_producer=user_container.task_producer,
+        lead_time=providers.Factory(timedelta, hours=reminder_lead_hours),
     )
 
     delete_reminder_the_news_command = providers.Factory(
         DeleteReminderTheNewsCommand,
-        news_retrieve_by_id_query=news_retrieve_by_id_query,
-        task_news_query=task_news_query,
         current_user_query=user_container.current_user_query,
         news_repository=news_repository,
         reminder_news_repository=reminder_news_repository,
+    )
+
+    reminder_dispatch_command = providers.Factory(
+        NewsReminderDispatchCommand,
+        reminder_news_repository=reminder_news_repository,
         task_producer=user_container.task_producer,
-        active_tasks=active_tasks,
+        lease_seconds=reminder_lease_seconds,
+    )
+
+    reminder_group_send_command = providers.Factory(
+        NewsReminderGroupSendCommand,
+        reminder_news_repository=reminder_news_repository,
+        news_repository=news_repository,
+        sender=user_container.email_notification,
+        email_outbox=user_container.email_outbox,
+        page_size=reminder_page_size,
     )
 
     like_the_news_command = providers.Factory(
         LikeTheNewsCommand,
         news_like_repository=news_like_repository,
-        news_retrieve_by_id_query=news_retrieve_by_id_query,
-        current_user_query=user_container.current_user_query,
-        news_repository=news_repository,
+        current_principal_query=user_container.current_principal_query,
     )
 
     unlike_the_news_command = providers.Factory(
         UnlikeTheNewsCommand,
         news_like_repository=news_like_repository,
-        news_retrieve_by_id_query=news_retrieve_by_id_query,
-        current_user_query=user_container.current_user_query,
-        news_repository=news_repository,
+        current_principal_query=user_container.current_principal_query,
     )
@@ -3,25 +3,58 @@ from uuid import UUID
 from a8t_tools.db.pagination import Paginated
 
 from app.domain.news import schemas
-from app.domain.news.repositories import NewsRepository, ReminderNewsRepository
+from app.domain.news.repositories import (
+    LikeNewsRepository,
+    NewsRepository,
+    ReminderNewsRepository,
+)
 from app.domain.news.schemas import NewsListRequestSchema
+from app.domain.users.auth.queries import CurrentUserTokenPayloadQuery
 
 
 class NewsListQuery:
-    def __init__(self, news_repository: NewsRepository):
+    def __init__(
+        self,
+        news_repository: NewsRepository,
+        news_like_repository: LikeNewsRepository,
+        reminder_news_repository: ReminderNewsRepository,
+        token_payload_query: CurrentUserTokenPayloadQuery,
+    ):
         self.news_repository = news_repository
+        self.news_like_repository = news_like_repository
+        self.reminder_news_repository = reminder_news_repository
+        self.token_payload_query = token_payload_query
 
     async def __call__(
         self, payload: schemas.NewsListRequestSchema
-    ) -> Paginated[schemas.News]:
-        return await self.news_repository.get_news(payload.pagination, payload.sorting)
+    ) -> Paginated[schemas.NewsDetailsFull]:
+        result = await self.news_repository.get_news(
+            payload.pagination, payload.sorting
+        )
+
+        token_payload = await self.token_payload_query()
+        if token_payload is not None:
+            news_ids = [item.id for item in result.items]
+            liked_ids = await self.news_like_repository.get_liked_target_ids(
+                news_ids, token_payload.sub, token_payload.kind
+            )
+            reminded_ids = await self.reminder_news_repository.get_reminded_news_ids(
+                news_ids, token_payload.sub
+            )
+            for item in result.items:
+                item.liked = item.id in liked_ids
+                item.reminded = item.id in reminded_ids
+
+        return result
 
 
 class NewsManagementListQuery:
     def __init__(self, query: NewsListQuery) -> None:
         self.query = query
 
-    async def __call__(self, payload: NewsListRequestSchema) -> Paginated[schemas.News]:
+    async def __call__(
+        self, payload: NewsListRequestSchema
+    ) -> Paginated[schemas.NewsDetailsFull]:
         return await self.query(payload)
 
 
@@ -34,22 +67,3 @@ class NewsRetrieveQuery:
             schemas.NewsWhere(id=news_id)
         )
         return schemas.NewsDetailsFull.model_validate(news_result)
-
-
-class TaskNewsRetrieveQuery:
-    def __init__(self, reminder_news_repository: ReminderNewsRepository):
-        self.reminder_news_repository = reminder_news_repository
-
-    async def __call__(
-        self, news_id: UUID, user_id: UUID
-    ) -> schemas.ReminderDetailsFull:
-        print("Передалось user_id: ", user_id)
-        print("Передалось news_id: ", news_id)
-
-        task_id_news_result = (
-            await self.reminder_news_repository.get_task_id_news_by_filter_or_none(
-                schemas.TaskIdNewsWhere(news_id=news_id, user_id=user_id)
-            )
-        )
-
-        return schemas.ReminderDetailsFull.model_validate(task_id_news_result)
@@ -1,14 +1,29 @@
-from uuid import UUID
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
 
 from a8t_tools.db.pagination import Paginated, PaginationCallable
 from a8t_tools.db.sorting import SortingData
 from a8t_tools.db.transactions import AsyncDbTransaction
 from a8t_tools.db.utils import CrudRepositoryMixin
-from sqlalchemy import ColumnElement, and_, delete, insert, select, update
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.base import ExecutableOption
 
 from app.domain.common import models
+from app.domain.common.counters import LikeCounterBuffer
+from app.domain.common.repositories import LikeRepositoryMixin
 from app.domain.common.schemas import IdContainer
 from app.domain.news import schemas
 
@@ -18,46 +33,38 @@ class NewsRepository(CrudRepositoryMixin[models.News]):
         selectinload(models.News.avatar_attachment),
     ]
 
-    def __init__(self, transaction: AsyncDbTransaction):
+    def __init__(
+        self, transaction: AsyncDbTransaction, counter_buffer: LikeCounterBuffer
+    ):
         self.model = models.News
         self.transaction = transaction
+        self.counter_buffer = counter_buffer
 
     async def create_news(self, payload: schemas.NewsCreate) -> IdContainer:
         return IdContainer(id=await self._create(payload))
 
     async def get_news(
         self,
-        pagination: PaginationCallable[schemas.News] | None = None,
+        pagination: PaginationCallable[schemas.NewsDetailsFull] | None = None,
         sorting: SortingData[schemas.NewsSorts] | None = None,
-    ) -> Paginated[schemas.News]:
-        return await self._get_list(
-            schemas.News,
+    ) -> Paginated[schemas.NewsDetailsFull]:
+        result = await self._get_list(
+            schemas.NewsDetailsFull,
             pagination=pagination,
             sorting=sorting,
             options=self.load_options,
         )
+        self.counter_buffer.merge(models.News, result.items)
+        return result
 
-    async def update_news_likes(self, news_id: UUID, new_likes_count: int) -> None:
+    async def increment_news_reminder(self, news_id: UUID, delta: int = 1) -> None:
         async with self.transaction.use() as session:
             stmt = (
                 update(models.News)
                 .where(models.News.id == news_id)
-                .values(likes=new_likes_count)
+                .values(reminder=models.News.reminder + delta)
             )
             await session.execute(stmt)
-            await session.commit()
-
-    async def update_news_reminder(
-        self, news_id: UUID, new_reminder_count: int
-    ) -> None:
-        async with self.transaction.use() as session:
-            stmt = (
-                update(models.News)
-                .where(models.News.id == news_id)
-                .values(likes=new_reminder_count)
-            )
-            await session.execute(stmt)
-            await session.commit()
 
     async def partial_update_news(
         self, news_id: UUID, payload: schemas.NewsPartialUpdate
@@ -67,11 +74,14 @@ class NewsRepository(CrudRepositoryMixin[models.News]):
     async def get_news_by_filter_or_none(
         self, where: schemas.NewsWhere
     ) -> schemas.NewsDetailsFull | None:
-        return await self._get_or_none(
+        result = await self._get_or_none(
             schemas.NewsDetailsFull,
             condition=await self._format_filters(where),
             options=self.load_options,
         )
+        if result is not None:
+            self.counter_buffer.merge(models.News, [result])
+        return result
 
     async def _format_filters(self, where: schemas.NewsWhere) -> ColumnElement[bool]:
         filters: list[ColumnElement[bool]] = []
@@ -97,113 +107,158 @@ class ReminderNewsRepository(CrudRepositoryMixin[models.NewsReminder]):
         self.model = models.NewsReminder
         self.transaction = transaction
 
-    async def create_reminder(self, payload: schemas.ReminderCreate) -> IdContainer:
-        return IdContainer(id=await self._create(payload))
-
-    async def create_task_id(
-        self, news_id: UUID, payload: schemas.TaskIdCreate
-    ) -> None:
-        return await self._partial_update(news_id, payload)
-
-    async def get_task_id_news_by_filter_or_none(
-        self, where: schemas.TaskIdNewsWhere
-    ) -> schemas.ReminderDetailsFull | None:
-        print("Получилось user_id: ", where.user_id)
-        print("Получилось news_id: ", where.news_id)
-        return await self._get_or_none(
-            schemas.ReminderDetailsFull,
-            condition=await self._format_filters(where),
+    async def create_reminder(
+        self, payload: schemas.ReminderCreate
+    ) -> IdContainer | None:
+        stmt = (
+            insert(models.NewsReminder)
+            .values(
+                id=uuid4(),
+                news_id=payload.news_id,
+                user_id=payload.user_id,
+                staff_id=payload.staff_id,
+                notify_at=payload.notify_at,
+            )
+            .on_conflict_do_nothing()
+            .returning(models.NewsReminder.id)
         )
+        async with self.transaction.use() as session:
+            reminder_id = (await session.execute(stmt)).scalar_one_or_none()
+        return IdContainer(id=reminder_id) if reminder_id is not None else None
 
-    async def _format_filters(
-        self, where: schemas.TaskIdNewsWhere
-    ) -> ColumnElement[bool]:
-        filters: list[ColumnElement[bool]] = []
-
-        if where.news_id is not None:
-            filters.append(models.NewsReminder.news_id == where.news_id)
+    async def get_reminded_news_ids(
+        self, news_ids: Sequence[UUID], owner_id: UUID
+    ) -> set[UUID]:
+        if not news_ids:
+            return set()
 
-        return and_(*filters)
-
-    async def delete_reminder(self, news_id: UUID, user_id: UUID) -> None:
-        print("Передалось в удаление user_id: ", user_id)
-        print("Передалось в удаление news_id: ", news_id)
+        ids = bindparam(
+            "news_ids", list(news_ids), type_=ARRAY(models.NewsReminder.news_id.type)
+        )
+        stmt = select(models.NewsReminder.news_id).where(
+            models.NewsReminder.news_id == any_(ids),
+            or_(
+                models.NewsReminder.user_id == owner_id,
+                models.NewsReminder.staff_id == owner_id,
+            ),
+        )
         async with self.transaction.use() as session:
-            stmt = delete(models.NewsReminder).where(
-                and_(
-                    models.NewsReminder.news_id == news_id,
-                    models.NewsReminder.user_id == user_id,
-                )
+            return set((await session.execute(stmt)).scalars())
+
+    async def delete_reminder(self, news_id: UUID, owner_id: UUID) -> bool:
+        stmt = delete(models.NewsReminder).where(
+            models.NewsReminder.news_id == news_id,
+            or_(
+                models.NewsReminder.user_id == owner_id,
+                models.NewsReminder.staff_id == owner_id,
+            ),
+        )
+        async with self.transaction.use() as session:
+            return (await session.execute(stmt)).rowcount > 0
+
+    async def reschedule_pending(self, news_id: UUID, notify_at: datetime) -> int:
+        """Move the unsent reminders of a news item to ``notify_at``."""
+        stmt = (
+            update(models.NewsReminder)
+            .where(
+                models.NewsReminder.news_id == news_id,
+                models.NewsReminder.sent_at.is_(None),
             )
-            await session.execute(stmt)
-            await session.commit()
-
-
-class LikeNewsRepository(CrudRepositoryMixin[models.NewsLike]):
-    def __init__(self, transaction: AsyncDbTransaction):
-        self.model = models.NewsLike
-        self.transaction = transaction
-
-    async def create_like_news(self, payload: schemas.LikeTheNews) -> IdContainer:
+            .values(notify_at=notify_at)
+        )
         async with self.transaction.use() as session:
-            try:
-                like_query = select(models.NewsLike).where(
-                    (models.NewsLike.user_id == payload.user_id)
-                    & (models.NewsLike.news_id == payload.news_id)
-                )
-                like_exists = await session.execute(like_query)
-                existing_like = like_exists.scalar_one_or_none()
-
-                if existing_like:
-                    delete_stmt = delete(models.NewsLike).where(
-                        (models.NewsLike.user_id == payload.user_id)
-                        & (models.NewsLike.news_id == payload.news_id)
-                    )
-                    await session.execute(delete_stmt)
-                else:
-                    staff_query = select(models.Staff).where(
-                        models.Staff.id == payload.user_id
-                    )
-                    staff_exists = await session.execute(staff_query)
-
-                    if staff_exists.first():
-                        stmt = insert(models.NewsLike).values(
-                            {
-                                "staff_id": payload.user_id,
-                                "news_id": payload.news_id,
-                            }
-                        )
-                    else:
-                        stmt = insert(models.NewsLike).values(
-                            {
-                                "user_id": payload.user_id,
-                                "news_id": payload.news_id,
-                            }
-                        )
-
-                    await session.execute(stmt)
-
-            except Exception as e:
-                print(f"Error creating like info: {e}")
-
-    async def delete_like_news(self, news_id: int, user_id: int) -> None:
+            return (await session.execute(stmt)).rowcount
+
+    async def claim_due_groups(
+        self, limit: int, lease: timedelta
+    ) -> list[schemas.ReminderGroup]:
+        """Lease up to ``limit`` (news, time) pairs with reminders to send.
+
+        Unsent reminders of a leased group are skipped until ``lease``
+        passes, so a group is not dispatched again while it is in flight and
+        is picked up again if its worker dies.
+        """
+        free = or_(
+            models.NewsReminder.claimed_until.is_(None),
+            models.NewsReminder.claimed_until <= func.now(),
+        )
+        due = (
+            select(models.NewsReminder.news_id, models.NewsReminder.notify_at)
+            .where(
+                models.NewsReminder.sent_at.is_(None),
+                models.NewsReminder.notify_at <= func.now(),
+                free,
+            )
+            .group_by(models.NewsReminder.news_id, models.NewsReminder.notify_at)
+            .order_by(models.NewsReminder.notify_at)
+            .limit(limit)
+            .cte("due")
+        )
+        claimed = (
+            update(models.NewsReminder)
+            .where(
+                models.NewsReminder.news_id == due.c.news_id,
+                models.NewsReminder.notify_at == due.c.notify_at,
+                models.NewsReminder.sent_at.is_(None),
+                free,
+            )
+            .values(claimed_until=func.now() + lease)
+            .returning(models.NewsReminder.news_id, models.NewsReminder.notify_at)
+            .cte("claimed")
+        )
+        stmt = (
+            select(claimed.c.news_id, claimed.c.notify_at)
+            .distinct()
+            .order_by(claimed.c.notify_at)
+        )
         async with self.transaction.use() as session:
-            stmt = delete(models.NewsLike).where(
-                and_(
-                    models.NewsLike.news_id == news_id,
-                    models.NewsLike.user_id == user_id,
-                )
+            rows = (await session.execute(stmt)).all()
+        return [schemas.ReminderGroup.model_validate(row._mapping) for row in rows]
+
+    async def claim_group_page(
+        self, group: schemas.ReminderGroup, limit: int
+    ) -> list[schemas.ReminderRecipient]:
+        """Mark the next ``limit`` unsent reminders of ``group`` as sent.
+
+        Rows locked by another worker are skipped, so several workers can
+        page through one group without overlapping. Claims become final
+        when the transaction commits, which callers do before sending.
+        """
+        stmt = (
+            select(
+                models.NewsReminder.id,
+                func.coalesce(models.User.email, models.Staff.email).label("email"),
             )
-            await session.execute(stmt)
-            await session.commit()
-
-    async def check_like_exists(self, news_id: int, user_id: int) -> bool:
+            .outerjoin(models.User, models.User.id == models.NewsReminder.user_id)
+            .outerjoin(models.Staff, models.Staff.id == models.NewsReminder.staff_id)
+            .where(
+                models.NewsReminder.news_id == group.news_id,
+                models.NewsReminder.notify_at == group.notify_at,
+                models.NewsReminder.sent_at.is_(None),
+            )
+            .order_by(models.NewsReminder.id)
+            .limit(limit)
+            .with_for_update(of=models.NewsReminder, skip_locked=True)
+        )
         async with self.transaction.use() as session:
-            stmt = select(models.NewsLike).where(
-                and_(
-                    models.NewsLike.news_id == news_id,
-                    models.NewsLike.user_id == user_id,
+            rows = (await session.execute(stmt)).all()
+            if rows:
+                await session.execute(
+                    update(models.NewsReminder)
+                    .where(models.NewsReminder.id.in_([row.id for row in rows]))
+                    .values(sent_at=func.now())
                 )
-            )
-            result = await session.execute(stmt)
-            return result.first() is not None
+        return [schemas.ReminderRecipient.model_validate(row._mapping) for row in rows]
+
+
+class LikeNewsRepository(LikeRepositoryMixin, CrudRepositoryMixin[models.NewsLike]):
+    like_model = models.NewsLike
+    target_model = models.News
+    target_field = "news_id"
+
+    def __init__(
+        self, transaction: AsyncDbTransaction, counter_buffer: LikeCounterBuffer
+    ):
+        self.model = models.NewsLike
+        self.transaction = transaction
+        self.counter_buffer = counter_buffer
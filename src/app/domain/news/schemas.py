@@ -29,10 +29,13 @@ class NewsCreate(APIModel):
 
 class NewsDetailsFull(News):
     avatar_attachment: Attachment | None = None
+    liked: bool = False
+    reminded: bool = False
 
 
 class NewsPartialUpdate(APIModel):
     avatar_attachment_id: UUID | None = None
+    date: datetime | None = None
 
 
 class NewsSorts(enum.StrEnum):
@@ -58,31 +61,23 @@ class ReminderCreate(APIModel):
     news_id: UUID
     user_id: UUID | None = None
     staff_id: UUID | None = None
-    task_id: str | None = None
+    notify_at: datetime
 
 
-class ReminderDetailsFull(APIModel):
-    id: UUID
-    news_id: UUID | None = None
-    user_id: UUID | None = None
-    task_id: str | None = None
-    created_at: datetime
+class ReminderGroup(APIModel):
+    news_id: UUID
+    notify_at: datetime
 
 
-class TaskIdCreate(APIModel):
-    task_id: str | None = None
+class ReminderRecipient(APIModel):
+    id: UUID
+    email: str | None = None
 
 
 class ReminderTheNews(APIModel):
     news_id: UUID
 
 
-@dataclass
-class TaskIdNewsWhere:
-    news_id: UUID | None = None
-    user_id: UUID | None = None
-
-
 @dataclass
 class NewsListRequestSchema:
     pagination: pg.PaginationCallable[NewsDetailsFull] | None = None
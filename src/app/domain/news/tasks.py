@@ -0,0 +1,33 @@
+from typing import Any
+
+from a8t_tools.bus.consumer import consume
+from dependency_injector import wiring
+
+from app.containers import Container
+from app.domain.common.enums import TaskNames
+from app.domain.news.commands import (
+    NewsReminderDispatchCommand,
+    NewsReminderGroupSendCommand,
+)
+from app.domain.news.schemas import ReminderGroup
+
+
+@consume(TaskNames.send_due_reminders)
+@wiring.inject
+async def send_due_reminders(
+    command: NewsReminderDispatchCommand = wiring.Provide[
+        Container.news.reminder_dispatch_command
+    ],
+) -> None:
+    await command()
+
+
+@consume(TaskNames.send_reminder_group)
+@wiring.inject
+async def send_reminder_group(
+    group_dict: dict[str, Any],
+    command: NewsReminderGroupSendCommand = wiring.Provide[
+        Container.news.reminder_group_send_command
+    ],
+) -> None:
+    await command(ReminderGroup.model_validate(group_dict))
@@ -9,6 +9,7 @@ from fastapi.params import Form
 
 from app.api import deps
 from app.containers import Container
+from app.domain.common.pagination import CursorPaginationResults
 from app.domain.news import schemas
 from app.domain.news.commands import (
     DeleteReminderTheNewsCommand,
@@ -26,10 +27,19 @@ from app.domain.storage.attachments.commands import NewsAttachmentCreateCommand
 
 router = APIRouter()
 
+news_sorting = deps.get_sort_order_sorting_dep(
+    schemas.NewsSorts, schemas.NewsSorts.created_at, sorting.SortOrders.desc
+)
+
 
 @asynccontextmanager
-async def user_token(token: str):
-    async with override_user_token(token or ""):
+async def user_token(token: str | None):
+    if token is None:
+        # Keep whatever the Authorization header resolved to
+        yield
+        return
+
+    async with override_user_token(token):
         yield
 
 
@@ -59,7 +69,7 @@ async def get_news_by_id(
 
 @router.get(
     "/get/list",
-    response_model=pagination.CountPaginationResults[schemas.NewsDetailsFull],
+    response_model=CursorPaginationResults[schemas.NewsDetailsFull],
 )
 @wiring.inject
 async def get_news_list(
@@ -67,19 +77,15 @@ async def get_news_list(
         wiring.Provide[Container.news.management_list_query]
     ),
     pagination: pagination.PaginationCallable[schemas.NewsDetailsFull] = Depends(
-        deps.get_skip_limit_pagination_dep(schemas.NewsDetailsFull)
+        deps.get_cursor_pagination_dep(schemas.NewsDetailsFull, news_sorting)
     ),
-    sorting: sorting.SortingData[schemas.NewsSorts] = Depends(
-        deps.get_sort_order_sorting_dep(
-            schemas.NewsSorts,
-            schemas.NewsSorts.created_at,
-            sorting.SortOrders.desc,
+    sorting: sorting.SortingData[schemas.NewsSorts] = Depends(news_sorting),
+    token: str | None = Header(None),
+) -> CursorPaginationResults[schemas.NewsDetailsFull]:
+    async with user_token(token):
+        return await query(
+            schemas.NewsListRequestSchema(pagination=pagination, sorting=sorting)
         )
-    ),
-) -> pagination.Paginated[schemas.NewsDetailsFull]:
-    return await query(
-        schemas.NewsListRequestSchema(pagination=pagination, sorting=sorting)
-    )
 
 
 @router.post("/create/avatar", response_model=AttachmentSchema.Attachment)
@@ -1,109 +1,187 @@
-import smtplib
-from email.message import EmailMessage
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from a8t_tools.bus.producer import TaskProducer
+from loguru import logger
+
+from app.domain.common import enums
+from app.domain.notifications import schemas
+from app.domain.notifications.repositories import EmailOutboxRepository
+from app.domain.notifications.templates import EmailTemplates
+from app.domain.notifications.transport import SmtpConnectionPool
 
 
 class EmailSender:
     def __init__(
         self,
-        smtp_server: str = "smtp.yandex.ru",
-        port: int = 465,
-        email_address: str = "tikhonov.igor2028@yandex.ru",
-        email_password: str = "abqiulywjvibrefg",
+        transport: SmtpConnectionPool,
+        templates: EmailTemplates,
+        email_address: str,
     ):
-        self.smtp_server = smtp_server
-        self.port = port
+        self.transport = transport
+        self.templates = templates
         self.email_address = email_address
-        self.email_password = email_password
+
+    async def send(
+        self, kind: enums.EmailKinds, recipient: str, params: dict[str, Any]
+    ) -> None:
+        message = self.templates.render(kind, self.email_address, recipient, params)
+        await self.transport.send(message)
 
     async def send_verification_email(self, recipient_email: str, code: int):
-        msg = EmailMessage()
-        msg["Subject"] = "Подтверждение почты"
-        msg["From"] = self.email_address
-        msg["To"] = recipient_email
-
-        html_content = rf"""\ 
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #003366; background-color: #486DB5;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px; background-color: #ffffff;">
-                <h2 style="color: #FFD700;">Сброс пароля</h2>
-                <p>Здравствуйте,</p>
-                <p>Подтверждение почты на платформе Отдела Образовательных Программ.</p>
-                <p>Код для подтверждения почты:</p>
-                <p style="font-size: 18px; font-weight: bold; color: #FFD700;">{code}</p>
-                <p>Если вы не запрашивали подтверждения почты, проигнорируйте это письмо.</p>
-                <p>С уважением,<br>Ваш Отдел Образовательных Программ</p>
-                <p style="margin-top: 20px; color: #777; font-size: 12px;">Если у вас возникли какие-либо вопросы, пожалуйста, свяжитесь с нами.</p>
-            </div>
-        </body>
-        </html>
-        """
-
-        msg.set_content(
-            f"Здравствуйте,\n\nВы запросили сброс пароля на платформе Отдела Образовательных Программ.\n\nКод для сброса пароля: {code}\n\nЕсли вы не запрашивали сброс пароля, проигнорируйте это письмо.\n\nС уважением,\nВаш Отдел Образовательных Программ"
+        await self.send(
+            enums.EmailKinds.email_verification, recipient_email, dict(code=code)
         )
-        msg.add_alternative(html_content, subtype="html")
-
-        with smtplib.SMTP_SSL(self.smtp_server, self.port) as smtp:
-            smtp.login(self.email_address, self.email_password)
-            smtp.send_message(msg)
 
     async def send_first_registration(self, user_email: str):
-        msg = EmailMessage()
-        msg["Subject"] = "Подтверждение регистрации"
-        msg["From"] = self.email_address
-        msg["To"] = user_email
-
-        html_content = f"""\
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #003366; background-color: #486DB5;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px; background-color: #ffffff;">
-                <h2 style="color: #FFD700;">Подтверждение регистрации</h2>
-                <p>Дорогой пользователь платформы Отдела Образовательных Программ!</p>
-                <p>Мы рады приветствовать тебя!</p>
-                <p>Твой Отдел Образовательных Программ <span style="color: #FFD700;">&lt;3</span></p>
-                <p style="margin-top: 20px; color: #777; font-size: 12px;">Если у вас возникли какие-либо вопросы, пожалуйста, свяжитесь с нами.</p>
-            </div>
-        </body>
-        </html>
-        """
-
-        msg.set_content(
-            "Дорогой пользователь платформы Отдела Образовательных Программ! Мы рады приветствовать тебя! Твой Отдел Образовательных Программ <3"
+        await self.send(enums.EmailKinds.registration, user_email, {})
+
+    async def send_password_reset_email(self, recipient_email: str, code: str):
+        await self.send(
+            enums.EmailKinds.password_reset, recipient_email, dict(code=code)
         )
-        msg.add_alternative(html_content, subtype="html")
 
-        with smtplib.SMTP_SSL(self.smtp_server, self.port) as smtp:
-            smtp.login(self.email_address, self.email_password)
-            smtp.send_message(msg)
+    async def send_news_reminder(
+        self, recipient_email: str, news_name: str, news_description: str
+    ):
+        await self.send(
+            enums.EmailKinds.news_reminder,
+            recipient_email,
+            dict(name=news_name, description=news_description),
+        )
 
-    async def send_password_reset_email(self, recipient_email: str, code: str):
-        msg = EmailMessage()
-        msg["Subject"] = "Сброс пароля"
-        msg["From"] = self.email_address
-        msg["To"] = recipient_email
-
-        html_content = f"""\
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #003366; background-color: #486DB5;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px; background-color: #ffffff;">
-                <h2 style="color: #FFD700;">Сброс пароля</h2>
-                <p>Здравствуйте,</p>
-                <p>Вы запросили сброс пароля на платформе Отдела Образовательных Программ.</p>
-                <p>Код для сброса пароля:</p>
-                <p style="font-size: 18px; font-weight: bold; color: #FFD700;">{code}</p>
-                <p>Если вы не запрашивали сброс пароля, проигнорируйте это письмо.</p>
-                <p>С уважением,<br>Ваш Отдел Образовательных Программ</p>
-                <p style="margin-top: 20px; color: #777; font-size: 12px;">Если у вас возникли какие-либо вопросы, пожалуйста, свяжитесь с нами.</p>
-            </div>
-        </body>
-        </html>
-        """
-
-        msg.set_content(
-            f"Здравствуйте,\n\nВы запросили сброс пароля на платформе Отдела Образовательных Программ.\n\nКод для сброса пароля: {code}\n\nЕсли вы не запрашивали сброс пароля, проигнорируйте это письмо.\n\nС уважением,\nВаш Отдел Образовательных Программ"
+
+class EmailOutbox:
+    """Queues mail in the ``email_outbox`` table instead of sending it inline.
+
+    ``enqueue`` is a single INSERT that joins the caller's transaction, so
+    the message is stored if and only if the domain change is. ``kick``
+    asks a worker to drain the outbox and should be called once that
+    transaction is committed.
+    """
+
+    def __init__(
+        self, repository: EmailOutboxRepository, task_producer: TaskProducer
+    ) -> None:
+        self.repository = repository
+        self.task_producer = task_producer
+
+    async def enqueue(
+        self,
+        kind: enums.EmailKinds,
+        recipient: str,
+        params: dict[str, Any] | None = None,
+        dedupe_key: str | None = None,
+    ) -> None:
+        await self.repository.enqueue(
+            schemas.EmailOutboxCreate(
+                kind=kind,
+                recipient=recipient,
+                params=params or {},
+                dedupe_key=dedupe_key,
+            )
         )
-        msg.add_alternative(html_content, subtype="html")
 
-        with smtplib.SMTP_SSL(self.smtp_server, self.port) as smtp:
-            smtp.login(self.email_address, self.email_password)
-            smtp.send_message(msg)
+    async def enqueue_many(
+        self,
+        kind: enums.EmailKinds,
+        messages: list[tuple[str, str | None]],
+        params: dict[str, Any] | None = None,
+    ) -> None:
+        """Queue the same mail for several ``(recipient, dedupe_key)`` pairs."""
+        await self.repository.enqueue_many(
+            [
+                schemas.EmailOutboxCreate(
+                    kind=kind,
+                    recipient=recipient,
+                    params=params or {},
+                    dedupe_key=dedupe_key,
+                )
+                for recipient, dedupe_key in messages
+            ]
+        )
+
+    async def kick(self) -> None:
+        try:
+            await self.task_producer.fire_task(
+                enums.TaskNames.drain_email_outbox,
+                queue=enums.TaskQueues.main_queue,
+            )
+        except Exception:
+            # The message is stored, the next drain picks it up
+            logger.exception("Failed to schedule an email outbox drain")
+
+
+class EmailOutboxDrainCommand:
+    """Sends one batch of due outbox messages.
+
+    Batches are claimed with ``FOR UPDATE SKIP LOCKED``, so any number of
+    workers can drain at once without sending a message twice; a full batch
+    schedules another drain first to pull more workers in. Failed messages
+    are retried with exponential backoff and marked failed after
+    ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        repository: EmailOutboxRepository,
+        sender: EmailSender,
+        task_producer: TaskProducer,
+        batch_size: int = 50,
+        max_attempts: int = 8,
+        retry_seconds: int = 30,
+        max_retry_seconds: int = 3600,
+        lease_seconds: int = 300,
+    ) -> None:
+        self.repository = repository
+        self.sender = sender
+        self.task_producer = task_producer
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.lease_seconds = lease_seconds
+
+    async def __call__(self) -> int:
+        async with self.repository.transaction.use():
+            items = await self.repository.claim_due(
+                self.batch_size, timedelta(seconds=self.lease_seconds)
+            )
+        if not items:
+            return 0
+        if len(items) == self.batch_size:
+            await self.task_producer.fire_task(
+                enums.TaskNames.drain_email_outbox,
+                queue=enums.TaskQueues.main_queue,
+            )
+
+        results = await asyncio.gather(
+            *(self.sender.send(x.kind, x.recipient, x.params) for x in items),
+            return_exceptions=True,
+        )
+
+        sent = []
+        async with self.repository.transaction.use():
+            for item, result in zip(items, results):
+                if not isinstance(result, BaseException):
+                    sent.append(item.id)
+                    continue
+                logger.opt(exception=result).warning(
+                    "Failed to send {} email {} (attempt {})",
+                    item.kind,
+                    item.id,
+                    item.attempts,
+                )
+                await self.repository.mark_failed(
+                    item.id, repr(result), self._retry_at(item.attempts)
+                )
+            if sent:
+                await self.repository.mark_sent(sent)
+        return len(sent)
+
+    def _retry_at(self, attempts: int) -> datetime | None:
+        if attempts >= self.max_attempts:
+            return None
+        delay = min(self.retry_seconds * 2 ** (attempts - 1), self.max_retry_seconds)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
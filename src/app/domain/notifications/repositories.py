@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from a8t_tools.db.transactions import AsyncDbTransaction
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.domain.common import enums, models
+from app.domain.notifications import schemas
+
+
+class EmailOutboxRepository:
+    def __init__(self, transaction: AsyncDbTransaction):
+        self.transaction = transaction
+
+    async def enqueue(self, payload: schemas.EmailOutboxCreate) -> bool:
+        """Insert the message unless one with the same ``dedupe_key`` exists."""
+        query = (
+            insert(models.EmailOutbox)
+            .values(**payload.model_dump())
+            .on_conflict_do_nothing(index_elements=[models.EmailOutbox.dedupe_key])
+            .returning(models.EmailOutbox.id)
+        )
+
+        async with self.transaction.use() as db:
+            return (await db.execute(query)).scalar_one_or_none() is not None
+
+    async def enqueue_many(self, payloads: list[schemas.EmailOutboxCreate]) -> None:
+        if not payloads:
+            return
+        query = (
+            insert(models.EmailOutbox)
+            .values([payload.model_dump() for payload in payloads])
+            .on_conflict_do_nothing(index_elements=[models.EmailOutbox.dedupe_key])
+        )
+
+        async with self.transaction.use() as db:
+            await db.execute(query)
+
+    async def claim_due(
+        self, limit: int, lease: timedelta
+    ) -> list[schemas.EmailOutboxItem]:
+        """Take up to ``limit`` due messages for sending.
+
+        Rows locked by another worker are skipped. Claimed rows are pushed
+        ``lease`` into the future, so a worker dying mid-send only delays them.
+        """
+        due = (
+            select(models.EmailOutbox.id)
+            .where(
+                models.EmailOutbox.status == enums.EmailOutboxStatuses.pending,
+                models.EmailOutbox.next_attempt_at <= func.now(),
+            )
+            .order_by(models.EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(models.EmailOutbox)
+            .where(models.EmailOutbox.id.in_(due.scalar_subquery()))
+            .values(
+                attempts=models.EmailOutbox.attempts + 1,
+                next_attempt_at=func.now() + lease,
+            )
+            .returning(models.EmailOutbox)
+        )
+
+        async with self.transaction.use() as db:
+            results = (await db.execute(query)).scalars().all()
+            return [schemas.EmailOutboxItem.model_validate(x) for x in results]
+
+    async def mark_sent(self, ids: list[UUID]) -> None:
+        """Params may hold one-time codes, so they are dropped once sent."""
+        query = (
+            update(models.EmailOutbox)
+            .where(models.EmailOutbox.id.in_(ids))
+            .values(
+                status=enums.EmailOutboxStatuses.sent,
+                sent_at=func.now(),
+                last_error=None,
+                params={},
+            )
+        )
+
+        async with self.transaction.use() as db:
+            await db.execute(query)
+
+    async def mark_failed(
+        self, outbox_id: UUID, error: str, retry_at: datetime | None
+    ) -> None:
+        """Record the error; without ``retry_at`` the message is given up on."""
+        values: dict = dict(last_error=error)
+        if retry_at is None:
+            values["status"] = enums.EmailOutboxStatuses.failed
+            values["params"] = {}
+        else:
+            values["next_attempt_at"] = retry_at
+        query = (
+            update(models.EmailOutbox)
+            .where(models.EmailOutbox.id == outbox_id)
+            .values(**values)
+        )
+
+        async with self.transaction.use() as db:
+            await db.execute(query)
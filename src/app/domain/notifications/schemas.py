@@ -0,0 +1,20 @@
+from typing import Any
+from uuid import UUID
+
+from app.domain.common.enums import EmailKinds
+from app.domain.common.schemas import APIModel
+
+
+class EmailOutboxCreate(APIModel):
+    kind: EmailKinds
+    recipient: str
+    params: dict[str, Any] = {}
+    dedupe_key: str | None = None
+
+
+class EmailOutboxItem(APIModel):
+    id: UUID
+    kind: EmailKinds
+    recipient: str
+    params: dict[str, Any]
+    attempts: int
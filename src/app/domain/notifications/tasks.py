@@ -0,0 +1,16 @@
+from a8t_tools.bus.consumer import consume
+from dependency_injector import wiring
+
+from app.containers import Container
+from app.domain.common.enums import TaskNames
+from app.domain.notifications.commands import EmailOutboxDrainCommand
+
+
+@consume(TaskNames.drain_email_outbox)
+@wiring.inject
+async def drain_email_outbox(
+    command: EmailOutboxDrainCommand = wiring.Provide[
+        Container.user.email_outbox_drain_command
+    ],
+) -> None:
+    await command()
@@ -0,0 +1,115 @@
+import functools
+import html
+import string
+from collections.abc import Callable, Mapping
+from email.message import EmailMessage, MIMEPart
+from pathlib import Path
+from typing import Any
+
+from app.domain.common.enums import EmailKinds
+
+TEMPLATES_DIR = Path(__file__).parent / "email_templates"
+
+SUBJECTS = {
+    EmailKinds.email_verification: "Подтверждение почты",
+    EmailKinds.registration: "Подтверждение регистрации",
+    EmailKinds.password_reset: "Сброс пароля",
+    EmailKinds.news_reminder: "Напоминание о новости: $name",
+}
+
+
+class CompiledTemplate:
+    """``string.Template`` source split once into literal text and field names."""
+
+    def __init__(self, source: str, escape: Callable[[str], str] = str) -> None:
+        self.escape = escape
+        self.segments: list[tuple[str, str | None]] = []
+        position = 0
+        for match in string.Template.pattern.finditer(source):
+            literal = source[position : match.start()]
+            position = match.end()
+            if match.group("escaped") is not None:
+                self.segments.append((literal + "$", None))
+                continue
+            field = match.group("named") or match.group("braced")
+            if field is None:
+                raise ValueError(f"Invalid placeholder at {match.start()}")
+            self.segments.append((literal, field))
+        self.segments.append((source[position:], None))
+        self.fields = frozenset(field for _, field in self.segments if field)
+
+    def render(self, params: Mapping[str, str]) -> str:
+        return "".join(
+            literal + (self.escape(params[field]) if field else "")
+            for literal, field in self.segments
+        )
+
+
+class EmailTemplate:
+    """Subject, plain-text and HTML body of one kind of mail.
+
+    The encoded body parts are cached per distinct set of field values, so
+    sending the same message to many recipients encodes it once and only
+    fills in the headers per recipient.
+    """
+
+    def __init__(self, subject: str, text: str, html_source: str) -> None:
+        self.subject = CompiledTemplate(subject)
+        self.text = CompiledTemplate(text)
+        self.html = CompiledTemplate(html_source, escape=html.escape)
+        self.fields = self.subject.fields | self.text.fields | self.html.fields
+        self._parts = functools.lru_cache(maxsize=256)(self._render_parts)
+
+    def render(
+        self, sender: str, recipient: str, params: Mapping[str, Any]
+    ) -> EmailMessage:
+        key = tuple(sorted((field, str(params[field])) for field in self.fields))
+        subject, text_part, html_part = self._parts(key)
+
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = sender
+        message["To"] = recipient
+        message["MIME-Version"] = "1.0"
+        message.make_alternative()
+        message.attach(text_part)
+        message.attach(html_part)
+        return message
+
+    def _render_parts(
+        self, key: tuple[tuple[str, str], ...]
+    ) -> tuple[str, MIMEPart, MIMEPart]:
+        params = dict(key)
+        text_part = MIMEPart()
+        text_part.set_content(self.text.render(params))
+        html_part = MIMEPart()
+        html_part.set_content(self.html.render(params), subtype="html")
+        return self.subject.render(params), text_part, html_part
+
+
+class EmailTemplates:
+    def __init__(self, templates: dict[EmailKinds, EmailTemplate]) -> None:
+        self.templates = templates
+
+    @classmethod
+    def from_directory(cls, directory: Path = TEMPLATES_DIR) -> "EmailTemplates":
+        """Load and compile ``<kind>.txt`` and ``<kind>.html`` of every kind."""
+        return cls(
+            {
+                kind: EmailTemplate(
+                    SUBJECTS[kind],
+                    (directory / f"{kind}.txt").read_text(encoding="utf-8"),
+                    (directory / f"{kind}.html").read_text(encoding="utf-8"),
+                )
+                for kind in EmailKinds
+            }
+        )
+
+    def render(
+        self,
+        kind: EmailKinds,
+        sender: str,
+        recipient: str,
+        params: Mapping[str, Any] | None = None,
+    ) -> EmailMessage:
+        return self.templates[kind].render(sender, recipient, params or {})
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from email.message import EmailMessage
+
+import aiosmtplib
+from loguru import logger
+
+# Errors after which the connection can't be trusted any more
+_CONNECTION_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    ConnectionError,
+)
+
+
+class SmtpConnectionPool:
+    """Sends mail over a few long-lived, already authenticated SMTP connections.
+
+    At most ``pool_size`` messages are in flight; each one borrows an idle
+    connection or opens a new one. Connections idle for longer than
+    ``idle_timeout`` are assumed dropped by the server and replaced, and a
+    send that fails because the connection went away is retried once on a
+    fresh one. Connections belong to the event loop that opened them, so
+    the pool starts over when used from another loop (e.g. a new worker
+    loop).
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        use_tls: bool = True,
+        start_tls: bool = False,
+        pool_size: int = 2,
+        idle_timeout: float = 60,
+        timeout: float = 30,
+    ) -> None:
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def send(self, message: EmailMessage) -> None:
+        async with self._get_semaphore():
+            client = await self._acquire()
+            try:
+                await client.send_message(message)
+            except _CONNECTION_ERRORS:
+                logger.info("SMTP connection lost, retrying on a new one")
+                client.close()
+                client = await self._connect()
+                try:
+                    await client.send_message(message)
+                except BaseException:
+                    client.close()
+                    raise
+            except BaseException:
+                client.close()
+                raise
+            self._idle.append((client, time.monotonic()))
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for client, _ in idle:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        now = time.monotonic()
+        while self._idle:
+            client, last_used = self._idle.pop()
+            if client.is_connected and now - last_used < self.idle_timeout:
+                return client
+            client.close()
+        return await self._connect()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        try:
+            if self.username and self.password:
+                await client.login(self.username, self.password)
+        except BaseException:
+            client.close()
+            raise
+        return client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            # Connections of another loop can't be used (or closed) from this one
+            self._idle = []
+            self._semaphore = asyncio.Semaphore(self.pool_size)
+            self._loop = loop
+        return self._semaphore
@@ -1,8 +1,9 @@
 from fastapi import HTTPException
 
+from app.domain.common.enums import ResponseCacheScopes
 from app.domain.common.exceptions import NotFoundError
+from app.domain.common.response_cache import ResponseCache
 from app.domain.projects import schemas
-from app.domain.projects.queries import ProjectRetrieveQuery
 from app.domain.projects.repositories import (
     LikeTheProjectRepository,
     ProjectAttachmentRepository,
@@ -12,19 +13,22 @@ from app.domain.projects.repositories import (
 from app.domain.projects.schemas import (
     AddEmployees,
     Like,
+    LikesCount,
     ProjectAttachment,
     ProjectCreate,
     ProjectDelete,
 )
-from app.domain.users.auth.queries import CurrentUserQuery
+from app.domain.users.auth.queries import CurrentPrincipalQuery
 
 
 class ProjectCreateCommand:
     def __init__(
         self,
         project_repository: ProjectRepository,
+        response_cache: ResponseCache,
     ) -> None:
         self.project_repository = project_repository
+        self.response_cache = response_cache
 
     async def __call__(self, payload: ProjectCreate) -> None:
         create_project = schemas.ProjectCreate(
@@ -37,25 +41,31 @@ class ProjectCreateCommand:
         )
 
         await self.project_repository.create_project(create_project)
+        await self.response_cache.invalidate(ResponseCacheScopes.projects)
 
 
 class ProjectDeleteCommand:
     def __init__(
         self,
         project_repository: ProjectRepository,
+        response_cache: ResponseCache,
     ) -> None:
         self.project_repository = project_repository
+        self.response_cache = response_cache
 
     async def __call__(self, payload: ProjectDelete) -> None:
-        return await self.project_repository.delete_project(payload)
+        await self.project_repository.delete_project(payload)
+        await self.response_cache.invalidate(ResponseCacheScopes.projects)
 
 
 class AddEmployeesCommand:
     def __init__(
         self,
         project_staff_repository: ProjectStaffRepository,
+        response_cache: ResponseCache,
     ) -> None:
         self.project_staff_repository = project_staff_repository
+        self.response_cache = response_cache
 
     async def __call__(self, payload: AddEmployees) -> None:
         project_id = payload.project_id
@@ -69,89 +79,61 @@ class AddEmployeesCommand:
         await self.project_staff_repository.create_add_staff_project(
             create_like_the_project
         )
+        await self.response_cache.invalidate(ResponseCacheScopes.projects)
 
 
 class LikeTheProjectCommand:
     def __init__(
         self,
         project_like_repository: LikeTheProjectRepository,
-        project_retrieve_by_id_query: ProjectRetrieveQuery,
-        current_user_query: CurrentUserQuery,
-        project_repository: ProjectRepository,
+        current_principal_query: CurrentPrincipalQuery,
     ) -> None:
         self.project_like_repository = project_like_repository
-        self.project_retrieve_by_id_query = project_retrieve_by_id_query
-        self.current_user_query = current_user_query
-        self.project_repository = project_repository
-
-    async def __call__(self, payload: Like) -> None:
-        project_id = payload.project_id
-        current_user = await self.current_user_query()
-        user_id = current_user.id
-
-        project = await self.project_retrieve_by_id_query(project_id)
+        self.current_principal_query = current_principal_query
 
-        if project is None:
-            raise HTTPException(status_code=404, detail="Project not found")
+    async def __call__(self, payload: Like) -> LikesCount:
+        principal = await self.current_principal_query()
 
-        like_exists = await self.project_like_repository.check_like_exists(
-            project_id, user_id
+        likes = await self.project_like_repository.toggle_like(
+            payload.project_id, principal.sub, principal.kind
         )
 
-        if like_exists:
-            new_likes_count = project.likes - 1
-            await self.project_like_repository.delete_like_project(project_id, user_id)
-        else:
-            new_likes_count = project.likes + 1
-            create_like_the_project = schemas.LikeTheProject(
-                project_id=project_id,
-                user_id=user_id,
-            )
-            await self.project_like_repository.create_like_project(
-                create_like_the_project
-            )
+        if likes is None:
+            raise HTTPException(status_code=404, detail="Project not found")
 
-        await self.project_repository.update_project_likes(project_id, new_likes_count)
+        return LikesCount(likes=likes)
 
 
 class UnlikeTheProjectCommand:
     def __init__(
         self,
         project_like_repository: LikeTheProjectRepository,
-        project_retrieve_by_id_query: ProjectRetrieveQuery,
-        current_user_query: CurrentUserQuery,
-        project_repository: ProjectRepository,
+        current_principal_query: CurrentPrincipalQuery,
     ) -> None:
         self.project_like_repository = project_like_repository
-        self.project_retrieve_by_id_query = project_retrieve_by_id_query
-        self.current_user_query = current_user_query
-        self.project_repository = project_repository
+        self.current_principal_query = current_principal_query
 
-    async def __call__(self, payload: Like) -> None:
-        project_id = payload.project_id
-        current_user = await self.current_user_query()
-        user_id = current_user.id
-
-        project = await self.project_retrieve_by_id_query(project_id)
-
-        if project is None:
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        new_likes_count = project.likes - 1
+    async def __call__(self, payload: Like) -> LikesCount:
+        principal = await self.current_principal_query()
 
-        like_exists = await self.project_like_repository.check_like_exists(
-            project_id, user_id
+        likes = await self.project_like_repository.remove_like(
+            payload.project_id, principal.sub, principal.kind
         )
-        if not like_exists:
+
+        if likes is None:
             raise HTTPException(status_code=404, detail="Like not found")
 
-        await self.project_repository.update_project_likes(project_id, new_likes_count)
-        await self.project_like_repository.delete_like_project(project_id, user_id)
+        return LikesCount(likes=likes)
 
 
 class ProjectPartialUpdateCommand:
-    def __init__(self, project_repository: ProjectRepository):
+    def __init__(
+        self,
+        project_repository: ProjectRepository,
+        response_cache: ResponseCache,
+    ):
         self.project_repository = project_repository
+        self.response_cache = response_cache
 
     async def __call__(
         self, payload: schemas.ProjectPartialUpdate
@@ -169,6 +151,7 @@ class ProjectPartialUpdateCommand:
             print("Произошла ошибка при обновлении проекта:", e)
             raise
 
+        await self.response_cache.invalidate(ResponseCacheScopes.projects)
         return schemas.ProjectDetailsFull.model_validate(user)
 
 
@@ -176,21 +159,27 @@ class ProjectAttachmentDeleteCommand:
     def __init__(
         self,
         project_attachment_repository: ProjectAttachmentRepository,
+        response_cache: ResponseCache,
     ) -> None:
         self.project_attachment_repository = project_attachment_repository
+        self.response_cache = response_cache
 
-    async def __call__(self, payload: ProjectAttachment) -> None:
-        return await self.project_attachment_repository.delete_project_attachment(
-            payload
-        )
+    async def __call__(self, payload: ProjectAttachment) -> int:
+        repository = self.project_attachment_repository
+        deleted = await repository.delete_project_attachment(payload)
+        await self.response_cache.invalidate(ResponseCacheScopes.projects)
+        return deleted
 
 
 class ProjectStaffDeleteCommand:
     def __init__(
         self,
         project_staff_repository: ProjectStaffRepository,
+        response_cache: ResponseCache,
     ) -> None:
         self.project_staff_repository = project_staff_repository
+        self.response_cache = response_cache
 
     async def __call__(self, payload: ProjectAttachment) -> None:
-        return await self.project_staff_repository.delete_staff_project(payload)
+        await self.project_staff_repository.delete_staff_project(payload)
+        await self.response_cache.invalidate(ResponseCacheScopes.projects)
@@ -1,6 +1,8 @@
 from a8t_tools.db.transactions import AsyncDbTransaction
 from dependency_injector import containers, providers
 
+from app.domain.common.counters import LikeCounterBuffer
+from app.domain.common.response_cache import ResponseCache
 from app.domain.projects.commands import (
     AddEmployeesCommand,
     LikeTheProjectCommand,
@@ -31,10 +33,18 @@ from app.domain.users.containers import UserContainer
 
 class ProjectContainer(containers.DeclarativeContainer):
     transaction = providers.Dependency(instance_of=AsyncDbTransaction)
+    like_counter_buffer = providers.Dependency(instance_of=LikeCounterBuffer)
+    response_cache = providers.Dependency(instance_of=ResponseCache)
 
-    project_repository = providers.Factory(ProjectRepository, transaction=transaction)
+    project_repository = providers.Factory(
+        ProjectRepository,
+        transaction=transaction,
+        counter_buffer=like_counter_buffer,
+    )
     project_like_repository = providers.Factory(
-        LikeTheProjectRepository, transaction=transaction
+        LikeTheProjectRepository,
+        transaction=transaction,
+        counter_buffer=like_counter_buffer,
     )
     project_staff_repository = providers.Factory(
         ProjectStaffRepository, transaction=transaction
@@ -48,16 +58,19 @@ class ProjectContainer(containers.DeclarativeContainer):
     create_command = providers.Factory(
         ProjectCreateCommand,
         project_repository=project_repository,
+        response_cache=response_cache,
     )
 
     delete_project = providers.Factory(
         ProjectDeleteCommand,
         project_repository=project_repository,
+        response_cache=response_cache,
     )
 
     create_add_employees_command = providers.Factory(
         AddEmployeesCommand,
         project_staff_repository=project_staff_repository,
+        response_cache=response_cache,
     )
 
     project_retrieve_by_id_query = providers.Factory(
@@ -68,6 +81,7 @@ class ProjectContainer(containers.DeclarativeContainer):
     project_partial_update_command = providers.Factory(
         ProjectPartialUpdateCommand,
         project_repository=project_repository,
+        response_cache=response_cache,
     )
 
     current_project_query = providers.Factory(
@@ -77,32 +91,32 @@ class ProjectContainer(containers.DeclarativeContainer):
     like_the_project_command = providers.Factory(
         LikeTheProjectCommand,
         project_like_repository=project_like_repository,
-        project_retrieve_by_id_query=project_retrieve_by_id_query,
-        current_user_query=user_container.current_user_query,
-        project_repository=project_repository,
+        current_principal_query=user_container.current_principal_query,
     )
 
     unlike_the_project_command = providers.Factory(
         UnlikeTheProjectCommand,
         project_like_repository=project_like_repository,
-        project_retrieve_by_id_query=project_retrieve_by_id_query,
-        current_user_query=user_container.current_user_query,
-        project_repository=project_repository,
+        current_principal_query=user_container.current_principal_query,
     )
 
     delete_project_attachment_command = providers.Factory(
         ProjectAttachmentDeleteCommand,
         project_attachment_repository=project_attachment_repository,
+        response_cache=response_cache,
     )
 
     delete_project_staff_command = providers.Factory(
         ProjectStaffDeleteCommand,
         project_staff_repository=project_staff_repository,
+        response_cache=response_cache,
     )
 
     project_list_query = providers.Factory(
         ProjectListQuery,
         project_repository=project_repository,
+        project_like_repository=project_like_repository,
+        token_payload_query=user_container.current_user_token_payload_query,
     )
 
     project_attachment_list_query = providers.Factory(
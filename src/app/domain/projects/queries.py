@@ -4,6 +4,7 @@ from a8t_tools.db.pagination import Paginated
 
 from app.domain.projects import schemas
 from app.domain.projects.repositories import (
+    LikeTheProjectRepository,
     ProjectAttachmentRepository,
     ProjectRepository,
     ProjectStaffRepository,
@@ -13,19 +14,39 @@ from app.domain.projects.schemas import (
     ProjectListRequestSchema,
     ProjectStaffListRequestSchema,
 )
+from app.domain.users.auth.queries import CurrentUserTokenPayloadQuery
 
 
 class ProjectListQuery:
-    def __init__(self, project_repository: ProjectRepository):
+    def __init__(
+        self,
+        project_repository: ProjectRepository,
+        project_like_repository: LikeTheProjectRepository,
+        token_payload_query: CurrentUserTokenPayloadQuery,
+    ):
         self.project_repository = project_repository
+        self.project_like_repository = project_like_repository
+        self.token_payload_query = token_payload_query
 
     async def __call__(
         self, payload: schemas.ProjectListRequestSchema
-    ) -> Paginated[schemas.Project]:
-        return await self.project_repository.get_project(
+    ) -> Paginated[schemas.ProjectDetailsFull]:
+        result = await self.project_repository.get_project(
             payload.pagination, payload.sorting
         )
 
+        token_payload = await self.token_payload_query()
+        if token_payload is not None:
+            liked_ids = await self.project_like_repository.get_liked_target_ids(
+                [item.id for item in result.items],
+                token_payload.sub,
+                token_payload.kind,
+            )
+            for item in result.items:
+                item.liked = item.id in liked_ids
+
+        return result
+
 
 class ProjectStaffListQuery:
     def __init__(self, project_staff_repository: ProjectStaffRepository):
@@ -61,7 +82,7 @@ class ProjectManagementListQuery:
 
     async def __call__(
         self, payload: ProjectListRequestSchema
-    ) -> Paginated[schemas.Project]:
+    ) -> Paginated[schemas.ProjectDetailsFull]:
         return await self.query(payload)
 
 
@@ -4,11 +4,13 @@ from a8t_tools.db.pagination import Paginated, PaginationCallable
 from a8t_tools.db.sorting import SortingData
 from a8t_tools.db.transactions import AsyncDbTransaction
 from a8t_tools.db.utils import CrudRepositoryMixin
-from sqlalchemy import ColumnElement, and_, delete, insert, select, update
+from sqlalchemy import ColumnElement, and_, delete
 from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.base import ExecutableOption
 
 from app.domain.common import models
+from app.domain.common.counters import LikeCounterBuffer
+from app.domain.common.repositories import LikeRepositoryMixin
 from app.domain.common.schemas import IdContainer
 from app.domain.projects import schemas
 
@@ -45,16 +47,19 @@ class ProjectAttachmentRepository(CrudRepositoryMixin[models.ProjectAttachment])
 
     async def delete_project_attachment(
         self, payload: schemas.ProjectAttachment
-    ) -> None:
+    ) -> int:
         async with self.transaction.use() as session:
-            stmt = delete(models.ProjectAttachment).where(
-                and_(
-                    models.ProjectAttachment.project_id == payload.project_id,
-                    models.ProjectAttachment.attachment_id == payload.attachment_id,
+            stmt = (
+                delete(models.ProjectAttachment)
+                .where(
+                    and_(
+                        models.ProjectAttachment.project_id == payload.project_id,
+                        models.ProjectAttachment.attachment_id == payload.attachment_id,
+                    )
                 )
+                .returning(models.ProjectAttachment.id)
             )
-            await session.execute(stmt)
-            await session.commit()
+            return len((await session.execute(stmt)).all())
 
 
 class ProjectRepository(CrudRepositoryMixin[models.Project]):
@@ -62,9 +67,12 @@ class ProjectRepository(CrudRepositoryMixin[models.Project]):
         selectinload(models.Project.avatar_attachment),
     ]
 
-    def __init__(self, transaction: AsyncDbTransaction):
+    def __init__(
+        self, transaction: AsyncDbTransaction, counter_buffer: LikeCounterBuffer
+    ):
         self.model = models.Project
         self.transaction = transaction
+        self.counter_buffer = counter_buffer
 
     async def create_project(self, payload: schemas.ProjectCreate) -> IdContainer:
         return IdContainer(id=await self._create(payload))
@@ -86,34 +94,29 @@ class ProjectRepository(CrudRepositoryMixin[models.Project]):
 
     async def get_project(
         self,
-        pagination: PaginationCallable[schemas.Project] | None = None,
+        pagination: PaginationCallable[schemas.ProjectDetailsFull] | None = None,
         sorting: SortingData[schemas.ProjectSorts] | None = None,
-    ) -> Paginated[schemas.Project]:
-        return await self._get_list(
-            schemas.Project,
+    ) -> Paginated[schemas.ProjectDetailsFull]:
+        result = await self._get_list(
+            schemas.ProjectDetailsFull,
             pagination=pagination,
             sorting=sorting,
             options=self.load_options,
         )
+        self.counter_buffer.merge(models.Project, result.items)
+        return result
 
     async def get_project_by_filter_or_none(
         self, where: schemas.ProjectWhere
     ) -> schemas.ProjectDetailsFull | None:
-        return await self._get_or_none(
+        result = await self._get_or_none(
             schemas.ProjectDetailsFull,
             condition=await self._format_filters(where),
             options=self.load_options,
         )
-
-    async def update_project_likes(self, project_id: int, new_likes_count: int) -> None:
-        async with self.transaction.use() as session:
-            stmt = (
-                update(models.Project)
-                .where(models.Project.id == project_id)
-                .values(likes=new_likes_count)
-            )
-            await session.execute(stmt)
-            await session.commit()
+        if result is not None:
+            self.counter_buffer.merge(models.Project, [result])
+        return result
 
     async def _format_filters(self, where: schemas.ProjectWhere) -> ColumnElement[bool]:
         filters: list[ColumnElement[bool]] = []
@@ -165,71 +168,16 @@ class ProjectStaffRepository(CrudRepositoryMixin[models.ProjectStaff]):
             await session.commit()
 
 
-class LikeTheProjectRepository(CrudRepositoryMixin[models.ProjectLike]):
-    def __init__(self, transaction: AsyncDbTransaction):
+class LikeTheProjectRepository(
+    LikeRepositoryMixin, CrudRepositoryMixin[models.ProjectLike]
+):
+    like_model = models.ProjectLike
+    target_model = models.Project
+    target_field = "project_id"
+
+    def __init__(
+        self, transaction: AsyncDbTransaction, counter_buffer: LikeCounterBuffer
+    ):
         self.model = models.ProjectLike
         self.transaction = transaction
-
-    async def create_like_project(self, payload: schemas.LikeTheProject) -> IdContainer:
-        async with self.transaction.use() as session:
-            try:
-                like_query = select(models.ProjectLike).where(
-                    (models.ProjectLike.user_id == payload.user_id)
-                    & (models.ProjectLike.project_id == payload.project_id)
-                )
-                like_exists = await session.execute(like_query)
-                existing_like = like_exists.scalar_one_or_none()
-
-                if existing_like:
-                    delete_stmt = delete(models.ProjectLike).where(
-                        (models.ProjectLike.user_id == payload.user_id)
-                        & (models.ProjectLike.project_id == payload.project_id)
-                    )
-                    await session.execute(delete_stmt)
-                else:
-                    staff_query = select(models.Staff).where(
-                        models.Staff.id == payload.user_id
-                    )
-                    staff_exists = await session.execute(staff_query)
-
-                    if staff_exists.first():
-                        stmt = insert(models.ProjectLike).values(
-                            {
-                                "staff_id": payload.user_id,
-                                "project_id": payload.project_id,
-                            }
-                        )
-                    else:
-                        stmt = insert(models.ProjectLike).values(
-                            {
-                                "user_id": payload.user_id,
-                                "project_id": payload.project_id,
-                            }
-                        )
-
-                    await session.execute(stmt)
-
-            except Exception as e:
-                print(f"Error creating like info: {e}")
-
-    async def delete_like_project(self, project_id: int, user_id: int) -> None:
-        async with self.transaction.use() as session:
-            stmt = delete(models.ProjectLike).where(
-                and_(
-                    models.ProjectLike.project_id == project_id,
-                    models.ProjectLike.user_id == user_id,
-                )
-            )
-            await session.execute(stmt)
-            await session.commit()
-
-    async def check_like_exists(self, project_id: int, user_id: int) -> bool:
-        async with self.transaction.use() as session:
-            stmt = select(models.ProjectLike).where(
-                and_(
-                    models.ProjectLike.project_id == project_id,
-                    models.ProjectLike.user_id == user_id,
-                )
-            )
-            result = await session.execute(stmt)
-            return result.first() is not None
+        self.counter_buffer = counter_buffer
@@ -49,6 +49,7 @@ class ProjectPartialUpdate(APIModel):
 
 class ProjectDetailsFull(Project):
     avatar_attachment: Attachment | None = None
+    liked: bool = False
 
 
 class ProjectStaffShort(APIModel):
@@ -85,6 +86,10 @@ class Like(APIModel):
     clip_id: int | None = None
 
 
+class LikesCount(APIModel):
+    likes: int
+
+
 class LikeTheProject(APIModel):
     project_id: UUID
     user_id: UUID | None = None
@@ -10,11 +10,14 @@ from starlette import status
 
 from app.api import deps
 from app.containers import Container
+from app.domain.common.pagination import (
+    CursorPaginationResults,
+    OffsetPaginationResults,
+)
 from app.domain.projects import schemas
 from app.domain.projects.commands import (
     AddEmployeesCommand,
     LikeTheProjectCommand,
-    ProjectAttachmentDeleteCommand,
     ProjectCreateCommand,
     ProjectDeleteCommand,
     ProjectPartialUpdateCommand,
@@ -29,16 +32,27 @@ from app.domain.projects.queries import (
 from app.domain.projects.schemas import AddEmployees, Like, ProjectCreate, ProjectDelete
 from app.domain.storage.attachments import schemas as AttachmentSchema
 from app.domain.storage.attachments.commands import (
+    ProjectAttachmentBatchCreateCommand,
     ProjectAttachmentCreateCommand,
+    ProjectAttachmentUnlinkCommand,
     ProjectAvatarCreateCommand,
 )
 
 router = APIRouter()
 
+project_sorting = deps.get_sort_order_sorting_dep(
+    schemas.ProjectSorts, schemas.ProjectSorts.created_at, sorting.SortOrders.desc
+)
+
 
 @asynccontextmanager
-async def user_token(token: str):
-    async with override_user_token(token or ""):
+async def user_token(token: str | None):
+    if token is None:
+        # Keep whatever the Authorization header resolved to
+        yield
+        return
+
+    async with override_user_token(token):
         yield
 
 
@@ -58,7 +72,7 @@ async def create_project(
 
 @router.get(
     "/get/list",
-    response_model=pagination.CountPaginationResults[schemas.ProjectDetailsFull],
+    response_model=CursorPaginationResults[schemas.ProjectDetailsFull],
 )
 @wiring.inject
 async def get_projects_list(
@@ -66,19 +80,15 @@ async def get_projects_list(
             wiring.Provide[Container.project.management_list_query]
         ),
         pagination: pagination.PaginationCallable[schemas.ProjectDetailsFull] = Depends(
-            deps.get_skip_limit_pagination_dep(schemas.ProjectDetailsFull)
+            deps.get_cursor_pagination_dep(schemas.ProjectDetailsFull, project_sorting)
         ),
-        sorting: sorting.SortingData[schemas.ProjectSorts] = Depends(
-            deps.get_sort_order_sorting_dep(
-                schemas.ProjectSorts,
-                schemas.ProjectSorts.created_at,
-                sorting.SortOrders.desc,
-            )
-        ),
-) -> pagination.Paginated[schemas.ProjectDetailsFull]:
-    return await query(
-        schemas.ProjectListRequestSchema(pagination=pagination, sorting=sorting)
-    )
+        sorting: sorting.SortingData[schemas.ProjectSorts] = Depends(project_sorting),
+        token: str | None = Header(None),
+) -> CursorPaginationResults[schemas.ProjectDetailsFull]:
+    async with user_token(token):
+        return await query(
+            schemas.ProjectListRequestSchema(pagination=pagination, sorting=sorting)
+        )
 
 
 @router.get("/get/{project_id}", response_model=None)
@@ -136,7 +146,7 @@ async def add_staff(
 
 @router.get(
     "/get/staff/list",
-    response_model=pagination.CountPaginationResults[schemas.ProjectStaffDetailsShort],
+    response_model=OffsetPaginationResults[schemas.ProjectStaffDetailsShort],
 )
 @wiring.inject
 async def get_project_staff_list(
@@ -154,7 +164,7 @@ async def get_project_staff_list(
                 sorting.SortOrders.desc,
             )
         ),
-) -> pagination.Paginated[schemas.ProjectStaffDetailsShort]:
+) -> OffsetPaginationResults[schemas.ProjectStaffDetailsShort]:
     return await query(
         schemas.ProjectStaffListRequestSchema(
             project_id=project_id, pagination=pagination, sorting=sorting
@@ -241,9 +251,36 @@ async def create_project_attachment(
         )
 
 
+@router.post(
+    "/create/attachments", response_model=AttachmentSchema.AttachmentBatchResult
+)
+@wiring.inject
+async def create_project_attachments(
+        attachments: list[UploadFile],
+        project_id: UUID = Form(...),
+        token: str = Header(...),
+        command: ProjectAttachmentBatchCreateCommand = Depends(
+            wiring.Provide[Container.attachment.project_batch_create_attachment_command]
+        ),
+) -> AttachmentSchema.AttachmentBatchResult:
+    payload = Like(project_id=project_id)
+
+    async with user_token(token):
+        return await command(
+            payload,
+            [
+                AttachmentSchema.AttachmentCreate(
+                    file=attachment.file,
+                    name=attachment.filename,
+                )
+                for attachment in attachments
+            ],
+        )
+
+
 @router.get(
     "/get/attachment/list",
-    response_model=pagination.CountPaginationResults[
+    response_model=OffsetPaginationResults[
         schemas.ProjectAttachmentDetailsShort
     ],
 )
@@ -265,7 +302,7 @@ async def get_project_attachment_list(
                 sorting.SortOrders.desc,
             )
         ),
-) -> pagination.Paginated[schemas.ProjectAttachmentDetailsShort]:
+) -> OffsetPaginationResults[schemas.ProjectAttachmentDetailsShort]:
     return await query(
         schemas.ProjectAttachmentListRequestSchema(
             project_id=project_id, pagination=pagination, sorting=sorting
@@ -278,8 +315,8 @@ async def get_project_attachment_list(
 async def delete_project_attachment(
         payload: schemas.ProjectAttachment,
         token: str = Header(...),
-        command: ProjectAttachmentDeleteCommand = Depends(
-            wiring.Provide[Container.project.delete_project_attachment_command]
+        command: ProjectAttachmentUnlinkCommand = Depends(
+            wiring.Provide[Container.attachment.project_attachment_unlink_command]
         ),
 ):
     async with user_token(token):
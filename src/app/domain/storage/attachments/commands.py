@@ -1,240 +1,93 @@
-import re
+import asyncio
+import functools
+import io
 import uuid
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
-from datetime import datetime
-from typing import IO
+from uuid import UUID
 
 from a8t_tools.storage.facade import FileStorage
-
-from app.domain.clips.commands import ClipPartialUpdateCommand
-from app.domain.clips.queries import ClipRetrieveQuery
-from app.domain.clips.schemas import ClipPartialUpdate
-from app.domain.news.commands import NewsPartialUpdateCommand
-from app.domain.news.queries import NewsRetrieveQuery
-from app.domain.news.schemas import NewsPartialUpdate
-from app.domain.projects.commands import ProjectPartialUpdateCommand
-from app.domain.projects.queries import ProjectRetrieveQuery
-from app.domain.projects.repositories import ProjectAttachmentRepository
-from app.domain.projects.schemas import Like, ProjectAttachment, ProjectPartialUpdate
+from loguru import logger
+from PIL import Image, UnidentifiedImageError
+
+from app.domain.common import models
+from app.domain.common.enums import ResponseCacheScopes
+from app.domain.common.exceptions import GenericApiError, NotFoundError
+from app.domain.common.response_cache import ResponseCache
+from app.domain.projects.commands import ProjectAttachmentDeleteCommand
+from app.domain.projects.schemas import Like, ProjectAttachment
 from app.domain.storage.attachments import schemas
+from app.domain.storage.attachments.images import (
+    VARIANT_FORMAT,
+    render_variants,
+    variant_path,
+)
+from app.domain.storage.attachments.presigned import PresignedStorage
 from app.domain.storage.attachments.repositories import AttachmentRepository
-from app.domain.users.core.commands import UserPartialUpdateCommand
-from app.domain.users.profile.queries import UserProfileMeQuery
+from app.domain.storage.attachments.services import (
+    AttachmentBatchOwner,
+    AttachmentIngestService,
+    AttachmentOwner,
+)
+from app.domain.storage.attachments.uploads import StreamingUploader
+from app.domain.users.auth.queries import CurrentPrincipalQuery
+
+# Owner columns whose cached responses embed the attachment with its variants
+VARIANT_OWNER_SCOPES = [
+    (models.Project, "avatar_attachment_id", ResponseCacheScopes.projects),
+    (models.ProjectAttachment, "attachment_id", ResponseCacheScopes.projects),
+    (models.News, "avatar_attachment_id", ResponseCacheScopes.news),
+    (models.Clip, "clip_attachment_id", ResponseCacheScopes.clips),
+]
 
 
 class AttachmentCreateCommand:
-    def __init__(
-        self,
-        repository: AttachmentRepository,
-        file_storage: FileStorage,
-        current_user_query: UserProfileMeQuery,
-        user_partial_update_command: UserPartialUpdateCommand,
-        bucket: str,
-        max_name_len: int = 60,
-    ):
-        self.repository = repository
-        self.file_storage = file_storage
-        self.current_user_query = current_user_query
-        self.user_partial_update_command = user_partial_update_command
-        self.bucket = bucket
-        self.max_name_len = max_name_len
+    def __init__(self, ingest_service: AttachmentIngestService):
+        self.ingest_service = ingest_service
 
     async def __call__(self, payload: schemas.AttachmentCreate) -> schemas.Attachment:
-        name = payload.name or self._get_random_name()
-        path = self._generate_path(name)
-
-        # Загружаем файл и получаем uri
-        uri = await self.file_storage.upload_file(self.bucket, path, payload.file)
-
-        # Если uri содержит лишний сегмент, исправляем его
-        if "/department-of-educational-programs-bucket/" in uri:
-            uri = uri.replace("/department-of-educational-programs-bucket/", "/")
-
-        id_container = await self.repository.create_attachment(
-            schemas.AttachmentCreateFull(
-                name=name,
-                path=path,
-                uri=uri,
-            )
-        )
-
-        attachment = await self.repository.get_attachment_or_none(id_container.id)
-
-        assert attachment
-        return attachment
-
-    def _generate_path(self, name: str) -> str:
-        now = datetime.now()
-        folder = now.strftime("%Y/%m/%d")
-        timestamp = now.strftime("%s")
-        stripped_slugified_name = self._slugify(name)[: self.max_name_len]
-        return f"/{folder}/{timestamp}.{stripped_slugified_name}"
-
-    @classmethod
-    def _get_random_name(cls) -> str:
-        return str(uuid.uuid4())
-
-    @classmethod
-    def _slugify(cls, s: str) -> str:
-        s = s.lower().strip()
-        s = re.sub(r"[^\w\s\.-]", "", s)
-        s = re.sub(r"[\s_-]+", "-", s)
-        s = re.sub(r"^-+|-+$", "", s)
-        return s
+        return await self.ingest_service(payload)
 
 
 class ProjectAvatarCreateCommand:
     def __init__(
         self,
-        repository: AttachmentRepository,
-        file_storage: FileStorage,
-        current_project_query: ProjectRetrieveQuery,
-        project_partial_update_command: ProjectPartialUpdateCommand,
-        bucket: str,
-        max_name_len: int = 60,
+        ingest_service: AttachmentIngestService,
+        owner: AttachmentOwner,
+        response_cache: ResponseCache,
     ):
-        self.repository = repository
-        self.file_storage = file_storage
-        self.current_project_query = current_project_query
-        self.project_partial_update_command = project_partial_update_command
-        self.bucket = bucket
-        self.max_name_len = max_name_len
+        self.ingest_service = ingest_service
+        self.owner = owner
+        self.response_cache = response_cache
 
     async def __call__(
         self, like_payload: Like, attachment_payload: schemas.AttachmentCreate
     ) -> schemas.Attachment:
-        current_project = await self.current_project_query(like_payload.project_id)
-
-        name = attachment_payload.name or self._get_random_name()
-        path = self._generate_path(name)
-
-        # Загружаем файл и получаем uri
-        uri = await self.file_storage.upload_file(
-            self.bucket, path, attachment_payload.file
+        attachment = await self.ingest_service(
+            attachment_payload, self.owner, like_payload.project_id
         )
-
-        # Если uri содержит лишний сегмент, исправляем его
-        if "/department-of-educational-programs-bucket/" in uri:
-            uri = uri.replace("/department-of-educational-programs-bucket/", "/")
-
-        id_container = await self.repository.create_attachment(
-            schemas.AttachmentCreateFull(
-                name=name,
-                path=path,
-                uri=uri,
-            )
-        )
-
-        attachment = await self.repository.get_attachment_or_none(id_container.id)
-        attachment_id = attachment.id
-
-        update_payload = ProjectPartialUpdate(avatar_attachment_id=attachment_id)
-
-        await self.project_partial_update_command(current_project.id, update_payload)
-
-        assert attachment
+        await self.response_cache.invalidate(ResponseCacheScopes.projects)
         return attachment
 
-    def _generate_path(self, name: str) -> str:
-        now = datetime.now()
-        folder = now.strftime("%Y/%m/%d")
-        timestamp = now.strftime("%s")
-        stripped_slugified_name = self._slugify(name)[: self.max_name_len]
-        return f"/{folder}/{timestamp}.{stripped_slugified_name}"
-
-    @classmethod
-    def _get_random_name(cls) -> str:
-        return str(uuid.uuid4())
-
-    @classmethod
-    def _slugify(cls, s: str) -> str:
-        s = s.lower().strip()
-        s = re.sub(r"[^\w\s\.-]", "", s)
-        s = re.sub(r"[\s_-]+", "-", s)
-        s = re.sub(r"^-+|-+$", "", s)
-        return s
-
 
 class ProjectAttachmentCreateCommand:
     def __init__(
         self,
-        repository: AttachmentRepository,
-        file_storage: FileStorage,
-        current_project_query: ProjectRetrieveQuery,
-        project_partial_update_command: ProjectPartialUpdateCommand,
-        project_attachment_repository: ProjectAttachmentRepository,
-        bucket: str,
-        max_name_len: int = 60,
+        ingest_service: AttachmentIngestService,
+        owner: AttachmentOwner,
+        response_cache: ResponseCache,
     ):
-        self.repository = repository
-        self.file_storage = file_storage
-        self.current_project_query = current_project_query
-        self.project_partial_update_command = project_partial_update_command
-        self.project_attachment_repository = project_attachment_repository
-        self.bucket = bucket
-        self.max_name_len = max_name_len
+        self.ingest_service = ingest_service
+        self.owner = owner
+        self.response_cache = response_cache
 
     async def __call__(
         self, like_payload: Like, attachment_payload: schemas.AttachmentCreate
     ) -> schemas.Attachment:
-        current_project = await self.current_project_query(like_payload.project_id)
-
-        name = attachment_payload.name or self._get_random_name()
-        path = self._generate_path(name)
-
-        # Загружаем файл и получаем uri
-        uri = await self.file_storage.upload_file(
-            self.bucket, path, attachment_payload.file
-        )
-
-        # Если uri содержит лишний сегмент, исправляем его
-        if "/department-of-educational-programs-bucket/" in uri:
-            uri = uri.replace("/department-of-educational-programs-bucket/", "/")
-
-        id_container = await self.repository.create_attachment(
-            schemas.AttachmentCreateFull(
-                name=name,
-                path=path,
-                uri=uri,
-            )
+        attachment = await self.ingest_service(
+            attachment_payload, self.owner, like_payload.project_id
         )
-
-        attachment = await self.repository.get_attachment_or_none(id_container.id)
-        attachment_id = attachment.id
-
-        # Создаем объект схемы
-        project_attachment_payload = ProjectAttachment(
-            project_id=current_project.id, attachment_id=attachment.id
-        )
-
-        # Передаем объект в метод
-        await self.project_attachment_repository.create_project_attachment(
-            project_attachment_payload
-        )
-
-        assert attachment
+        await self.response_cache.invalidate(ResponseCacheScopes.projects)
         return attachment
 
-    def _generate_path(self, name: str) -> str:
-        now = datetime.now()
-        folder = now.strftime("%Y/%m/%d")
-        timestamp = now.strftime("%s")
-        stripped_slugified_name = self._slugify(name)[: self.max_name_len]
-        return f"/{folder}/{timestamp}.{stripped_slugified_name}"
-
-    @classmethod
-    def _get_random_name(cls) -> str:
-        return str(uuid.uuid4())
-
-    @classmethod
-    def _slugify(cls, s: str) -> str:
-        s = s.lower().strip()
-        s = re.sub(r"[^\w\s\.-]", "", s)
-        s = re.sub(r"[\s_-]+", "-", s)
-        s = re.sub(r"^-+|-+$", "", s)
-        return s
-
 
 # class ProjectAvatarUpdateCommand:
 #     def __init__(
@@ -307,159 +160,226 @@ class ProjectAttachmentCreateCommand:
 class NewsAttachmentCreateCommand:
     def __init__(
         self,
-        repository: AttachmentRepository,
-        file_storage: FileStorage,
-        current_news_query: NewsRetrieveQuery,
-        news_partial_update_command: NewsPartialUpdateCommand,
-        bucket: str,
-        max_name_len: int = 60,
+        ingest_service: AttachmentIngestService,
+        owner: AttachmentOwner,
+        response_cache: ResponseCache,
     ):
-        self.repository = repository
-        self.file_storage = file_storage
-        self.current_news_query = current_news_query
-        self.news_partial_update_command = news_partial_update_command
-        self.bucket = bucket
-        self.max_name_len = max_name_len
+        self.ingest_service = ingest_service
+        self.owner = owner
+        self.response_cache = response_cache
 
     async def __call__(
         self, like_payload: Like, attachment_payload: schemas.AttachmentCreate
     ) -> schemas.Attachment:
-        current_news = await self.current_news_query(like_payload.news_id)
-
-        name = attachment_payload.name or self._get_random_name()
-        path = self._generate_path(name)
-
-        # Загружаем файл и получаем uri
-        uri = await self.file_storage.upload_file(
-            self.bucket, path, attachment_payload.file
+        attachment = await self.ingest_service(
+            attachment_payload, self.owner, like_payload.news_id
         )
+        await self.response_cache.invalidate(ResponseCacheScopes.news)
+        return attachment
 
-        # Если uri содержит лишний сегмент, исправляем его
-        if "/department-of-educational-programs-bucket/" in uri:
-            uri = uri.replace("/department-of-educational-programs-bucket/", "/")
 
-        id_container = await self.repository.create_attachment(
-            schemas.AttachmentCreateFull(
-                name=name,
-                path=path,
-                uri=uri,
-            )
+class ClipAttachmentCreateCommand:
+    def __init__(
+        self,
+        ingest_service: AttachmentIngestService,
+        owner: AttachmentOwner,
+        response_cache: ResponseCache,
+    ):
+        self.ingest_service = ingest_service
+        self.owner = owner
+        self.response_cache = response_cache
+
+    async def __call__(
+        self, like_payload: Like, attachment_payload: schemas.AttachmentCreate
+    ) -> schemas.Attachment:
+        attachment = await self.ingest_service(
+            attachment_payload, self.owner, like_payload.clip_id
         )
+        await self.response_cache.invalidate(ResponseCacheScopes.clips)
+        return attachment
 
-        attachment = await self.repository.get_attachment_or_none(id_container.id)
-        attachment_id = attachment.id
 
-        update_payload = NewsPartialUpdate(avatar_attachment_id=attachment_id)
+class ProjectAttachmentBatchCreateCommand:
+    def __init__(
+        self,
+        ingest_service: AttachmentIngestService,
+        owner: AttachmentBatchOwner,
+        max_files: int,
+        response_cache: ResponseCache,
+    ):
+        self.ingest_service = ingest_service
+        self.owner = owner
+        self.max_files = max_files
+        self.response_cache = response_cache
 
-        await self.news_partial_update_command(current_news.id, update_payload)
+    async def __call__(
+        self, like_payload: Like, attachment_payloads: list[schemas.AttachmentCreate]
+    ) -> schemas.AttachmentBatchResult:
+        if len(attachment_payloads) > self.max_files:
+            raise GenericApiError(
+                message=f"At most {self.max_files} files per batch", status_code=413
+            )
 
-        assert attachment
-        return attachment
+        items = await self.ingest_service.ingest_many(
+            attachment_payloads, self.owner, like_payload.project_id
+        )
+        await self.response_cache.invalidate(ResponseCacheScopes.projects)
+        return schemas.AttachmentBatchResult(items=items)
 
-    def _generate_path(self, name: str) -> str:
-        now = datetime.now()
-        folder = now.strftime("%Y/%m/%d")
-        timestamp = now.strftime("%s")
-        stripped_slugified_name = self._slugify(name)[: self.max_name_len]
-        return f"/{folder}/{timestamp}.{stripped_slugified_name}"
 
-    @classmethod
-    def _get_random_name(cls) -> str:
-        return str(uuid.uuid4())
+class ProjectAttachmentUnlinkCommand:
+    def __init__(
+        self,
+        delete_command: ProjectAttachmentDeleteCommand,
+        ingest_service: AttachmentIngestService,
+    ):
+        self.delete_command = delete_command
+        self.ingest_service = ingest_service
 
-    @classmethod
-    def _slugify(cls, s: str) -> str:
-        s = s.lower().strip()
-        s = re.sub(r"[^\w\s\.-]", "", s)
-        s = re.sub(r"[\s_-]+", "-", s)
-        s = re.sub(r"^-+|-+$", "", s)
-        return s
+    async def __call__(self, payload: ProjectAttachment) -> None:
+        deleted = await self.delete_command(payload)
+        if deleted:
+            await self.ingest_service.release(payload.attachment_id, deleted)
 
 
-class ClipAttachmentCreateCommand:
+class PresignedUploadCreateCommand:
     def __init__(
         self,
-        repository: AttachmentRepository,
-        file_storage: FileStorage,
-        current_clip_query: ClipRetrieveQuery,
-        clip_partial_update_command: ClipPartialUpdateCommand,
+        ingest_service: AttachmentIngestService,
+        presigned_storage: PresignedStorage,
+        current_principal_query: CurrentPrincipalQuery,
         bucket: str,
-        max_name_len: int = 60,
     ):
-        self.repository = repository
-        self.file_storage = file_storage
-        self.current_clip_query = current_clip_query
-        self.clip_partial_update_command = clip_partial_update_command
+        self.ingest_service = ingest_service
+        self.presigned_storage = presigned_storage
+        self.current_principal_query = current_principal_query
         self.bucket = bucket
-        self.max_name_len = max_name_len
 
     async def __call__(
-        self, like_payload: Like, attachment_payload: schemas.AttachmentCreate
-    ) -> schemas.Attachment:
-        current_clip = await self.current_clip_query(like_payload.clip_id)
-
-        name = attachment_payload.name or self._get_random_name()
-        path = self._generate_path(name)
-
-        # Загружаем файл и получаем uri
-        uri = await self.file_storage.upload_file(
-            self.bucket, path, attachment_payload.file
+        self, payload: schemas.PresignedUploadCreate
+    ) -> schemas.PresignedUpload:
+        principal = await self.current_principal_query()
+        # Unique prefix: unlike streamed uploads the key is handed out up front
+        path = self.ingest_service.generate_path(f"{uuid.uuid4().hex}.{payload.name}")
+        upload_url = await self.presigned_storage.upload_url(
+            self.bucket, path, payload.content_type
         )
-
-        # Если uri содержит лишний сегмент, исправляем его
-        if "/department-of-educational-programs-bucket/" in uri:
-            uri = uri.replace("/department-of-educational-programs-bucket/", "/")
-
-        id_container = await self.repository.create_attachment(
-            schemas.AttachmentCreateFull(
-                name=name,
-                path=path,
-                uri=uri,
-            )
+        return schemas.PresignedUpload(
+            upload_url=upload_url,
+            headers=(
+                {"Content-Type": payload.content_type} if payload.content_type else {}
+            ),
+            ticket=self.presigned_storage.issue_ticket(
+                path, payload.name, principal.sub
+            ),
+            expires_at=self.presigned_storage.expires_at(),
         )
 
-        attachment = await self.repository.get_attachment_or_none(id_container.id)
-        attachment_id = attachment.id
 
-        update_payload = ClipPartialUpdate(clip_attachment_id=attachment_id)
+class PresignedUploadFinalizeCommand:
+    def __init__(
+        self,
+        ingest_service: AttachmentIngestService,
+        presigned_storage: PresignedStorage,
+        owners: dict[str, AttachmentOwner],
+        current_principal_query: CurrentPrincipalQuery,
+        bucket: str,
+        response_cache: ResponseCache,
+    ):
+        self.ingest_service = ingest_service
+        self.presigned_storage = presigned_storage
+        self.owners = owners
+        self.current_principal_query = current_principal_query
+        self.bucket = bucket
+        self.response_cache = response_cache
+
+    async def __call__(
+        self, payload: schemas.PresignedUploadFinalize
+    ) -> schemas.Attachment:
+        principal = await self.current_principal_query()
+        path, name = self.presigned_storage.read_ticket(payload.ticket, principal.sub)
 
-        await self.clip_partial_update_command(current_clip.id, update_payload)
+        owner = self.owners.get(payload.target)
+        if owner is not None and payload.owner_id is None:
+            raise NotFoundError()
 
-        assert attachment
+        await self.presigned_storage.object_size(self.bucket, path)
+        attachment = await self.ingest_service.register(
+            name, path, owner, payload.owner_id
+        )
+        if owner is not None:
+            # Both presigned targets belong to projects
+            await self.response_cache.invalidate(ResponseCacheScopes.projects)
         return attachment
 
-    def _generate_path(self, name: str) -> str:
-        now = datetime.now()
-        folder = now.strftime("%Y/%m/%d")
-        timestamp = now.strftime("%s")
-        stripped_slugified_name = self._slugify(name)[: self.max_name_len]
-        return f"/{folder}/{timestamp}.{stripped_slugified_name}"
 
-    @classmethod
-    def _get_random_name(cls) -> str:
-        return str(uuid.uuid4())
+class AttachmentVariantsCreateCommand:
+    """Renders the WebP thumbnails of an image attachment and stores them on its row.
 
-    @classmethod
-    def _slugify(cls, s: str) -> str:
-        s = s.lower().strip()
-        s = re.sub(r"[^\w\s\.-]", "", s)
-        s = re.sub(r"[\s_-]+", "-", s)
-        s = re.sub(r"^-+|-+$", "", s)
-        return s
+    Safe to run more than once: rows that already have ``variants`` are
+    skipped and variant paths are derived from the original path, so a
+    repeated run overwrites the same objects. Bodies Pillow can't read get
+    an empty variant list so they are not retried. Cached responses of the
+    attachment's owners are dropped once the variants are stored.
+    """
 
-
-class AttachmentDataRetrieveCommand:
     def __init__(
         self,
+        repository: AttachmentRepository,
         file_storage: FileStorage,
+        uploader: StreamingUploader,
+        response_cache: ResponseCache,
         bucket: str,
+        sizes: list[int],
+        quality: int,
     ):
+        self.repository = repository
         self.file_storage = file_storage
+        self.uploader = uploader
+        self.response_cache = response_cache
         self.bucket = bucket
+        self.sizes = sizes
+        self.quality = quality
+
+    async def __call__(self, attachment_id: UUID) -> None:
+        attachment = await self.repository.get_attachment_or_none(attachment_id)
+        if attachment is None or attachment.variants is not None:
+            return
 
-    @asynccontextmanager
-    async def __call__(
-        self, attachment: schemas.Attachment
-    ) -> AsyncIterator[IO[bytes]]:
         async with self.file_storage.receive_file(self.bucket, attachment.path) as file:
-            yield file
+            data = file.read()
+
+        loop = asyncio.get_running_loop()
+        try:
+            rendered = await loop.run_in_executor(
+                None, functools.partial(render_variants, data, self.sizes, self.quality)
+            )
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+            logger.warning("Attachment {} is not a usable image", attachment_id)
+            rendered = []
+
+        variants = []
+        for item in rendered:
+            path = variant_path(attachment.path, item.size)
+            uploaded = await self.uploader.upload_object(
+                self.bucket, path, io.BytesIO(item.body)
+            )
+            assert uploaded.uri
+            variants.append(
+                schemas.AttachmentVariant(
+                    size=item.size,
+                    width=item.width,
+                    height=item.height,
+                    format=VARIANT_FORMAT,
+                    path=path,
+                    uri=uploaded.uri.replace(f"/{self.bucket}/", "/"),
+                )
+            )
+
+        if not await self.repository.set_attachment_variants(attachment_id, variants):
+            logger.info("Variants of attachment {} are already stored", attachment_id)
+            return
+
+        for model, column, scope in VARIANT_OWNER_SCOPES:
+            if await self.repository.is_attachment_used(model, column, attachment_id):
+                await self.response_cache.invalidate(scope)
@@ -1,23 +1,41 @@
+from a8t_tools.bus.producer import TaskProducer
 from a8t_tools.db.transactions import AsyncDbTransaction
 from a8t_tools.storage.facade import FileStorage
 from dependency_injector import containers, providers
 
 from app.domain.clips.containers import ClipContainer
+from app.domain.common import models
+from app.domain.common.response_cache import ResponseCache
 from app.domain.news.containers import NewsContainer
 from app.domain.projects.containers import ProjectContainer
-from app.domain.projects.repositories import ProjectAttachmentRepository
 from app.domain.storage.attachments.commands import (
     AttachmentCreateCommand,
+    AttachmentVariantsCreateCommand,
     ClipAttachmentCreateCommand,
     NewsAttachmentCreateCommand,
+    PresignedUploadCreateCommand,
+    PresignedUploadFinalizeCommand,
+    ProjectAttachmentBatchCreateCommand,
     ProjectAttachmentCreateCommand,
+    ProjectAttachmentUnlinkCommand,
     ProjectAvatarCreateCommand,
 )
+from app.domain.storage.attachments.downloads import ObjectReader
+from app.domain.storage.attachments.presigned import PresignedStorage
 from app.domain.storage.attachments.queries import (
+    AttachmentDataQuery,
     AttachmentListQuery,
     AttachmentRetrieveQuery,
+    PresignedDownloadQuery,
 )
 from app.domain.storage.attachments.repositories import AttachmentRepository
+from app.domain.storage.attachments.services import (
+    AttachmentIngestService,
+    ColumnAttachmentOwner,
+    ProjectAttachmentOwner,
+    UserAvatarOwner,
+)
+from app.domain.storage.attachments.uploads import StreamingUploader
 from app.domain.users.containers import UserContainer
 from app.domain.users.profile.commands import UserAvatarCreateCommand
 from app.domain.users.staff.command import StaffAvatarCreateCommand
@@ -26,20 +44,38 @@ from app.domain.users.staff.command import StaffAvatarCreateCommand
 class AttachmentContainer(containers.DeclarativeContainer):
     transaction = providers.Dependency(instance_of=AsyncDbTransaction)
 
+    response_cache = providers.Dependency(instance_of=ResponseCache)
+
     file_storage = providers.Dependency(instance_of=FileStorage)
 
+    uploader = providers.Dependency(instance_of=StreamingUploader)
+
+    reader = providers.Dependency(instance_of=ObjectReader)
+
+    presigned_storage = providers.Dependency(instance_of=PresignedStorage)
+
+    task_producer = providers.Dependency(instance_of=TaskProducer)
+
     bucket = providers.Dependency(instance_of=str)
 
-    repository = providers.Factory(AttachmentRepository, transaction=transaction)
+    variant_sizes = providers.Dependency(instance_of=list)
 
-    project_attachment_repository = providers.Factory(
-        ProjectAttachmentRepository, transaction=transaction
-    )
+    variant_quality = providers.Dependency(instance_of=int)
+
+    batch_concurrency = providers.Dependency(instance_of=int)
+
+    batch_max_files = providers.Dependency(instance_of=int)
+
+    repository = providers.Factory(AttachmentRepository, transaction=transaction)
 
     list_query = providers.Factory(AttachmentListQuery, repository=repository)
 
     retrieve_query = providers.Factory(AttachmentRetrieveQuery, repository=repository)
 
+    data_query = providers.Factory(
+        AttachmentDataQuery, repository=repository, reader=reader, bucket=bucket
+    )
+
     user_container = providers.Container(UserContainer)
 
     project_container = providers.Container(ProjectContainer)
@@ -48,66 +84,149 @@ class AttachmentContainer(containers.DeclarativeContainer):
 
     clip_container = providers.Container(ClipContainer)
 
-    create_command = providers.Factory(
-        AttachmentCreateCommand,
+    ingest_service = providers.Factory(
+        AttachmentIngestService,
         repository=repository,
-        file_storage=file_storage,
+        uploader=uploader,
+        task_producer=task_producer,
         bucket=bucket,
-        current_user_query=user_container.profile_me_query,
-        user_partial_update_command=user_container.partial_update_command,
+        batch_concurrency=batch_concurrency,
+    )
+
+    user_avatar_owner = providers.Factory(
+        UserAvatarOwner,
+        repository=repository,
+        user_repository=user_container.user_repository,
+        identity_cache=user_container.identity_cache,
+    )
+
+    staff_avatar_owner = providers.Factory(
+        ColumnAttachmentOwner,
+        repository=repository,
+        model=providers.Object(models.Staff),
+        column="avatar_attachment_id",
+    )
+
+    project_avatar_owner = providers.Factory(
+        ColumnAttachmentOwner,
+        repository=repository,
+        model=providers.Object(models.Project),
+        column="avatar_attachment_id",
+    )
+
+    project_attachment_owner = providers.Factory(
+        ProjectAttachmentOwner, repository=repository
+    )
+
+    news_avatar_owner = providers.Factory(
+        ColumnAttachmentOwner,
+        repository=repository,
+        model=providers.Object(models.News),
+        column="avatar_attachment_id",
+    )
+
+    clip_attachment_owner = providers.Factory(
+        ColumnAttachmentOwner,
+        repository=repository,
+        model=providers.Object(models.Clip),
+        column="clip_attachment_id",
+    )
+
+    create_command = providers.Factory(
+        AttachmentCreateCommand,
+        ingest_service=ingest_service,
     )
 
     profile_avatar_create_command = providers.Factory(
         UserAvatarCreateCommand,
-        repository=repository,
-        file_storage=file_storage,
-        bucket=bucket,
-        current_user_query=user_container.profile_me_query,
-        user_partial_update_command=user_container.partial_update_command,
+        ingest_service=ingest_service,
+        owner=user_avatar_owner,
+        current_principal_query=user_container.current_principal_query,
     )
 
     project_create_command = providers.Factory(
         ProjectAvatarCreateCommand,
-        repository=repository,
-        file_storage=file_storage,
-        bucket=bucket,
-        current_project_query=project_container.current_project_query,
-        project_partial_update_command=project_container.project_partial_update_command,
+        ingest_service=ingest_service,
+        owner=project_avatar_owner,
+        response_cache=response_cache,
     )
 
     staff_create_command = providers.Factory(
         StaffAvatarCreateCommand,
-        repository=repository,
-        file_storage=file_storage,
-        bucket=bucket,
-        staff_retrieve_by_id_query=user_container.staff_retrieve_by_id_query,
-        staff_partial_update_command=user_container.staff_partial_update_command,
+        ingest_service=ingest_service,
+        owner=staff_avatar_owner,
     )
 
     project_create_attachment_command = providers.Factory(
         ProjectAttachmentCreateCommand,
-        repository=repository,
-        file_storage=file_storage,
-        bucket=bucket,
-        current_project_query=project_container.current_project_query,
-        project_partial_update_command=project_container.project_partial_update_command,
-        project_attachment_repository=project_attachment_repository,
+        ingest_service=ingest_service,
+        owner=project_attachment_owner,
+        response_cache=response_cache,
+    )
+
+    project_batch_create_attachment_command = providers.Factory(
+        ProjectAttachmentBatchCreateCommand,
+        ingest_service=ingest_service,
+        owner=project_attachment_owner,
+        max_files=batch_max_files,
+        response_cache=response_cache,
+    )
+
+    project_attachment_unlink_command = providers.Factory(
+        ProjectAttachmentUnlinkCommand,
+        delete_command=project_container.delete_project_attachment_command,
+        ingest_service=ingest_service,
     )
 
     news_create_command = providers.Factory(
         NewsAttachmentCreateCommand,
-        repository=repository,
-        file_storage=file_storage,
-        bucket=bucket,
-        current_news_query=news_container.current_news_query,
-        news_partial_update_command=news_container.news_partial_update_command,
+        ingest_service=ingest_service,
+        owner=news_avatar_owner,
+        response_cache=response_cache,
     )
 
     clip_create_command = providers.Factory(
         ClipAttachmentCreateCommand,
+        ingest_service=ingest_service,
+        owner=clip_attachment_owner,
+        response_cache=response_cache,
+    )
+
+    variants_create_command = providers.Factory(
+        AttachmentVariantsCreateCommand,
         repository=repository,
         file_storage=file_storage,
+        uploader=uploader,
+        response_cache=response_cache,
+        bucket=bucket,
+        sizes=variant_sizes,
+        quality=variant_quality,
+    )
+
+    presigned_upload_create_command = providers.Factory(
+        PresignedUploadCreateCommand,
+        ingest_service=ingest_service,
+        presigned_storage=presigned_storage,
+        current_principal_query=user_container.current_principal_query,
+        bucket=bucket,
+    )
+
+    presigned_upload_finalize_command = providers.Factory(
+        PresignedUploadFinalizeCommand,
+        ingest_service=ingest_service,
+        presigned_storage=presigned_storage,
+        owners=providers.Dict(
+            project_avatar=project_avatar_owner,
+            project_attachment=project_attachment_owner,
+        ),
+        current_principal_query=user_container.current_principal_query,
+        bucket=bucket,
+        response_cache=response_cache,
+    )
+
+    presigned_download_query = providers.Factory(
+        PresignedDownloadQuery,
+        repository=repository,
+        presigned_storage=presigned_storage,
         bucket=bucket,
-        current_clip_query=clip_container.current_clip_query,
-        clip_partial_update_command=clip_container.clip_partial_update_command,
     )
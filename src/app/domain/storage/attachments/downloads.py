@@ -0,0 +1,259 @@
+import asyncio
+import os
+import re
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+import anyio
+from botocore.exceptions import ClientError
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.domain.common.exceptions import NotFoundError
+from app.domain.storage.attachments.uploads import AsyncS3Client
+
+CHUNK_SIZE = 256 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class RangeNotSatisfiableError(Exception):
+    def __init__(self, size: int) -> None:
+        super().__init__(f"Range not satisfiable for {size} bytes")
+        self.size = size
+
+
+@dataclass
+class ObjectBody:
+    """Bytes ``start..end`` (inclusive) of an object ``size`` bytes long."""
+
+    size: int
+    start: int
+    end: int
+    partial: bool
+    chunks: AsyncIterator[bytes] | None = None
+    file_path: str | None = None
+    close: Callable[[], None] | None = None
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1 if self.size else 0
+
+    @property
+    def content_range(self) -> str:
+        return f"bytes {self.start}-{self.end}/{self.size}"
+
+
+def single_range(header: str | None) -> str | None:
+    """``header`` if it asks for exactly one byte range, otherwise ``None``.
+
+    Multi-range and malformed headers are ignored, which RFC 9110 allows:
+    the whole object is sent instead.
+    """
+    if header is None:
+        return None
+    header = header.strip()
+    match = _RANGE_RE.match(header)
+    if match is None or match.groups() == ("", ""):
+        return None
+    return header
+
+
+def resolve_range(header: str, size: int) -> tuple[int, int]:
+    match = _RANGE_RE.match(header)
+    assert match
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end or (not first and not int(last)):
+        raise RangeNotSatisfiableError(size)
+    return start, end
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_http_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def etag_matches(header: str, etag: str, weak: bool = True) -> bool:
+    """Whether an ``If-None-Match``/``If-Range`` style ``header`` matches ``etag``."""
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ObjectReader:
+    """Opens stored objects for reading, optionally a single byte range of them.
+
+    Local files are not read here: the response sends them itself, zero-copy
+    when the server supports it. S3 objects are fetched with a ranged GET so
+    a partial read only transfers the requested bytes.
+    """
+
+    def __init__(
+        self,
+        use_s3: bool,
+        s3: AsyncS3Client,
+        local_base_path: str | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        self.use_s3 = use_s3
+        self.s3 = s3
+        self.local_base_path = local_base_path
+        self.chunk_size = chunk_size
+
+    async def open(
+        self, bucket: str, path: str, range_header: str | None
+    ) -> ObjectBody:
+        range_header = single_range(range_header)
+        if self.use_s3:
+            return await self._open_s3(bucket, path, range_header)
+        return await self._open_local(bucket, path, range_header)
+
+    async def _open_local(
+        self, bucket: str, path: str, range_header: str | None
+    ) -> ObjectBody:
+        assert self.local_base_path
+        file_path = os.path.join(self.local_base_path, bucket, path.lstrip("/"))
+        try:
+            size = (await anyio.Path(file_path).stat()).st_size
+        except FileNotFoundError:
+            raise NotFoundError()
+
+        if range_header is None:
+            return ObjectBody(size, 0, max(size - 1, 0), False, file_path=file_path)
+        start, end = resolve_range(range_header, size)
+        return ObjectBody(size, start, end, True, file_path=file_path)
+
+    async def _open_s3(
+        self, bucket: str, path: str, range_header: str | None
+    ) -> ObjectBody:
+        params: dict[str, Any] = dict(Bucket=bucket, Key=path)
+        if range_header is not None:
+            params["Range"] = range_header
+        try:
+            response = await self.s3.call("get_object", **params)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("NoSuchKey", "404"):
+                raise NotFoundError()
+            if code == "InvalidRange":
+                head = await self.s3.call("head_object", Bucket=bucket, Key=path)
+                raise RangeNotSatisfiableError(head["ContentLength"])
+            raise
+
+        body = response["Body"]
+        chunks = self._read_s3_body(body)
+        match = _CONTENT_RANGE_RE.match(response.get("ContentRange") or "")
+        if match is None:
+            size = response["ContentLength"]
+            return ObjectBody(
+                size, 0, max(size - 1, 0), False, chunks=chunks, close=body.close
+            )
+        start, end, size = map(int, match.groups())
+        return ObjectBody(size, start, end, True, chunks=chunks, close=body.close)
+
+    async def _read_s3_body(self, body: Any) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        while chunk := await loop.run_in_executor(None, body.read, self.chunk_size):
+            yield chunk
+
+
+class ObjectResponse(Response):
+    """Sends an ``ObjectBody``: local files via ``http.response.zerocopy``
+    when the server offers it, everything else chunk by chunk."""
+
+    def __init__(
+        self,
+        body: ObjectBody,
+        headers: dict[str, str] | None = None,
+        media_type: str | None = None,
+    ) -> None:
+        self.object_body = body
+        self.status_code = 206 if body.partial else 200
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(body.length)
+        if body.partial:
+            self.headers["content-range"] = body.content_range
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        try:
+            if scope["method"] == "HEAD" or not self.object_body.length:
+                await send({"type": "http.response.body", "body": b""})
+            elif self.object_body.file_path is not None:
+                await self._send_file(scope, send)
+            else:
+                await self._send_chunks(send)
+        finally:
+            if self.object_body.close is not None:
+                self.object_body.close()
+
+    async def _send_chunks(self, send: Send) -> None:
+        assert self.object_body.chunks is not None
+        async for chunk in self.object_body.chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _send_file(self, scope: Scope, send: Send) -> None:
+        body = self.object_body
+        assert body.file_path is not None
+        async with await anyio.open_file(body.file_path, mode="rb") as file:
+            if "http.response.zerocopy" in scope.get("extensions", {}):
+                await send(
+                    {
+                        "type": "http.response.zerocopy",
+                        "file": file.wrapped,
+                        "offset": body.start,
+                        "count": body.length,
+                    }
+                )
+                return
+
+            await file.seek(body.start)
+            remaining = body.length
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b""})
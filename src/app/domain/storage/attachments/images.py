@@ -0,0 +1,54 @@
+import io
+import mimetypes
+from dataclasses import dataclass
+
+from PIL import Image, ImageOps
+
+VARIANT_FORMAT = "webp"
+
+
+@dataclass
+class RenderedVariant:
+    size: int
+    width: int
+    height: int
+    body: bytes
+
+
+def is_image_name(name: str) -> bool:
+    content_type, _ = mimetypes.guess_type(name)
+    return content_type is not None and content_type.startswith("image/")
+
+
+def variant_path(path: str, size: int) -> str:
+    return f"{path}.{size}.{VARIANT_FORMAT}"
+
+
+def render_variants(
+    data: bytes, sizes: list[int], quality: int
+) -> list[RenderedVariant]:
+    """Downscale ``data`` to fit each ``size`` x ``size`` box and encode as WebP.
+
+    Images are never upscaled: sizes the original already fits into are
+    skipped, except the smallest one, so every image gets a WebP copy.
+    Raises ``PIL.UnidentifiedImageError`` for bodies that are not images.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        variants: list[RenderedVariant] = []
+        for size in sorted(set(sizes)):
+            if variants and max(image.size) <= size:
+                break
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, VARIANT_FORMAT.upper(), quality=quality, method=4)
+            variants.append(
+                RenderedVariant(
+                    size, thumbnail.width, thumbnail.height, buffer.getvalue()
+                )
+            )
+        return variants
@@ -0,0 +1,108 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from urllib.parse import quote
+from uuid import UUID
+
+import jwt
+from botocore.exceptions import ClientError
+
+from app.domain.common import enums
+from app.domain.common.exceptions import AuthError, NotFoundError, UnsupportedError
+from app.domain.storage.attachments.uploads import AsyncS3Client
+
+TICKET_ALGORITHM = "HS256"
+
+
+def content_disposition(filename: str, disposition: str = "inline") -> str:
+    """RFC 6266 header value: an ASCII ``filename`` plus the UTF-8 ``filename*``."""
+    fallback = re.sub(r'[^\x20-\x7e]|["\\]', "_", filename)
+    return (
+        f'{disposition}; filename="{fallback}"; '
+        f"filename*=UTF-8''{quote(filename, safe='')}"
+    )
+
+
+class PresignedStorage:
+    """Issues presigned S3 URLs so attachment bytes bypass the app workers.
+
+    ``signer`` points at the public storage endpoint (signatures cover the
+    host the client talks to), ``s3`` at the one the app itself uses. An
+    upload comes with a signed ticket naming the object and the caller;
+    finalizing it later needs that ticket back, so clients can't register
+    arbitrary keys.
+    """
+
+    def __init__(
+        self,
+        use_s3: bool,
+        s3: AsyncS3Client,
+        signer: AsyncS3Client,
+        secret_key: str,
+        expires_in: int = 900,
+    ) -> None:
+        self.use_s3 = use_s3
+        self.s3 = s3
+        self.signer = signer
+        self.secret_key = secret_key
+        self.expires_in = expires_in
+
+    def expires_at(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=self.expires_in)
+
+    async def upload_url(
+        self, bucket: str, path: str, content_type: str | None = None
+    ) -> str:
+        params: dict[str, Any] = dict(Bucket=bucket, Key=path)
+        if content_type is not None:
+            params["ContentType"] = content_type
+        return await self._sign("put_object", params)
+
+    async def download_url(self, bucket: str, path: str, filename: str) -> str:
+        params = dict(
+            Bucket=bucket,
+            Key=path,
+            ResponseContentDisposition=content_disposition(filename),
+        )
+        return await self._sign("get_object", params)
+
+    async def object_size(self, bucket: str, path: str) -> int:
+        try:
+            head = await self.s3.call("head_object", Bucket=bucket, Key=path)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                raise NotFoundError(message="Uploaded object not found")
+            raise
+        return head["ContentLength"]
+
+    def issue_ticket(self, path: str, name: str, principal_id: UUID) -> str:
+        payload = dict(
+            path=path,
+            name=name,
+            sub=str(principal_id),
+            # An upload started just before the URL expired may still be running
+            exp=datetime.now(timezone.utc) + timedelta(seconds=2 * self.expires_in),
+        )
+        return jwt.encode(payload, self.secret_key, algorithm=TICKET_ALGORITHM)
+
+    def read_ticket(self, ticket: str, principal_id: UUID) -> tuple[str, str]:
+        try:
+            payload = jwt.decode(ticket, self.secret_key, algorithms=[TICKET_ALGORITHM])
+        except jwt.ExpiredSignatureError:
+            raise AuthError(code=enums.AuthErrorCodes.expired_signature)
+        except jwt.PyJWTError:
+            raise AuthError(code=enums.AuthErrorCodes.invalid_signature)
+
+        if payload.get("sub") != str(principal_id):
+            raise AuthError(code=enums.AuthErrorCodes.invalid_signature)
+        return payload["path"], payload["name"]
+
+    async def _sign(self, method: str, params: dict[str, Any]) -> str:
+        if not self.use_s3:
+            raise UnsupportedError(message="Presigned URLs need S3 storage")
+        return await self.signer.call(
+            "generate_presigned_url",
+            ClientMethod=method,
+            Params=params,
+            ExpiresIn=self.expires_in,
+        )
@@ -4,6 +4,12 @@ from a8t_tools.db.pagination import Paginated
 
 from app.domain.common.exceptions import NotFoundError
 from app.domain.storage.attachments import schemas
+from app.domain.storage.attachments.downloads import (
+    ObjectReader,
+    etag_matches,
+    parse_http_date,
+)
+from app.domain.storage.attachments.presigned import PresignedStorage
 from app.domain.storage.attachments.repositories import AttachmentRepository
 
 
@@ -28,3 +34,81 @@ class AttachmentRetrieveQuery:
         if not result:
             raise NotFoundError()
         return result
+
+
+class AttachmentDataQuery:
+    """Resolves a conditional and/or ranged read of the attachment bytes.
+
+    Attachments never change after upload, so the ETag (content hash, or
+    the id for rows stored before hashing) and ``created_at`` answer
+    ``If-None-Match``/``If-Modified-Since`` without touching storage.
+    ``body`` stays ``None`` when the client copy is still fresh.
+    """
+
+    def __init__(
+        self, repository: AttachmentRepository, reader: ObjectReader, bucket: str
+    ):
+        self.repository = repository
+        self.reader = reader
+        self.bucket = bucket
+
+    async def __call__(
+        self, payload: schemas.AttachmentDataRequest
+    ) -> schemas.AttachmentData:
+        attachment = await self.repository.get_attachment_or_none(payload.attachment_id)
+        if not attachment:
+            raise NotFoundError()
+
+        data = schemas.AttachmentData(
+            attachment=attachment,
+            etag=f'"{attachment.content_hash or attachment.id.hex}"',
+            last_modified=attachment.created_at.replace(microsecond=0),
+        )
+        if self._not_modified(payload, data):
+            return data
+
+        range_header = payload.range
+        if payload.if_range and not self._if_range_matches(payload.if_range, data):
+            range_header = None
+
+        data.body = await self.reader.open(self.bucket, attachment.path, range_header)
+        return data
+
+    @staticmethod
+    def _not_modified(
+        payload: schemas.AttachmentDataRequest, data: schemas.AttachmentData
+    ) -> bool:
+        if payload.if_none_match is not None:
+            return etag_matches(payload.if_none_match, data.etag)
+        since = parse_http_date(payload.if_modified_since)
+        return since is not None and data.last_modified <= since
+
+    @staticmethod
+    def _if_range_matches(value: str, data: schemas.AttachmentData) -> bool:
+        if value.strip().startswith(('"', "W/")):
+            return etag_matches(value, data.etag, weak=False)
+        return parse_http_date(value) == data.last_modified
+
+
+class PresignedDownloadQuery:
+    def __init__(
+        self,
+        repository: AttachmentRepository,
+        presigned_storage: PresignedStorage,
+        bucket: str,
+    ):
+        self.repository = repository
+        self.presigned_storage = presigned_storage
+        self.bucket = bucket
+
+    async def __call__(self, attachment_id: UUID) -> schemas.PresignedDownload:
+        attachment = await self.repository.get_attachment_or_none(attachment_id)
+        if not attachment:
+            raise NotFoundError()
+
+        url = await self.presigned_storage.download_url(
+            self.bucket, attachment.path, attachment.name
+        )
+        return schemas.PresignedDownload(
+            url=url, expires_at=self.presigned_storage.expires_at()
+        )
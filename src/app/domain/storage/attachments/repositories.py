@@ -1,12 +1,13 @@
+from typing import Any
 from uuid import UUID
 
 from a8t_tools.db.pagination import NoPaginationResults, Paginated, PaginationCallable
 from a8t_tools.db.sorting import SortingData, apply_sorting
 from a8t_tools.db.transactions import AsyncDbTransaction
-from sqlalchemy import insert, select
+from sqlalchemy import delete, exists, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
 
 from app.domain.common import models
-from app.domain.common.schemas import IdContainer
 from app.domain.storage.attachments import schemas
 
 
@@ -41,15 +42,179 @@ class AttachmentRepository:
                 return None
             return schemas.Attachment.model_validate(result)
 
+    async def get_attachment_by_path_or_none(
+        self, path: str
+    ) -> schemas.Attachment | None:
+        query = select(models.Attachment).where(models.Attachment.path == path)
+
+        async with self.transaction.use() as db:
+            result = (await db.execute(query)).scalars().first()
+            if not result:
+                return None
+            return schemas.Attachment.model_validate(result)
+
     async def create_attachment(
         self, payload: schemas.AttachmentCreateFull
-    ) -> IdContainer:
+    ) -> schemas.Attachment:
+        """Insert the attachment; with a known hash an existing row is reused.
+
+        A row whose ``content_hash`` is taken gets its ``ref_count`` bumped
+        and is returned instead, so callers can tell by its ``path``.
+        """
+        query = insert(models.Attachment).values(**payload.model_dump())
+        if payload.content_hash is not None:
+            query = query.on_conflict_do_update(
+                index_elements=[models.Attachment.content_hash],
+                set_={"ref_count": models.Attachment.ref_count + 1},
+            )
+
+        async with self.transaction.use() as db:
+            result = (await db.execute(query.returning(models.Attachment))).scalar_one()
+            return schemas.Attachment.model_validate(result)
+
+    async def create_attachments(
+        self, payloads: list[schemas.AttachmentCreateFull]
+    ) -> list[schemas.Attachment]:
+        """Multi-row ``create_attachment``; hashes must be unique within ``payloads``.
+
+        A taken hash gets the row's ``ref_count`` added to the existing one.
+        """
+        query = insert(models.Attachment).values([x.model_dump() for x in payloads])
+        query = query.on_conflict_do_update(
+            index_elements=[models.Attachment.content_hash],
+            set_={"ref_count": models.Attachment.ref_count + query.excluded.ref_count},
+        )
+
+        async with self.transaction.use() as db:
+            results = (await db.execute(query.returning(models.Attachment))).scalars()
+            return [schemas.Attachment.model_validate(x) for x in results]
+
+    async def attachment_hash_exists(self, content_hash: str) -> bool:
+        query = select(exists().where(models.Attachment.content_hash == content_hash))
+
+        async with self.transaction.use() as db:
+            return bool((await db.execute(query)).scalar())
+
+    async def reference_attachment(
+        self, content_hash: str
+    ) -> schemas.Attachment | None:
         query = (
-            insert(models.Attachment)
-            .values(**payload.model_dump())
+            update(models.Attachment)
+            .where(models.Attachment.content_hash == content_hash)
+            .values(ref_count=models.Attachment.ref_count + 1)
+            .returning(models.Attachment)
+        )
+
+        async with self.transaction.use() as db:
+            result = (await db.execute(query)).scalar_one_or_none()
+            if not result:
+                return None
+            return schemas.Attachment.model_validate(result)
+
+    async def release_attachment(
+        self, attachment_id: UUID, count: int = 1
+    ) -> schemas.Attachment | None:
+        """Drop ``count`` references; returns the row once it is gone."""
+        release = (
+            update(models.Attachment)
+            .where(models.Attachment.id == attachment_id)
+            .values(ref_count=models.Attachment.ref_count - count)
+            .returning(models.Attachment.ref_count)
+        )
+        remove = (
+            delete(models.Attachment)
+            .where(
+                models.Attachment.id == attachment_id,
+                models.Attachment.ref_count <= 0,
+            )
+            .returning(models.Attachment)
+        )
+
+        async with self.transaction.use() as db:
+            ref_count = (await db.execute(release)).scalar_one_or_none()
+            if ref_count is None or ref_count > 0:
+                return None
+            result = (await db.execute(remove)).scalar_one_or_none()
+            if not result:
+                return None
+            return schemas.Attachment.model_validate(result)
+
+    async def set_attachment_variants(
+        self, attachment_id: UUID, variants: list[schemas.AttachmentVariant]
+    ) -> bool:
+        """Store the variants unless an earlier run already has."""
+        query = (
+            update(models.Attachment)
+            .where(
+                models.Attachment.id == attachment_id,
+                models.Attachment.variants.is_(None),
+            )
+            .values(variants=[variant.model_dump() for variant in variants])
             .returning(models.Attachment.id)
         )
 
         async with self.transaction.use() as db:
-            id_ = (await db.execute(query)).scalar_one()
-            return IdContainer(id=id_)
+            return (await db.execute(query)).scalar_one_or_none() is not None
+
+    async def get_owner_attachment_id(
+        self, model: Any, column: str, owner_id: Any
+    ) -> UUID | None:
+        """Read the owner's attachment column and lock the row until commit."""
+        query = (
+            select(getattr(model, column)).where(model.id == owner_id).with_for_update()
+        )
+
+        async with self.transaction.use() as db:
+            return (await db.execute(query)).scalar_one_or_none()
+
+    async def set_owner_attachment(
+        self, model: Any, column: str, owner_id: Any, attachment_id: UUID
+    ) -> bool:
+        query = (
+            update(model)
+            .where(model.id == owner_id)
+            .values({column: attachment_id})
+            .returning(model.id)
+        )
+
+        async with self.transaction.use() as db:
+            return (await db.execute(query)).scalar_one_or_none() is not None
+
+    async def owner_exists(self, model: Any, owner_id: Any) -> bool:
+        query = select(exists().where(model.id == owner_id))
+
+        async with self.transaction.use() as db:
+            return bool((await db.execute(query)).scalar())
+
+    async def is_attachment_used(
+        self, model: Any, column: str, attachment_id: UUID
+    ) -> bool:
+        query = select(exists().where(getattr(model, column) == attachment_id))
+
+        async with self.transaction.use() as db:
+            return bool((await db.execute(query)).scalar())
+
+    async def link_project_attachments(
+        self, project_id: UUID, attachment_ids: list[UUID]
+    ) -> None:
+        query = insert(models.ProjectAttachment).values(
+            [dict(project_id=project_id, attachment_id=x) for x in attachment_ids]
+        )
+
+        async with self.transaction.use() as db:
+            await db.execute(query)
+
+    async def link_project_attachment(
+        self, project_id: UUID, attachment_id: UUID
+    ) -> bool:
+        source = select(
+            models.Project.id, literal(attachment_id, models.Attachment.id.type)
+        ).where(models.Project.id == project_id)
+        query = (
+            insert(models.ProjectAttachment)
+            .from_select(["project_id", "attachment_id"], source)
+            .returning(models.ProjectAttachment.id)
+        )
+
+        async with self.transaction.use() as db:
+            return (await db.execute(query)).scalar_one_or_none() is not None
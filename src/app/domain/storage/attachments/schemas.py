@@ -1,4 +1,5 @@
 import enum
+from collections.abc import AsyncIterable
 from dataclasses import dataclass
 from datetime import datetime
 from typing import IO
@@ -6,8 +7,22 @@ from uuid import UUID
 
 from a8t_tools.db import pagination as pg
 from a8t_tools.db import sorting as sr
+from pydantic import computed_field
 
 from app.domain.common.schemas import APIModel
+from app.domain.storage.attachments.downloads import ObjectBody
+
+# Box (px) list cards render avatars and covers into
+PREVIEW_SIZE = 320
+
+
+class AttachmentVariant(APIModel):
+    size: int
+    width: int
+    height: int
+    format: str
+    path: str
+    uri: str
 
 
 class Attachment(APIModel):
@@ -15,8 +30,19 @@ class Attachment(APIModel):
     name: str
     path: str
     uri: str | None = None
+    content_hash: str | None = None
+    variants: list[AttachmentVariant] | None = None
     created_at: datetime
 
+    @computed_field  # type: ignore [misc]
+    @property
+    def preview(self) -> AttachmentVariant | None:
+        """Smallest variant that covers ``PREVIEW_SIZE``, else the largest one."""
+        if not self.variants:
+            return None
+        ordered = sorted(self.variants, key=lambda variant: variant.size)
+        return next((x for x in ordered if x.size >= PREVIEW_SIZE), ordered[-1])
+
 
 class UserPartialUpdateAttachment(APIModel):
     id: UUID
@@ -25,13 +51,55 @@ class UserPartialUpdateAttachment(APIModel):
 @dataclass
 class AttachmentCreate:
     name: str | None
-    file: IO[bytes]
+    file: IO[bytes] | AsyncIterable[bytes]
 
 
 class AttachmentCreateFull(APIModel):
     name: str
     path: str
     uri: str
+    content_hash: str | None = None
+    ref_count: int = 1
+
+
+class AttachmentBatchItem(APIModel):
+    name: str
+    attachment: Attachment | None = None
+    error: str | None = None
+
+
+class AttachmentBatchResult(APIModel):
+    items: list[AttachmentBatchItem]
+
+
+class PresignedUploadTargets(enum.StrEnum):
+    attachment = enum.auto()
+    project_avatar = enum.auto()
+    project_attachment = enum.auto()
+
+
+class PresignedUploadCreate(APIModel):
+    name: str
+    content_type: str | None = None
+
+
+class PresignedUpload(APIModel):
+    upload_url: str
+    method: str = "PUT"
+    headers: dict[str, str] = {}
+    ticket: str
+    expires_at: datetime
+
+
+class PresignedUploadFinalize(APIModel):
+    ticket: str
+    target: PresignedUploadTargets = PresignedUploadTargets.attachment
+    owner_id: UUID | None = None
+
+
+class PresignedDownload(APIModel):
+    url: str
+    expires_at: datetime
 
 
 class AttachmentSorts(enum.StrEnum):
@@ -45,3 +113,20 @@ class AttachmentSorts(enum.StrEnum):
 class AttachmentListRequestSchema:
     pagination: pg.PaginationCallable[Attachment] | None = None
     sorting: sr.SortingData[AttachmentSorts] | None = None
+
+
+@dataclass
+class AttachmentDataRequest:
+    attachment_id: UUID
+    range: str | None = None
+    if_range: str | None = None
+    if_none_match: str | None = None
+    if_modified_since: str | None = None
+
+
+@dataclass
+class AttachmentData:
+    attachment: Attachment
+    etag: str
+    last_modified: datetime
+    body: ObjectBody | None = None
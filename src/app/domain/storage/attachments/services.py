@@ -0,0 +1,402 @@
+import asyncio
+import io
+import re
+import uuid
+from datetime import datetime
+from typing import Any, Protocol
+from uuid import UUID
+
+from a8t_tools.bus.producer import TaskProducer
+from loguru import logger
+
+from app.domain.common import enums, models
+from app.domain.common.exceptions import NotFoundError
+from app.domain.common.schemas import IdContainer
+from app.domain.storage.attachments import schemas
+from app.domain.storage.attachments.images import is_image_name
+from app.domain.storage.attachments.repositories import AttachmentRepository
+from app.domain.storage.attachments.uploads import StreamingUploader, UploadedObject
+from app.domain.users.auth.identity import RequestIdentityCache
+from app.domain.users.core.repositories import UserRepository
+from app.domain.users.core.schemas import UserPartialUpdate
+
+
+class AttachmentOwner(Protocol):
+    async def __call__(
+        self, owner_id: Any, attachment: schemas.Attachment
+    ) -> UUID | None:
+        """Link the attachment; returns the id of the attachment it replaced."""
+        ...
+
+
+class AttachmentBatchOwner(Protocol):
+    async def exists(self, owner_id: Any) -> bool:
+        """Whether the owner row is there to link attachments to."""
+        ...
+
+    async def link_many(
+        self, owner_id: Any, attachments: list[schemas.Attachment]
+    ) -> None:
+        """Link all attachments to the owner in one statement."""
+        ...
+
+
+class ColumnAttachmentOwner:
+    """Points a column of the owner row (e.g. ``avatar_attachment_id``) at the attachment."""
+
+    def __init__(
+        self, repository: AttachmentRepository, model: Any, column: str
+    ) -> None:
+        self.repository = repository
+        self.model = model
+        self.column = column
+
+    async def __call__(
+        self, owner_id: Any, attachment: schemas.Attachment
+    ) -> UUID | None:
+        previous_id = await self.repository.get_owner_attachment_id(
+            self.model, self.column, owner_id
+        )
+        if not await self.repository.set_owner_attachment(
+            self.model, self.column, owner_id, attachment.id
+        ):
+            raise NotFoundError()
+        return previous_id
+
+
+class ProjectAttachmentOwner:
+    def __init__(self, repository: AttachmentRepository) -> None:
+        self.repository = repository
+
+    async def __call__(self, owner_id: Any, attachment: schemas.Attachment) -> None:
+        if not await self.repository.link_project_attachment(owner_id, attachment.id):
+            raise NotFoundError()
+
+    async def exists(self, owner_id: Any) -> bool:
+        return await self.repository.owner_exists(models.Project, owner_id)
+
+    async def link_many(
+        self, owner_id: Any, attachments: list[schemas.Attachment]
+    ) -> None:
+        await self.repository.link_project_attachments(
+            owner_id, [attachment.id for attachment in attachments]
+        )
+
+
+class UserAvatarOwner:
+    def __init__(
+        self,
+        repository: AttachmentRepository,
+        user_repository: UserRepository,
+        identity_cache: RequestIdentityCache,
+    ) -> None:
+        self.repository = repository
+        self.user_repository = user_repository
+        self.identity_cache = identity_cache
+
+    async def __call__(
+        self, owner_id: Any, attachment: schemas.Attachment
+    ) -> UUID | None:
+        previous_id = await self.repository.get_owner_attachment_id(
+            models.User, "avatar_attachment_id", owner_id
+        )
+        await self.user_repository.partial_update_user(
+            owner_id, UserPartialUpdate(avatar_attachment_id=attachment.id)
+        )
+        self.identity_cache.invalidate()
+        return previous_id
+
+
+class AttachmentIngestService:
+    """Uploads a file, stores its attachment row and hands it to the owner.
+
+    Attachments are deduplicated by the SHA-256 of their bytes: a body whose
+    hash is already stored reuses that object and row (bumping ``ref_count``)
+    instead of keeping a second copy; the caller still gets its own file name
+    back. Small bodies are not even sent to
+    storage; large ones are hashed while streaming and the fresh copy is
+    removed once the existing row is picked. ``release`` drops a reference
+    and only deletes the object when nothing points at it any more.
+
+    The attachment comes back from ``INSERT ... RETURNING`` and the owner
+    update runs in the same transaction, so a missing owner rolls the row
+    back; the uploaded object is then removed as well. The attachment an
+    owner column pointed at before is released in that transaction too and
+    its objects are deleted once it commits. New image rows get their
+    resized variants from a background task.
+    """
+
+    def __init__(
+        self,
+        repository: AttachmentRepository,
+        uploader: StreamingUploader,
+        task_producer: TaskProducer,
+        bucket: str,
+        batch_concurrency: int = 4,
+        max_name_len: int = 60,
+    ) -> None:
+        self.repository = repository
+        self.uploader = uploader
+        self.task_producer = task_producer
+        self.bucket = bucket
+        self.batch_concurrency = batch_concurrency
+        self.max_name_len = max_name_len
+
+    async def __call__(
+        self,
+        payload: schemas.AttachmentCreate,
+        owner: AttachmentOwner | None = None,
+        owner_id: Any = None,
+    ) -> schemas.Attachment:
+        name = payload.name or self._get_random_name()
+        path = self.generate_path(name)
+
+        uploaded = await self.uploader.upload_object(
+            self.bucket,
+            path,
+            payload.file,
+            skip_existing=self.repository.attachment_hash_exists,
+        )
+
+        replaced = None
+        try:
+            async with self.repository.transaction.use():
+                attachment = None
+                if not uploaded.stored:
+                    attachment = await self.repository.reference_attachment(
+                        uploaded.content_hash
+                    )
+                if attachment is None:
+                    if not uploaded.stored:
+                        # The matching attachment was released in the meantime
+                        assert uploaded.body is not None
+                        uploaded = await self.uploader.upload_object(
+                            self.bucket, path, io.BytesIO(uploaded.body)
+                        )
+                    assert uploaded.uri
+                    attachment = await self.repository.create_attachment(
+                        schemas.AttachmentCreateFull(
+                            name=name,
+                            path=path,
+                            uri=self._public_uri(uploaded.uri),
+                            content_hash=uploaded.content_hash,
+                        )
+                    )
+                if owner is not None:
+                    replaced = await self._link(owner, owner_id, attachment)
+        except Exception:
+            if uploaded.stored:
+                logger.info("Removing uploaded object {} after a failed ingest", path)
+                await self.uploader.delete(self.bucket, path)
+            raise
+
+        if uploaded.stored and attachment.path != path:
+            # Same bytes were already stored, keep only the existing copy
+            await self.uploader.delete(self.bucket, path)
+        if replaced is not None:
+            await self._delete_objects(replaced)
+
+        if attachment.variants is None and is_image_name(attachment.name):
+            await self._enqueue_variants(attachment)
+
+        return self._named(attachment, name)
+
+    async def ingest_many(
+        self,
+        payloads: list[schemas.AttachmentCreate],
+        owner: AttachmentBatchOwner,
+        owner_id: Any,
+    ) -> list[schemas.AttachmentBatchItem]:
+        """Upload several files for one owner and store them in one go.
+
+        The owner is checked once, files go to storage ``batch_concurrency``
+        at a time, then all rows are written with one multi-row INSERT per
+        table. A file that fails to upload is reported on its own item; a
+        database failure fails the whole batch. Identical files share a row
+        just like with single uploads.
+        """
+        if not await owner.exists(owner_id):
+            raise NotFoundError()
+
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def upload(
+            payload: schemas.AttachmentCreate,
+        ) -> tuple[str, str, UploadedObject]:
+            name = payload.name or self._get_random_name()
+            # Files of one batch share a timestamp, keep their paths apart
+            path = self.generate_path(f"{uuid.uuid4().hex[:8]}.{name}")
+            async with semaphore:
+                uploaded = await self.uploader.upload_object(
+                    self.bucket, path, payload.file
+                )
+            return name, path, uploaded
+
+        results = await asyncio.gather(
+            *(upload(payload) for payload in payloads), return_exceptions=True
+        )
+
+        stored: dict[int, tuple[str, str, UploadedObject]] = {}
+        rows: dict[str, schemas.AttachmentCreateFull] = {}
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                logger.opt(exception=result).warning(
+                    "Failed to upload {} of a batch", payloads[index].name
+                )
+                continue
+            stored[index] = result
+            name, path, uploaded = result
+            assert uploaded.uri
+            if uploaded.content_hash in rows:
+                rows[uploaded.content_hash].ref_count += 1
+                continue
+            rows[uploaded.content_hash] = schemas.AttachmentCreateFull(
+                name=name,
+                path=path,
+                uri=self._public_uri(uploaded.uri),
+                content_hash=uploaded.content_hash,
+            )
+
+        attachments: dict[str | None, schemas.Attachment] = {}
+        try:
+            async with self.repository.transaction.use():
+                if rows:
+                    created = await self.repository.create_attachments(
+                        list(rows.values())
+                    )
+                    attachments = {x.content_hash: x for x in created}
+                    await owner.link_many(
+                        owner_id,
+                        [attachments[x.content_hash] for _, _, x in stored.values()],
+                    )
+        except Exception:
+            for _, path, _ in stored.values():
+                await self.uploader.delete(self.bucket, path)
+            raise
+
+        kept = {attachment.path for attachment in attachments.values()}
+        for _, path, _ in stored.values():
+            if path not in kept:
+                await self.uploader.delete(self.bucket, path)
+        for attachment in attachments.values():
+            if attachment.variants is None and is_image_name(attachment.name):
+                await self._enqueue_variants(attachment)
+
+        items = []
+        for index, payload in enumerate(payloads):
+            if index not in stored:
+                items.append(
+                    schemas.AttachmentBatchItem(
+                        name=payload.name or "", error="Upload failed"
+                    )
+                )
+                continue
+            name, _, uploaded = stored[index]
+            items.append(
+                schemas.AttachmentBatchItem(
+                    name=name,
+                    attachment=self._named(attachments[uploaded.content_hash], name),
+                )
+            )
+        return items
+
+    async def register(
+        self,
+        name: str,
+        path: str,
+        owner: AttachmentOwner | None = None,
+        owner_id: Any = None,
+    ) -> schemas.Attachment:
+        """Store the row for an object a client uploaded to ``path`` directly.
+
+        Registering the same path again returns the existing row. The bytes
+        never passed through us, so there is no content hash to dedupe on.
+        """
+        replaced = None
+        try:
+            async with self.repository.transaction.use():
+                attachment = await self.repository.get_attachment_by_path_or_none(path)
+                if attachment is not None:
+                    return attachment
+                attachment = await self.repository.create_attachment(
+                    schemas.AttachmentCreateFull(
+                        name=name,
+                        path=path,
+                        uri=self._public_uri(
+                            self.uploader.object_uri(self.bucket, path)
+                        ),
+                    )
+                )
+                if owner is not None:
+                    replaced = await self._link(owner, owner_id, attachment)
+        except Exception:
+            logger.info("Removing uploaded object {} after a failed ingest", path)
+            await self.uploader.delete(self.bucket, path)
+            raise
+
+        if replaced is not None:
+            await self._delete_objects(replaced)
+        if is_image_name(attachment.name):
+            await self._enqueue_variants(attachment)
+
+        return attachment
+
+    async def release(self, attachment_id: UUID, count: int = 1) -> None:
+        attachment = await self.repository.release_attachment(attachment_id, count)
+        if attachment is not None:
+            await self._delete_objects(attachment)
+
+    async def _link(
+        self, owner: AttachmentOwner, owner_id: Any, attachment: schemas.Attachment
+    ) -> schemas.Attachment | None:
+        """Hand the attachment to its owner and drop the reference it replaced.
+
+        Returns the replaced row once nothing points at it any more; its
+        objects are only deleted after the transaction commits.
+        """
+        replaced_id = await owner(owner_id, attachment)
+        if replaced_id is None:
+            return None
+        # Also when it is the same row: the upload took a reference of its own
+        return await self.repository.release_attachment(replaced_id)
+
+    async def _delete_objects(self, attachment: schemas.Attachment) -> None:
+        await self.uploader.delete(self.bucket, attachment.path)
+        for variant in attachment.variants or []:
+            await self.uploader.delete(self.bucket, variant.path)
+
+    async def _enqueue_variants(self, attachment: schemas.Attachment) -> None:
+        await self.task_producer.fire_task(
+            enums.TaskNames.generate_attachment_variants,
+            queue=enums.TaskQueues.main_queue,
+            attachment_id_container_dict=IdContainer(id=attachment.id).json_dict(),
+        )
+
+    @staticmethod
+    def _named(attachment: schemas.Attachment, name: str) -> schemas.Attachment:
+        # A deduplicated row keeps the name of its first upload
+        if attachment.name == name:
+            return attachment
+        return attachment.model_copy(update={"name": name})
+
+    def _public_uri(self, uri: str) -> str:
+        return uri.replace(f"/{self.bucket}/", "/")
+
+    def generate_path(self, name: str) -> str:
+        now = datetime.now()
+        folder = now.strftime("%Y/%m/%d")
+        timestamp = now.strftime("%s")
+        stripped_slugified_name = self._slugify(name)[: self.max_name_len]
+        return f"/{folder}/{timestamp}.{stripped_slugified_name}"
+
+    @classmethod
+    def _get_random_name(cls) -> str:
+        return str(uuid.uuid4())
+
+    @classmethod
+    def _slugify(cls, s: str) -> str:
+        s = s.lower().strip()
+        s = re.sub(r"[^\w\s\.-]", "", s)
+        s = re.sub(r"[\s_-]+", "-", s)
+        s = re.sub(r"^-+|-+$", "", s)
+        return s
@@ -0,0 +1,21 @@
+from typing import Any
+
+from a8t_tools.bus.consumer import consume
+from dependency_injector import wiring
+
+from app.containers import Container
+from app.domain.common.enums import TaskNames
+from app.domain.common.schemas import IdContainer
+from app.domain.storage.attachments.commands import AttachmentVariantsCreateCommand
+
+
+@consume(TaskNames.generate_attachment_variants)
+@wiring.inject
+async def generate_attachment_variants(
+    attachment_id_container_dict: dict[str, Any],
+    command: AttachmentVariantsCreateCommand = wiring.Provide[
+        Container.attachment.variants_create_command
+    ],
+) -> None:
+    attachment_id_container = IdContainer.model_validate(attachment_id_container_dict)
+    await command(attachment_id_container.id)
@@ -0,0 +1,278 @@
+import asyncio
+import functools
+import hashlib
+import io
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import IO, Any
+
+import boto3
+from a8t_tools.storage.facade import FileStorage
+from loguru import logger
+
+UploadSource = IO[bytes] | AsyncIterable[bytes]
+
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+@dataclass
+class UploadedObject:
+    content_hash: str
+    size: int
+    uri: str | None = None
+    body: bytes | None = None
+
+    @property
+    def stored(self) -> bool:
+        return self.uri is not None
+
+
+async def read_chunks(file: IO[bytes], chunk_size: int) -> AsyncIterator[bytes]:
+    while chunk := file.read(chunk_size):
+        yield chunk
+        await asyncio.sleep(0)
+
+
+class AsyncS3Client:
+    """Lazily built boto3 S3 client whose calls run in the default executor."""
+
+    def __init__(
+        self,
+        s3_uri: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+    ) -> None:
+        self.s3_uri = s3_uri
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self._client: Any = None
+
+    async def call(self, method: str, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        fn = getattr(self._get_client(), method)
+        return await loop.run_in_executor(None, functools.partial(fn, **kwargs))
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            self._client = boto3.client(
+                "s3",
+                endpoint_url=self.s3_uri,
+                aws_access_key_id=self.access_key_id,
+                aws_secret_access_key=self.secret_access_key,
+            )
+        return self._client
+
+
+class StreamingUploader:
+    """Pushes upload bodies to storage part by part instead of as one blob.
+
+    With S3 the source is cut into ``part_size`` parts that are sent as a
+    multipart upload, at most ``max_in_flight`` parts at a time, so memory per
+    upload is bounded by ``(max_in_flight + 1) * part_size`` whatever the file
+    size. If the source fails (e.g. the client disconnects) the multipart
+    upload is aborted and nothing is left in the bucket. Bodies smaller than
+    one part are sent with a single PUT.
+
+    The local backend has no multipart API, so there the chunks are spooled
+    and handed to ``FileStorage.upload_file``.
+    """
+
+    def __init__(
+        self,
+        file_storage: FileStorage,
+        use_s3: bool,
+        s3_uri: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        public_storage_uri: str | None = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_in_flight: int = 4,
+    ) -> None:
+        self.file_storage = file_storage
+        self.use_s3 = use_s3
+        self.s3 = AsyncS3Client(s3_uri, access_key_id, secret_access_key)
+        self.public_storage_uri = public_storage_uri
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.max_in_flight = max_in_flight
+
+    async def upload(
+        self,
+        bucket: str,
+        path: str,
+        source: UploadSource,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> str:
+        uploaded = await self.upload_object(bucket, path, source, on_progress)
+        assert uploaded.uri
+        return uploaded.uri
+
+    async def upload_object(
+        self,
+        bucket: str,
+        path: str,
+        source: UploadSource,
+        on_progress: Callable[[int], None] | None = None,
+        skip_existing: Callable[[str], Awaitable[bool]] | None = None,
+    ) -> UploadedObject:
+        """Upload ``source`` and return its SHA-256 along with the URI.
+
+        When the whole body fits in one part, ``skip_existing`` is asked
+        whether an object with that hash is already stored; if so nothing is
+        sent and the body is handed back instead of a URI.
+        """
+        chunks = self._iter_source(source)
+        head = bytearray()
+        async for chunk in chunks:
+            head += chunk
+            if len(head) > self.part_size:
+                break
+        else:
+            body = bytes(head)
+            content_hash = hashlib.sha256(body).hexdigest()
+            if skip_existing is not None and await skip_existing(content_hash):
+                return UploadedObject(content_hash, len(body), body=body)
+
+            uri = await self._put(bucket, path, body)
+            self._report_progress(path, len(body), on_progress)
+            return UploadedObject(content_hash, len(body), uri=uri)
+
+        digest = hashlib.sha256(head)
+        size = len(head)
+
+        async def hashed() -> AsyncIterator[bytes]:
+            nonlocal size
+            yield bytes(head)
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                yield chunk
+
+        if self.use_s3:
+            uri = await self._upload_multipart(bucket, path, hashed(), on_progress)
+        else:
+            uri = await self._upload_spooled(bucket, path, hashed())
+        return UploadedObject(digest.hexdigest(), size, uri=uri)
+
+    async def _upload_multipart(
+        self,
+        bucket: str,
+        path: str,
+        chunks: AsyncIterator[bytes],
+        on_progress: Callable[[int], None] | None,
+    ) -> str:
+        uploaded = 0
+        buffer = bytearray()
+        upload_id: str | None = None
+        parts: list[asyncio.Task[dict[str, Any]]] = []
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+
+        async def upload_part(part_number: int, body: bytes) -> dict[str, Any]:
+            nonlocal uploaded
+            try:
+                response = await self._call(
+                    "upload_part",
+                    Bucket=bucket,
+                    Key=path,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+            finally:
+                in_flight.release()
+            uploaded += len(body)
+            self._report_progress(path, uploaded, on_progress)
+            return {"ETag": response["ETag"], "PartNumber": part_number}
+
+        async def submit_part(body: bytes) -> None:
+            nonlocal upload_id
+            if upload_id is None:
+                upload_id = await self._create_multipart_upload(bucket, path)
+            await in_flight.acquire()
+            parts.append(asyncio.create_task(upload_part(len(parts) + 1, body)))
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= self.part_size:
+                    await submit_part(bytes(buffer[: self.part_size]))
+                    del buffer[: self.part_size]
+
+            if buffer:
+                await submit_part(bytes(buffer))
+            completed = await asyncio.gather(*parts)
+            await self._call(
+                "complete_multipart_upload",
+                Bucket=bucket,
+                Key=path,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": completed},
+            )
+        except BaseException:
+            if upload_id is not None:
+                # Let running parts settle so none lands after the abort
+                await asyncio.gather(*parts, return_exceptions=True)
+                await self._abort(bucket, path, upload_id)
+            raise
+
+        return self.object_uri(bucket, path)
+
+    async def delete(self, bucket: str, path: str) -> None:
+        """Best-effort removal of an uploaded object (S3 only)."""
+        if not self.use_s3:
+            return
+
+        try:
+            await self._call("delete_object", Bucket=bucket, Key=path)
+        except Exception:
+            logger.exception("Failed to delete uploaded object {}", path)
+
+    async def _put(self, bucket: str, path: str, body: bytes) -> str:
+        if not self.use_s3:
+            return await self.file_storage.upload_file(bucket, path, io.BytesIO(body))
+
+        await self._call("put_object", Bucket=bucket, Key=path, Body=body)
+        return self.object_uri(bucket, path)
+
+    async def _upload_spooled(
+        self, bucket: str, path: str, chunks: AsyncIterator[bytes]
+    ) -> str:
+        with tempfile.SpooledTemporaryFile(max_size=self.part_size) as file:
+            async for chunk in chunks:
+                file.write(chunk)
+            file.seek(0)
+            return await self.file_storage.upload_file(bucket, path, file)
+
+    async def _create_multipart_upload(self, bucket: str, path: str) -> str:
+        response = await self._call("create_multipart_upload", Bucket=bucket, Key=path)
+        return response["UploadId"]
+
+    async def _abort(self, bucket: str, path: str, upload_id: str) -> None:
+        try:
+            await self._call(
+                "abort_multipart_upload", Bucket=bucket, Key=path, UploadId=upload_id
+            )
+        except Exception:
+            logger.exception("Failed to abort multipart upload of {}", path)
+        else:
+            logger.info("Aborted multipart upload of {}", path)
+
+    async def _call(self, method: str, **kwargs: Any) -> Any:
+        return await self.s3.call(method, **kwargs)
+
+    def object_uri(self, bucket: str, path: str) -> str:
+        assert self.public_storage_uri
+        return f"{self.public_storage_uri.rstrip('/')}/{bucket}/{path.lstrip('/')}"
+
+    def _iter_source(self, source: UploadSource) -> AsyncIterator[bytes]:
+        if isinstance(source, AsyncIterable):
+            return aiter(source)
+        return read_chunks(source, self.part_size)
+
+    @staticmethod
+    def _report_progress(
+        path: str, uploaded: int, on_progress: Callable[[int], None] | None
+    ) -> None:
+        if on_progress is not None:
+            on_progress(uploaded)
+        logger.debug("Uploaded {} bytes of {}", uploaded, path)
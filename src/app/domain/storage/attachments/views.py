@@ -1,22 +1,37 @@
+import mimetypes
 from contextlib import asynccontextmanager
 from uuid import UUID
 
 from a8t_tools.db import pagination, sorting
 from a8t_tools.security.tokens import override_user_token
 from dependency_injector import wiring
-from fastapi import APIRouter, Depends, Header, UploadFile
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, UploadFile
 
 from app.api import deps
 from app.containers import Container
+from app.domain.common.pagination import CursorPaginationResults
 from app.domain.storage.attachments import schemas
-from app.domain.storage.attachments.commands import AttachmentCreateCommand
+from app.domain.storage.attachments.commands import (
+    AttachmentCreateCommand,
+    PresignedUploadCreateCommand,
+    PresignedUploadFinalizeCommand,
+)
+from app.domain.storage.attachments.downloads import (
+    ObjectResponse,
+    RangeNotSatisfiableError,
+    http_date,
+)
 from app.domain.storage.attachments.queries import (
+    AttachmentDataQuery,
     AttachmentListQuery,
     AttachmentRetrieveQuery,
+    PresignedDownloadQuery,
 )
 
 router = APIRouter()
 
+attachment_sorting = deps.get_sort_order_sorting_dep(schemas.AttachmentSorts)
+
 
 @asynccontextmanager
 async def user_token(token: str):
@@ -42,9 +57,51 @@ async def create_attachment(
         )
 
 
+@router.post("/stream", response_model=schemas.Attachment)
+@wiring.inject
+async def stream_attachment(
+    request: Request,
+    name: str | None = Query(None),
+    token: str = Header(...),
+    command: AttachmentCreateCommand = Depends(
+        wiring.Provide[Container.attachment.create_command]
+    ),
+) -> schemas.Attachment:
+    async with user_token(token):
+        return await command(
+            schemas.AttachmentCreate(file=request.stream(), name=name),
+        )
+
+
+@router.post("/presigned", response_model=schemas.PresignedUpload)
+@wiring.inject
+async def create_presigned_upload(
+    payload: schemas.PresignedUploadCreate,
+    token: str = Header(...),
+    command: PresignedUploadCreateCommand = Depends(
+        wiring.Provide[Container.attachment.presigned_upload_create_command]
+    ),
+) -> schemas.PresignedUpload:
+    async with user_token(token):
+        return await command(payload)
+
+
+@router.post("/presigned/finalize", response_model=schemas.Attachment)
+@wiring.inject
+async def finalize_presigned_upload(
+    payload: schemas.PresignedUploadFinalize,
+    token: str = Header(...),
+    command: PresignedUploadFinalizeCommand = Depends(
+        wiring.Provide[Container.attachment.presigned_upload_finalize_command]
+    ),
+) -> schemas.Attachment:
+    async with user_token(token):
+        return await command(payload)
+
+
 @router.get(
     "/get",
-    response_model=pagination.CountPaginationResults[schemas.Attachment],
+    response_model=CursorPaginationResults[schemas.Attachment],
 )
 @wiring.inject
 async def get_attachments_list(
@@ -52,12 +109,10 @@ async def get_attachments_list(
         wiring.Provide[Container.attachment.list_query]
     ),
     pagination: pagination.PaginationCallable[schemas.Attachment] = Depends(
-        deps.get_skip_limit_pagination_dep(schemas.Attachment)
-    ),
-    sorting: sorting.SortingData[schemas.AttachmentSorts] = Depends(
-        deps.get_sort_order_sorting_dep(schemas.AttachmentSorts)
+        deps.get_cursor_pagination_dep(schemas.Attachment, attachment_sorting)
     ),
-) -> pagination.Paginated[schemas.Attachment]:
+    sorting: sorting.SortingData[schemas.AttachmentSorts] = Depends(attachment_sorting),
+) -> CursorPaginationResults[schemas.Attachment]:
     return await query(
         schemas.AttachmentListRequestSchema(pagination=pagination, sorting=sorting)
     )
@@ -75,3 +130,55 @@ async def get_attachment_details(
     ),
 ) -> schemas.Attachment:
     return await query(attachment_id)
+
+
+@router.get("/{attachment_id}/presigned", response_model=schemas.PresignedDownload)
+@wiring.inject
+async def get_presigned_download(
+    attachment_id: UUID,
+    query: PresignedDownloadQuery = Depends(
+        wiring.Provide[Container.attachment.presigned_download_query]
+    ),
+) -> schemas.PresignedDownload:
+    return await query(attachment_id)
+
+
+@router.api_route(
+    "/{attachment_id}/data", methods=["GET", "HEAD"], response_class=Response
+)
+@wiring.inject
+async def get_attachment_data(
+    attachment_id: UUID,
+    range: str | None = Header(None),
+    if_range: str | None = Header(None),
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    query: AttachmentDataQuery = Depends(
+        wiring.Provide[Container.attachment.data_query]
+    ),
+) -> Response:
+    try:
+        data = await query(
+            schemas.AttachmentDataRequest(
+                attachment_id=attachment_id,
+                range=range,
+                if_range=if_range,
+                if_none_match=if_none_match,
+                if_modified_since=if_modified_since,
+            )
+        )
+    except RangeNotSatisfiableError as e:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{e.size}"})
+
+    headers = {
+        "ETag": data.etag,
+        "Last-Modified": http_date(data.last_modified),
+        "Accept-Ranges": "bytes",
+    }
+    if data.body is None:
+        return Response(status_code=304, headers=headers)
+
+    media_type, _ = mimetypes.guess_type(data.attachment.name)
+    return ObjectResponse(
+        data.body, headers, media_type=media_type or "application/octet-stream"
+    )
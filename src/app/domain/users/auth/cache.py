@@ -0,0 +1,58 @@
+import hashlib
+import time
+
+from app.domain.common.cache import TTLCache
+from app.domain.users.auth.schemas import TokenPayload
+
+
+class VerifiedTokenCache:
+    """LRU of access tokens whose signature has already been verified.
+
+    Entries are keyed by the SHA-256 digest of the raw token, so the tokens
+    themselves are never kept in memory, and expire together with the token's
+    ``exp`` claim. A hit skips the RSA verification entirely.
+    """
+
+    def __init__(
+        self, enabled: bool = True, max_entries: int = 10000, ttl_seconds: float = 900
+    ) -> None:
+        self.enabled = enabled
+        self.records: TTLCache[TokenPayload] = TTLCache(max_entries, ttl_seconds)
+        self.verifications = 0
+        self.verify_seconds = 0.0
+
+    def get(self, token: str) -> TokenPayload | None:
+        if not self.enabled:
+            return None
+        return self.records.get(self._key(token))
+
+    def set(self, token: str, payload: TokenPayload, expires_at: float | None) -> None:
+        if not self.enabled:
+            return
+
+        ttl = None
+        if expires_at is not None:
+            ttl = min(float(expires_at) - time.time(), self.records.ttl)
+            if ttl <= 0:
+                return
+        self.records.set(self._key(token), payload, ttl=ttl)
+
+    def record_verification(self, seconds: float) -> None:
+        self.verifications += 1
+        self.verify_seconds += seconds
+
+    def stats(self) -> dict[str, float]:
+        stats: dict[str, float] = dict(self.records.stats())
+        lookups = self.records.hits + self.records.misses
+        stats["hit_ratio"] = self.records.hits / lookups if lookups else 0.0
+        stats["verifications"] = self.verifications
+        stats["verify_ms_avg"] = (
+            self.verify_seconds * 1000 / self.verifications
+            if self.verifications
+            else 0.0
+        )
+        return stats
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
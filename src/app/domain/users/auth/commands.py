@@ -26,7 +26,7 @@ class TokenCreateCommand:
     async def __call__(self, user: UserInternal) -> TokenResponse:
         token_id = uuid.uuid4()
         await self.repository.create_token_info(
-            TokenInfo(user_id=user.id, token_id=token_id)
+            TokenInfo(user_id=user.id, token_id=token_id, kind=user.kind)
         )
 
         return await self._get_token_data(user, token_id)
@@ -44,10 +44,10 @@ class TokenCreateCommand:
         return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
     async def _format_access_token_payload(self, user: UserInternal) -> Any:
-        return json.loads(TokenPayload(sub=user.id).model_dump_json())
+        return json.loads(TokenPayload(sub=user.id, kind=user.kind).model_dump_json())
 
     async def _format_refresh_token_payload(self, token_id: uuid.UUID) -> Any:
-        return json.loads(TokenPayload(sub=token_id).model_dump_json())
+        return json.loads(TokenPayload(sub=token_id).model_dump_json(exclude_none=True))
 
 
 class TokenRefreshCommand:
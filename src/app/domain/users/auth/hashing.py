@@ -0,0 +1,102 @@
+import asyncio
+import functools
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from a8t_tools.security.hashing import PasswordHashService
+from loguru import logger
+from passlib.context import CryptContext
+
+from app.domain.common.exceptions import ServiceBusyError
+
+T = TypeVar("T")
+
+
+@functools.lru_cache
+def _context(config: str) -> CryptContext:
+    return CryptContext.from_string(config)
+
+
+def _hash(config: str, password: str) -> str:
+    return _context(config).hash(password)
+
+
+def _verify(config: str, password: str, password_hash: str) -> bool:
+    return _context(config).verify(password, password_hash)
+
+
+class PasswordHashingExecutor:
+    """Bounded pool that keeps bcrypt work off the event loop.
+
+    At most ``max_pending`` jobs may be running or queued; further calls fail
+    fast with ``ServiceBusyError`` instead of piling up behind a login storm.
+    """
+
+    def __init__(
+        self, pool_size: int = 4, max_pending: int = 64, use_processes: bool = False
+    ) -> None:
+        self.pool_size = pool_size
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Executor | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.pending - self.pool_size)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning(
+                "Password hashing pool is full: {} queued, {} rejected so far",
+                self.queue_depth,
+                self.rejected,
+            )
+            raise ServiceBusyError()
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": self.pending,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.pool_size)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.pool_size, thread_name_prefix="password-hashing"
+                )
+        return self._executor
+
+
+class OffloadedPasswordHashService(PasswordHashService):
+    def __init__(
+        self, pwd_context: CryptContext, executor: PasswordHashingExecutor
+    ) -> None:
+        super().__init__(pwd_context=pwd_context)
+        self.executor = executor
+        self._config = pwd_context.to_string()
+
+    async def hash(self, password: str) -> str:
+        return await self.executor.run(_hash, self._config, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self.executor.run(_verify, self._config, password, password_hash)
@@ -0,0 +1,38 @@
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_request_identity: ContextVar[tuple[str | None, dict[str, Any]] | None] = ContextVar(
+    "request_identity", default=None
+)
+
+
+class RequestIdentityCache:
+    """Memoizes the caller's token payload, user and permissions for one request.
+
+    Values live in a context variable, so every request (task) gets its own
+    storage, and they are tied to the current ``token_ctx_var`` value: once
+    the token is overridden the previous entries are dropped.
+    """
+
+    def __init__(self, token_ctx_var: ContextVar) -> None:
+        self.token_ctx_var = token_ctx_var
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        values = self._values()
+        if key not in values:
+            values[key] = await loader()
+        return values[key]
+
+    def invalidate(self) -> None:
+        _request_identity.set(None)
+
+    def _values(self) -> dict[str, Any]:
+        token = self.token_ctx_var.get()
+        state = _request_identity.get()
+        if state is None or state[0] != token:
+            state = (token, {})
+            _request_identity.set(state)
+        return state[1]
@@ -1,3 +1,4 @@
+import time
 from contextlib import contextmanager
 from contextvars import ContextVar
 
@@ -6,6 +7,8 @@ from a8t_tools.security import tokens
 from app.domain.common import enums
 from app.domain.common.exceptions import AuthError
 from app.domain.users.auth import schemas
+from app.domain.users.auth.cache import VerifiedTokenCache
+from app.domain.users.auth.identity import RequestIdentityCache
 from app.domain.users.core.queries import UserRetrieveQuery
 from app.domain.users.core.schemas import UserDetails
 
@@ -19,15 +22,26 @@ class CurrentUserTokenQuery:
 
 
 class TokenPayloadQuery:
-    def __init__(self, jwt_service: tokens.JwtServiceBase) -> None:
+    def __init__(
+        self, jwt_service: tokens.JwtServiceBase, token_cache: VerifiedTokenCache
+    ) -> None:
         self.jwt_service = jwt_service
+        self.token_cache = token_cache
 
     async def __call__(self, token: str, validate: bool = True) -> schemas.TokenPayload:
-        print("Received token:", token)
+        if validate and (cached := self.token_cache.get(token)) is not None:
+            return cached
+
+        started = time.perf_counter()
         with self._handle_auth_exceptions():
             decoded_token = await self.jwt_service.decode(token, validate)
+        token_payload = schemas.TokenPayload.model_validate(decoded_token)
+
+        if validate:
+            self.token_cache.record_verification(time.perf_counter() - started)
+            self.token_cache.set(token, token_payload, decoded_token.get("exp"))
 
-        return schemas.TokenPayload.model_validate(decoded_token)
+        return token_payload
 
     @contextmanager
     def _handle_auth_exceptions(self):
@@ -50,29 +64,54 @@ class CurrentUserTokenPayloadQuery:
         self,
         token_query: CurrentUserTokenQuery,
         token_payload_query: TokenPayloadQuery,
+        identity_cache: RequestIdentityCache,
     ) -> None:
         self.token_query = token_query
         self.token_payload_query = token_payload_query
+        self.identity_cache = identity_cache
 
     async def __call__(self) -> schemas.TokenPayload | None:
         token = await self.token_query()
         if not token:
             return None
 
-        return await self.token_payload_query(token)
+        return await self.identity_cache.get_or_load(
+            "token_payload", lambda: self.token_payload_query(token)
+        )
+
+
+class CurrentPrincipalQuery:
+    """Identity of the caller taken from the access token, without a DB lookup."""
+
+    def __init__(self, token_query: CurrentUserTokenPayloadQuery) -> None:
+        self.token_query = token_query
+
+    async def __call__(self) -> schemas.TokenPayload:
+        token_payload = await self.token_query()
+        if token_payload is None:
+            raise AuthError(code=enums.AuthErrorCodes.invalid_token)
+
+        return token_payload
 
 
 class CurrentUserQuery:
     def __init__(
-        self, token_query: CurrentUserTokenPayloadQuery, user_query: UserRetrieveQuery
+        self,
+        token_query: CurrentUserTokenPayloadQuery,
+        user_query: UserRetrieveQuery,
+        identity_cache: RequestIdentityCache,
     ) -> None:
         self.token_query = token_query
         self.user_query = user_query
+        self.identity_cache = identity_cache
 
     async def __call__(self) -> UserDetails:
         token_payload = await self.token_query()
         if token_payload:
-            user = await self.user_query(token_payload.sub)
+            user = await self.identity_cache.get_or_load(
+                f"user:{token_payload.sub}",
+                lambda: self.user_query(token_payload.sub),
+            )
 
             return UserDetails.model_validate(user)
         raise AuthError(code=enums.AuthErrorCodes.invalid_token)
@@ -3,7 +3,7 @@ import uuid
 from a8t_tools.db.transactions import AsyncDbTransaction
 from sqlalchemy import delete, insert, select
 
-from app.domain.common import models
+from app.domain.common import enums, models
 from app.domain.users.auth import schemas
 
 
@@ -12,27 +12,17 @@ class TokenRepository:
         self.transaction = transaction
 
     async def create_token_info(self, payload: schemas.TokenInfo) -> None:
+        owner_column = (
+            "staff_id" if payload.kind == enums.PrincipalKinds.staff else "user_id"
+        )
+        stmt = insert(models.Token).values(
+            {
+                owner_column: payload.user_id,
+                "refresh_token_id": payload.token_id,
+            }
+        )
         async with self.transaction.use() as session:
             try:
-                staff_query = select(models.Staff).where(
-                    models.Staff.id == payload.user_id
-                )
-                staff_exists = await session.execute(staff_query)
-
-                if staff_exists.first():
-                    stmt = insert(models.Token).values(
-                        {
-                            "staff_id": payload.user_id,
-                            "refresh_token_id": payload.token_id,
-                        }
-                    )
-                else:
-                    stmt = insert(models.Token).values(
-                        {
-                            "user_id": payload.user_id,
-                            "refresh_token_id": payload.token_id,
-                        }
-                    )
                 await session.execute(stmt)
             except Exception as e:
                 print(f"Error creating token info: {e}")
@@ -45,9 +35,16 @@ class TokenRepository:
         if result is None:
             return None
 
-        user_id = result.user_id if result.user_id is not None else result.staff_id
+        if result.user_id is not None:
+            return schemas.TokenInfo(
+                user_id=result.user_id, token_id=result.refresh_token_id
+            )
 
-        return schemas.TokenInfo(user_id=user_id, token_id=result.refresh_token_id)
+        return schemas.TokenInfo(
+            user_id=result.staff_id,
+            token_id=result.refresh_token_id,
+            kind=enums.PrincipalKinds.staff,
+        )
 
     async def delete_tokens(self, token_id: uuid.UUID) -> None:
         stmt = delete(models.Token).where(models.Token.refresh_token_id == token_id)
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from app.domain.common.enums import PrincipalKinds
 from app.domain.common.schemas import APIModel
 
 
@@ -11,9 +12,11 @@ class TokenResponse(APIModel):
 
 class TokenPayload(APIModel):
     sub: UUID
+    kind: PrincipalKinds | None = None
 
 
 class TokenInfo(APIModel):
     user_id: UUID | None = None
     staff_id: UUID | None = None
     token_id: UUID
+    kind: PrincipalKinds = PrincipalKinds.user
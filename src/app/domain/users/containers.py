@@ -1,17 +1,30 @@
 from a8t_tools.bus.producer import TaskProducer
 from a8t_tools.db.transactions import AsyncDbTransaction
-from a8t_tools.security.hashing import PasswordHashService
 from a8t_tools.security.tokens import JwtHmacService, JwtRsaService, token_ctx_var
 from dependency_injector import containers, providers
 from passlib.context import CryptContext
 
-from app.domain.notifications.commands import EmailSender
+from app.domain.notifications.commands import (
+    EmailOutbox,
+    EmailOutboxDrainCommand,
+    EmailSender,
+)
+from app.domain.notifications.repositories import EmailOutboxRepository
+from app.domain.notifications.templates import EmailTemplates
+from app.domain.notifications.transport import SmtpConnectionPool
 from app.domain.users.auth.commands import (
     TokenCreateCommand,
     TokenRefreshCommand,
     UserAuthenticateCommand,
 )
+from app.domain.users.auth.cache import VerifiedTokenCache
+from app.domain.users.auth.hashing import (
+    OffloadedPasswordHashService,
+    PasswordHashingExecutor,
+)
+from app.domain.users.auth.identity import RequestIdentityCache
 from app.domain.users.auth.queries import (
+    CurrentPrincipalQuery,
     CurrentUserQuery,
     CurrentUserTokenPayloadQuery,
     CurrentUserTokenQuery,
@@ -19,7 +32,6 @@ from app.domain.users.auth.queries import (
 )
 from app.domain.users.auth.repositories import TokenRepository
 from app.domain.users.core.commands import (
-    EmailSenderCommand,
     UpdatePasswordConfirmCommand,
     UpdatePasswordRequestCommand,
     UserActivateCommand,
@@ -33,6 +45,7 @@ from app.domain.users.core.queries import (
     UserRetrieveByUsernameQuery,
     UserRetrieveQuery, StaffListQuery,
 )
+from app.domain.users.core.cache import UserCache
 from app.domain.users.core.repositories import (
     EmailRpository,
     StaffRepository,
@@ -45,6 +58,7 @@ from app.domain.users.management.commands import (
     UserManagementPartialUpdateCommand,
 )
 from app.domain.users.management.queries import (
+    RuntimeStatsQuery,
     UserManagementListQuery,
     UserManagementRetrieveQuery,
 )
@@ -68,6 +82,8 @@ from app.domain.users.staff.queries import StaffRetrieveQuery
 class UserContainer(containers.DeclarativeContainer):
     transaction = providers.Dependency(instance_of=AsyncDbTransaction)
 
+    user_cache = providers.Dependency(instance_of=UserCache)
+
     task_producer = providers.Dependency(instance_of=TaskProducer)
 
     secret_key = providers.Dependency(instance_of=str)
@@ -78,20 +94,71 @@ class UserContainer(containers.DeclarativeContainer):
 
     pwd_context = providers.Dependency(instance_of=CryptContext)
 
+    password_hashing_executor = providers.Dependency(instance_of=PasswordHashingExecutor)
+
+    verified_token_cache = providers.Dependency(instance_of=VerifiedTokenCache)
+
     access_expiration_time = providers.Dependency(instance_of=int)
 
     refresh_expiration_time = providers.Dependency(instance_of=int)
 
-    email_notification = providers.Factory(EmailSender)
+    mail_transport = providers.Dependency(instance_of=SmtpConnectionPool)
+
+    email_address = providers.Dependency(instance_of=str)
+
+    email_outbox_batch_size = providers.Dependency(instance_of=int)
+
+    email_outbox_max_attempts = providers.Dependency(instance_of=int)
+
+    email_outbox_retry_seconds = providers.Dependency(instance_of=int)
+
+    # Loaded and compiled once, at startup
+    email_templates = providers.Resource(EmailTemplates.from_directory)
+
+    email_notification = providers.Factory(
+        EmailSender,
+        transport=mail_transport,
+        templates=email_templates,
+        email_address=email_address,
+    )
+
+    email_outbox_repository = providers.Factory(
+        EmailOutboxRepository, transaction=transaction
+    )
+
+    email_outbox = providers.Factory(
+        EmailOutbox,
+        repository=email_outbox_repository,
+        task_producer=task_producer,
+    )
+
+    email_outbox_drain_command = providers.Factory(
+        EmailOutboxDrainCommand,
+        repository=email_outbox_repository,
+        sender=email_notification,
+        task_producer=task_producer,
+        batch_size=email_outbox_batch_size,
+        max_attempts=email_outbox_max_attempts,
+        retry_seconds=email_outbox_retry_seconds,
+    )
+
+    token_ctx_var_object = providers.Object(token_ctx_var)
+
+    identity_cache = providers.Singleton(
+        RequestIdentityCache,
+        token_ctx_var=token_ctx_var_object,
+    )
 
     user_repository = providers.Factory(
         UserRepository,
         transaction=transaction,
+        user_cache=user_cache,
     )
 
     staff_repository = providers.Factory(
         StaffRepository,
         transaction=transaction,
+        user_cache=user_cache,
     )
 
     user_retrieve_query = providers.Factory(
@@ -123,6 +190,7 @@ class UserContainer(containers.DeclarativeContainer):
     retrieve_query = providers.Factory(
         UserRetrieveQuery,
         user_repository=user_repository,
+        user_cache=user_cache,
     )
 
     current_staff_query = providers.Factory(
@@ -143,6 +211,7 @@ class UserContainer(containers.DeclarativeContainer):
 
     create_command = providers.Factory(
         UserCreateCommand,
+        transaction=transaction,
         user_repository=user_repository,
         staff_repository=staff_repository,
         task_producer=task_producer,
@@ -153,10 +222,6 @@ class UserContainer(containers.DeclarativeContainer):
         repository=user_repository,
     )
 
-    email_sender_command = providers.Factory(
-        EmailSenderCommand,
-    )
-
     staff_partial_update_command = providers.Factory(
         StaffPartialUpdateCommand,
         staff_repository=staff_repository,
@@ -167,8 +232,9 @@ class UserContainer(containers.DeclarativeContainer):
     )
 
     password_hash_service = providers.Factory(
-        PasswordHashService,
+        OffloadedPasswordHashService,
         pwd_context=pwd_context,
+        executor=password_hashing_executor,
     )
 
     jwt_rsa_service = providers.Factory(
@@ -189,10 +255,9 @@ class UserContainer(containers.DeclarativeContainer):
     partial_update_command = providers.Factory(
         UserPartialUpdateCommand,
         user_repository=user_repository,
+        identity_cache=identity_cache,
     )
 
-    token_ctx_var_object = providers.Object(token_ctx_var)
-
     current_user_token_query = providers.Factory(
         CurrentUserTokenQuery,
         token_ctx_var=token_ctx_var_object,
@@ -201,19 +266,22 @@ class UserContainer(containers.DeclarativeContainer):
     permission_list_query = providers.Factory(
         UserPermissionListQuery,
         query=retrieve_query,
+        identity_cache=identity_cache,
     )
 
     register_command = providers.Factory(
         UserRegisterCommand,
+        transaction=transaction,
         create_command=create_command,
         password_hash_service=password_hash_service,
-        email_notification=email_notification,
+        email_outbox=email_outbox,
     )
 
     email_verification_request_command = providers.Factory(
         UserEmailVerificationRequestCommand,
+        transaction=transaction,
         repository=repository_email_verification,
-        email_notification=email_notification,
+        email_outbox=email_outbox,
     )
 
     email_verification_confirm_command = providers.Factory(
@@ -223,9 +291,10 @@ class UserContainer(containers.DeclarativeContainer):
 
     update_password_request_command = providers.Factory(
         UpdatePasswordRequestCommand,
+        transaction=transaction,
         user_retrieve_by_email_query=retrieve_by_email_query,
         repository=repository_update_password,
-        email_notification=email_notification,
+        email_outbox=email_outbox,
     )
 
     get_userID_by_code = providers.Factory(
@@ -265,12 +334,14 @@ class UserContainer(containers.DeclarativeContainer):
     token_payload_query = providers.Factory(
         TokenPayloadQuery,
         jwt_service=jwt_rsa_service,
+        token_cache=verified_token_cache,
     )
 
     current_user_token_payload_query = providers.Factory(
         CurrentUserTokenPayloadQuery,
         token_query=current_user_token_query,
         token_payload_query=token_payload_query,
+        identity_cache=identity_cache,
     )
 
     permission_service = providers.Factory(
@@ -279,10 +350,16 @@ class UserContainer(containers.DeclarativeContainer):
         current_user_token_payload_query=current_user_token_payload_query,
     )
 
+    current_principal_query = providers.Factory(
+        CurrentPrincipalQuery,
+        token_query=current_user_token_payload_query,
+    )
+
     current_user_query = providers.Factory(
         CurrentUserQuery,
         token_query=current_user_token_payload_query,
         user_query=retrieve_query,
+        identity_cache=identity_cache,
     )
 
     authenticate_command = providers.Factory(
@@ -339,6 +416,14 @@ class UserContainer(containers.DeclarativeContainer):
         query=retrieve_query,
     )
 
+    management_stats_query = providers.Factory(
+        RuntimeStatsQuery,
+        permission_service=permission_service,
+        token_cache=verified_token_cache,
+        user_cache=user_cache,
+        password_hashing_executor=password_hashing_executor,
+    )
+
     management_create_command = providers.Factory(
         UserManagementCreateCommand,
         permission_service=permission_service,
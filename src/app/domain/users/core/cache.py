@@ -0,0 +1,84 @@
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.sql import Executable
+
+from app.domain.common.cache import TTLCache
+from app.domain.users.core.schemas import UserInternal
+
+
+class UserCache:
+    """Cross-request cache of ``UserInternal`` records keyed by user id.
+
+    Permission checks and the current-user lookup read through it; every
+    write to a user or staff row evicts the entry once the writing transaction
+    commits. Evictions are also published with ``pg_notify`` on the broadcast
+    channel, which Postgres delivers at commit, so other workers drop their
+    copy too; without a channel the cache is only safe with a single worker.
+    A record read before an eviction is not stored afterwards (see
+    ``generation``), so a concurrent reader can not re-cache the old row.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl_seconds: float = 60,
+        max_entries: int = 10000,
+        broadcast_channel: str | None = None,
+        dsn: str | None = None,
+    ) -> None:
+        self.enabled = enabled
+        self.broadcast_channel = broadcast_channel
+        self.dsn = dsn
+        self.records: TTLCache[UserInternal] = TTLCache(max_entries, ttl_seconds)
+        self.generation = 0
+        self._listener: Any = None
+
+    def get(self, user_id: UUID) -> UserInternal | None:
+        if not self.enabled:
+            return None
+        return self.records.get(user_id)
+
+    def set(
+        self, user_id: UUID, user: UserInternal, generation: int | None = None
+    ) -> None:
+        if not self.enabled:
+            return
+        if generation is not None and generation != self.generation:
+            # Something was evicted while the record was loaded
+            return
+        self.records.set(user_id, user)
+
+    def evict(self, user_id: UUID) -> None:
+        self.generation += 1
+        self.records.delete(user_id)
+
+    def notify_statement(self, user_id: UUID) -> Executable | None:
+        if not self.enabled or not self.broadcast_channel:
+            return None
+        return select(func.pg_notify(self.broadcast_channel, str(user_id)))
+
+    def stats(self) -> dict[str, int]:
+        return self.records.stats()
+
+    async def start_listener(self) -> None:
+        if not self.enabled or not self.broadcast_channel or self._listener:
+            return
+
+        assert self.dsn
+        self._listener = await asyncpg.connect(self.dsn.replace("+asyncpg", ""))
+        await self._listener.add_listener(self.broadcast_channel, self._on_notify)
+
+    async def stop_listener(self) -> None:
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.evict(UUID(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed user cache invalidation: {}", payload)
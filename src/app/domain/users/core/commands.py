@@ -1,8 +1,7 @@
-import smtplib
-from email.message import EmailMessage
 from uuid import UUID
 
 from a8t_tools.bus.producer import TaskProducer
+from a8t_tools.db.transactions import AsyncDbTransaction
 from a8t_tools.security.hashing import PasswordHashService
 from loguru import logger
 
@@ -10,8 +9,9 @@ from app.domain.common import enums
 from app.domain.common.exceptions import NotFoundError
 from app.domain.common.models import PasswordResetCode
 from app.domain.common.schemas import IdContainer
-from app.domain.notifications.commands import EmailSender
+from app.domain.notifications.commands import EmailOutbox
 from app.domain.projects.repositories import ProjectRepository
+from app.domain.users.auth.identity import RequestIdentityCache
 from app.domain.users.core import schemas
 from app.domain.users.core.queries import (
     UserRetrieveByCodeQuery,
@@ -28,13 +28,15 @@ from app.domain.users.core.schemas import EmailForCode
 class UpdatePasswordRequestCommand:
     def __init__(
         self,
+        transaction: AsyncDbTransaction,
         user_retrieve_by_email_query: UserRetrieveByEmailQuery,
         repository: UpdatePasswordRepository,
-        email_notification: EmailSender,
+        email_outbox: EmailOutbox,
     ):
+        self.transaction = transaction
         self.user_retrieve_by_email_query = user_retrieve_by_email_query
         self.repository = repository
-        self.email_notification = email_notification
+        self.email_outbox = email_outbox
 
     async def __call__(self, payload: schemas.EmailForCode) -> EmailForCode:
         email = payload.email
@@ -43,14 +45,21 @@ class UpdatePasswordRequestCommand:
         user_id = user_internal.id
         code = PasswordResetCode.generate_code()
 
-        password_reset_code = schemas.PasswordResetCode(
-            user_id=user_id,
-            code=code,
-        )
-
-        await self.repository.delete_code(user_id)
-        await self.repository.create_update_password(password_reset_code)
-        await self.email_notification.send_password_reset_email(email, code)
+        if user_internal.kind == enums.PrincipalKinds.staff:
+            password_reset_code = schemas.PasswordResetCode(staff_id=user_id, code=code)
+        else:
+            password_reset_code = schemas.PasswordResetCode(user_id=user_id, code=code)
+
+        async with self.transaction.use():
+            await self.repository.delete_code(user_id, user_internal.kind)
+            await self.repository.create_update_password(password_reset_code)
+            await self.email_outbox.enqueue(
+                enums.EmailKinds.password_reset,
+                email,
+                params=dict(code=code),
+                dedupe_key=f"password_reset:{user_id}:{code}",
+            )
+        await self.email_outbox.kick()
 
         return EmailForCode(email=email)
 
@@ -59,13 +68,16 @@ class UserPartialUpdateCommand:
     def __init__(
         self,
         user_repository: UserRepository,
+        identity_cache: RequestIdentityCache,
     ):
         self.user_repository = user_repository
+        self.identity_cache = identity_cache
 
     async def __call__(
         self, user_id: UUID, payload: schemas.UserPartialUpdateFull
     ) -> schemas.UserDetailsFull:
         await self.user_repository.partial_update_user(user_id, payload)
+        self.identity_cache.invalidate()
         user = await self.user_repository.get_user_by_filter_or_none(
             schemas.UserWhere(id=user_id)
         )
@@ -140,10 +152,12 @@ class UpdatePasswordConfirmCommand:
 class UserCreateCommand:
     def __init__(
         self,
+        transaction: AsyncDbTransaction,
         user_repository: UserRepository,
         staff_repository: StaffRepository,
         task_producer: TaskProducer,
     ):
+        self.transaction = transaction
         self.user_repository = user_repository
         self.staff_repository = staff_repository
         self.task_producer = task_producer
@@ -162,14 +176,18 @@ class UserCreateCommand:
             )
             assert user
         else:
-            user_id_container = await self.user_repository.create_user(
-                schemas.UserCreateFull(
-                    status=enums.UserStatuses.unconfirmed,
-                    **payload.model_dump(),
+            async with self.transaction.use():
+                user_id_container = await self.user_repository.create_user(
+                    schemas.UserCreateFull(
+                        status=enums.UserStatuses.unconfirmed,
+                        **payload.model_dump(),
+                    )
+                )
+                # The worker must see the user row, so fire once it's committed
+                self.transaction.on_commit(
+                    lambda: self._enqueue_user_activation(user_id_container)
                 )
-            )
             logger.info(f"User created: {user_id_container.id}")
-            await self._enqueue_user_activation(user_id_container)
             user = await self.user_repository.get_user_by_filter_or_none(
                 schemas.UserWhere(id=user_id_container.id)
             )
@@ -194,41 +212,3 @@ class UserActivateCommand:
 
     async def __call__(self, user_id: UUID) -> None:
         await self.repository.set_user_status(user_id, enums.UserStatuses.active)
-
-
-# Временно, я сейчас сделал класс для отправок писем. Эта часть на время, пока работаю с напоминаниями и тасками
-class EmailSenderCommand:
-    async def __call__(self, task_id: UUID) -> None:
-        email_address = "tikhonov.igor2028@yandex.ru"
-        email_password = "abqiulywjvibrefg"
-
-        msg = EmailMessage()
-        msg["Subject"] = "Напоминание о новости"
-        msg["From"] = email_address
-        msg["To"] = "tikhonov.igor2028@yandex.ru"
-
-        html_content = f"""\
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #003366; background-color: #486DB5;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px; background-color: #ffffff;">
-                <h2 style="color: #FFD700;">Сброс пароля</h2>
-                <p>Здравствуйте,</p>
-                <p>Подтверждение почты на платформе Отдела Образовательных Программ.</p>
-                <p>Код для подтверждения почты:</p>
-                <p style="font-size: 18px; font-weight: bold; color: #FFD700;"></p>
-                <p>Если вы не запрашивали подтверждения почты, проигнорируйте это письмо.</p>
-                <p>С уважением,<br>Ваш Отдел Образовательных Программ</p>
-                <p style="margin-top: 20px; color: #777; font-size: 12px;">Если у вас возникли какие-либо вопросы, пожалуйста, свяжитесь с нами.</p>
-            </div>
-        </body>
-        </html>
-        """
-
-        msg.set_content(
-            f"Здравствуйте,\n\nВы запросили сброс пароля на платформе Отдела Образовательных Программ.\n\nКод для сброса пароля:\n\nЕсли вы не запрашивали сброс пароля, проигнорируйте это письмо.\n\nС уважением,\nВаш Отдел Образовательных Программ"
-        )
-        msg.add_alternative(html_content, subtype="html")
-
-        with smtplib.SMTP_SSL("smtp.yandex.ru", 465) as smtp:
-            smtp.login(email_address, email_password)
-            smtp.send_message(msg)
@@ -4,6 +4,7 @@ from a8t_tools.db.pagination import Paginated
 
 from app.domain.common.exceptions import NotFoundError
 from app.domain.users.core import schemas
+from app.domain.users.core.cache import UserCache
 from app.domain.users.core.repositories import (
     StaffRepository,
     UpdatePasswordRepository,
@@ -33,15 +34,23 @@ class StaffListQuery:
 
 class UserRetrieveQuery:
     def __init__(
-            self, user_repository: UserRepository
+            self, user_repository: UserRepository, user_cache: UserCache
     ):
         self.user_repository = user_repository
+        self.user_cache = user_cache
 
     async def __call__(self, user_id: UUID) -> schemas.UserInternal:
+        cached = self.user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        generation = self.user_cache.generation
         user_result = await self.user_repository.get_user_by_filter_or_none(
             schemas.UserWhere(id=user_id)
         )
-        return schemas.UserInternal.model_validate(user_result)
+        user = schemas.UserInternal.model_validate(user_result)
+        self.user_cache.set(user_id, user, generation)
+        return user
 
 
 class EmailRetrieveQuery:
@@ -12,6 +12,7 @@ from sqlalchemy.sql.base import ExecutableOption
 from app.domain.common import enums, models
 from app.domain.common.schemas import IdContainer, IdContainerTables
 from app.domain.users.core import schemas
+from app.domain.users.core.cache import UserCache
 from app.domain.users.staff.schemas import (
     StaffDetailsFull,
     StaffInternal,
@@ -43,7 +44,6 @@ class EmailRpository(CrudRepositoryMixin[models.EmailCode]):
                     models.EmailCode.email == email
                 )
                 await session.execute(stmt)
-                await session.commit()
 
     async def code_deletion(self, code: int) -> str:
         async with self.transaction.use() as session:
@@ -63,52 +63,26 @@ class UpdatePasswordRepository(CrudRepositoryMixin[models.PasswordResetCode]):
         self.model = models.PasswordResetCode
         self.transaction = transaction
 
-    async def create_update_password(
-        self, payload: schemas.PasswordResetCode
-    ) -> IdContainerTables:
+    async def create_update_password(self, payload: schemas.PasswordResetCode) -> None:
+        stmt = insert(models.PasswordResetCode).values(
+            {
+                "user_id": payload.user_id,
+                "staff_id": payload.staff_id,
+                "code": payload.code,
+            }
+        )
         async with self.transaction.use() as session:
-            try:
-                staff_query = select(models.Staff).where(
-                    models.Staff.id == payload.user_id
-                )
-                staff_exists = await session.execute(staff_query)
-
-                if staff_exists.first():
-                    stmt = insert(models.PasswordResetCode).values(
-                        {
-                            "staff_id": payload.user_id,
-                            "code": payload.code,
-                        }
-                    )
-                else:
-                    stmt = insert(models.PasswordResetCode).values(
-                        {
-                            "user_id": payload.user_id,
-                            "code": payload.code,
-                        }
-                    )
-
-                await session.execute(stmt)
-
-            except Exception as e:
-                print(f"Error creating code info: {e}")
+            await session.execute(stmt)
 
-    async def delete_code(self, user_id: UUID) -> None:
+    async def delete_code(self, user_id: UUID, kind: enums.PrincipalKinds) -> None:
+        owner_column = (
+            models.PasswordResetCode.staff_id
+            if kind == enums.PrincipalKinds.staff
+            else models.PasswordResetCode.user_id
+        )
         async with self.transaction.use() as session:
-            staff_query = select(models.Staff).where(models.Staff.id == user_id)
-            staff_exists = await session.execute(staff_query)
-
-            if staff_exists.first():
-                stmt = sa.delete(models.PasswordResetCode).where(
-                    models.PasswordResetCode.staff_id == user_id
-                )
-            else:
-                stmt = sa.delete(models.PasswordResetCode).where(
-                    models.PasswordResetCode.user_id == user_id
-                )
-
+            stmt = sa.delete(models.PasswordResetCode).where(owner_column == user_id)
             await session.execute(stmt)
-            await session.commit()
 
     async def get_password_reset_code_by_code_or_none(
         self, where: schemas.PasswordResetCodeWhere
@@ -178,20 +152,34 @@ class UpdatePasswordRepository(CrudRepositoryMixin[models.PasswordResetCode]):
         return and_(*filters)
 
 
-class StaffRepository(CrudRepositoryMixin[models.Staff]):
+class UserCacheEvictionMixin:
+    transaction: AsyncDbTransaction
+    user_cache: UserCache
+
+    async def _evict_cached(self, user_id: UUID) -> None:
+        stmt = self.user_cache.notify_statement(user_id)
+        async with self.transaction.use() as session:
+            if stmt is not None:
+                await session.execute(stmt)
+            self.transaction.on_commit(lambda: self.user_cache.evict(user_id))
+
+
+class StaffRepository(UserCacheEvictionMixin, CrudRepositoryMixin[models.Staff]):
     load_options: list[ExecutableOption] = [
         selectinload(models.Staff.avatar_attachment),
     ]
 
-    def __init__(self, transaction: AsyncDbTransaction):
+    def __init__(self, transaction: AsyncDbTransaction, user_cache: UserCache):
         self.model = models.Staff
         self.transaction = transaction
+        self.user_cache = user_cache
 
     async def create_employee(self, payload: schemas.StaffCreate) -> IdContainer:
         return IdContainer(id=await self._create(payload))
 
     async def delete_staff(self, staff_id: UUID) -> None:
-        return await self._delete(staff_id)
+        await self._delete(staff_id)
+        await self._evict_cached(staff_id)
 
     async def get_employee(
         self,
@@ -217,7 +205,8 @@ class StaffRepository(CrudRepositoryMixin[models.Staff]):
     async def partial_update_staff(
         self, staff_id: UUID, payload: StaffPartialUpdate
     ) -> None:
-        return await self._partial_update(staff_id, payload)
+        await self._partial_update(staff_id, payload)
+        await self._evict_cached(staff_id)
 
     async def get_staff_by_filter_or_none(
         self, where: StaffWhere
@@ -267,14 +256,15 @@ class StaffRepository(CrudRepositoryMixin[models.Staff]):
         return and_(*filters)
 
 
-class UserRepository(CrudRepositoryMixin[models.User]):
+class UserRepository(UserCacheEvictionMixin, CrudRepositoryMixin[models.User]):
     load_options: list[ExecutableOption] = [
         selectinload(models.User.avatar_attachment),
     ]
 
-    def __init__(self, transaction: AsyncDbTransaction):
+    def __init__(self, transaction: AsyncDbTransaction, user_cache: UserCache):
         self.model = models.User
         self.transaction = transaction
+        self.user_cache = user_cache
 
     async def get_users(
         self,
@@ -312,15 +302,16 @@ class UserRepository(CrudRepositoryMixin[models.User]):
     async def partial_update_user(
         self, user_id: UUID, payload: schemas.UserPartialUpdate
     ) -> None:
-        return await self._partial_update(user_id, payload)
+        await self._partial_update(user_id, payload)
+        await self._evict_cached(user_id)
 
     async def delete_user(self, user_id: UUID) -> None:
-        return await self._delete(user_id)
+        await self._delete(user_id)
+        await self._evict_cached(user_id)
 
     async def set_user_status(self, user_id: UUID, status: enums.UserStatuses) -> None:
-        return await self._partial_update(
-            user_id, schemas.UserPartialUpdate(status=status)
-        )
+        await self._partial_update(user_id, schemas.UserPartialUpdate(status=status))
+        await self._evict_cached(user_id)
 
     async def _format_filters(self, where: schemas.UserWhere) -> ColumnElement[bool]:
         filters: list[ColumnElement[bool]] = []
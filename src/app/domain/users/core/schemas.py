@@ -7,7 +7,7 @@ from a8t_tools.db import pagination as pg
 from a8t_tools.db import sorting as sr
 from pydantic import EmailStr
 
-from app.domain.common.enums import UserStatuses
+from app.domain.common.enums import PrincipalKinds, UserStatuses
 from app.domain.common.schemas import APIModel
 from app.domain.storage.attachments.schemas import Attachment
 
@@ -146,6 +146,7 @@ class UserInternal(APIModel):
     avatar_attachment: Attachment | None = None
     status: UserStatuses
     created_at: datetime
+    kind: PrincipalKinds = PrincipalKinds.user
 
 
 class UserSorts(enum.StrEnum):
@@ -1,7 +1,11 @@
+from collections.abc import Mapping
 from uuid import UUID
 
 from a8t_tools.db.pagination import Paginated
 
+from app.domain.users.auth.cache import VerifiedTokenCache
+from app.domain.users.auth.hashing import PasswordHashingExecutor
+from app.domain.users.core.cache import UserCache
 from app.domain.users.core.queries import UserListQuery, UserRetrieveQuery
 from app.domain.users.core.schemas import StaffListRequestSchema, UserDetailsFull
 from app.domain.users.permissions.schemas import BasePermissions
@@ -38,6 +42,30 @@ class UserManagementRetrieveQuery:
         return UserDetailsFull.model_validate(user)
 
 
+class RuntimeStatsQuery:
+    """In-process cache and pool counters of the worker that serves the request."""
+
+    def __init__(
+        self,
+        permission_service: UserPermissionService,
+        token_cache: VerifiedTokenCache,
+        user_cache: UserCache,
+        password_hashing_executor: PasswordHashingExecutor,
+    ) -> None:
+        self.permission_service = permission_service
+        self.token_cache = token_cache
+        self.user_cache = user_cache
+        self.password_hashing_executor = password_hashing_executor
+
+    async def __call__(self) -> dict[str, Mapping[str, float]]:
+        await self.permission_service.assert_permissions(BasePermissions.superuser)
+        return dict(
+            token_cache=self.token_cache.stats(),
+            user_cache=self.user_cache.stats(),
+            password_hashing=self.password_hashing_executor.stats(),
+        )
+
+
 #
 # class EmailManagementRetrieveQuery:
 #     def __init__(
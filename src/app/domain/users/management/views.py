@@ -1,3 +1,29 @@
-from fastapi import APIRouter
+from collections.abc import Mapping
+from contextlib import asynccontextmanager
+
+from a8t_tools.security.tokens import override_user_token
+from dependency_injector import wiring
+from fastapi import APIRouter, Depends, Header
+
+from app.containers import Container
+from app.domain.users.management.queries import RuntimeStatsQuery
 
 router = APIRouter()
+
+
+@asynccontextmanager
+async def user_token(token: str):
+    async with override_user_token(token or ""):
+        yield
+
+
+@router.get("/stats", response_model=None)
+@wiring.inject
+async def get_runtime_stats(
+    token: str = Header(...),
+    query: RuntimeStatsQuery = Depends(
+        wiring.Provide[Container.user.management_stats_query]
+    ),
+) -> dict[str, Mapping[str, float]]:
+    async with user_token(token):
+        return await query()
@@ -1,13 +1,19 @@
 from uuid import UUID
 
+from app.domain.users.auth.identity import RequestIdentityCache
 from app.domain.users.core.queries import UserRetrieveQuery
 from app.domain.users.permissions.schemas import BasePermissions
 
 
 class UserPermissionListQuery:
-    def __init__(self, query: UserRetrieveQuery) -> None:
+    def __init__(
+        self, query: UserRetrieveQuery, identity_cache: RequestIdentityCache
+    ) -> None:
         self.query = query
+        self.identity_cache = identity_cache
 
     async def __call__(self, user_id: UUID) -> set[str]:
-        user = await self.query(user_id)
+        user = await self.identity_cache.get_or_load(
+            f"user:{user_id}", lambda: self.query(user_id)
+        )
         return (user.permissions or set()) | {BasePermissions.superuser}
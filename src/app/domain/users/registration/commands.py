@@ -1,7 +1,9 @@
+from a8t_tools.db.transactions import AsyncDbTransaction
 from a8t_tools.security.hashing import PasswordHashService
 
+from app.domain.common.enums import EmailKinds
 from app.domain.common.models import EmailCode
-from app.domain.notifications.commands import EmailSender
+from app.domain.notifications.commands import EmailOutbox
 from app.domain.users.core import schemas
 from app.domain.users.core.commands import UserCreateCommand
 from app.domain.users.core.repositories import EmailRpository
@@ -18,11 +20,13 @@ from app.domain.users.permissions.schemas import BasePermissions
 class UserEmailVerificationRequestCommand:
     def __init__(
         self,
+        transaction: AsyncDbTransaction,
         repository: EmailRpository,
-        email_notification: EmailSender,
+        email_outbox: EmailOutbox,
     ) -> None:
+        self.transaction = transaction
         self.repository = repository
-        self.email_notification = email_notification
+        self.email_outbox = email_outbox
 
     async def __call__(self, payload: EmailForCode) -> None:
         email = payload.email
@@ -33,9 +37,18 @@ class UserEmailVerificationRequestCommand:
             code=code,
         )
 
-        await self.repository.email_deletion(email)
-        await self.repository.create_code(create_verification_code)
-        await self.email_notification.send_verification_email(email, code)
+        async with self.transaction.use():
+            await self.repository.email_deletion(email)
+            code_id_container = await self.repository.create_code(
+                create_verification_code
+            )
+            await self.email_outbox.enqueue(
+                EmailKinds.email_verification,
+                email,
+                params=dict(code=code),
+                dedupe_key=f"email_verification:{code_id_container.id}",
+            )
+        await self.email_outbox.kick()
 
 
 class UserEmailVerificationConfirmCommand:
@@ -60,25 +73,34 @@ class UserEmailVerificationConfirmCommand:
 class UserRegisterCommand:
     def __init__(
         self,
+        transaction: AsyncDbTransaction,
         create_command: UserCreateCommand,
         password_hash_service: PasswordHashService,
-        email_notification: EmailSender,
+        email_outbox: EmailOutbox,
     ) -> None:
+        self.transaction = transaction
         self.create_command = create_command
         self.password_hash_service = password_hash_service
-        self.email_notification = email_notification
+        self.email_outbox = email_outbox
 
     async def __call__(self, payload: UserCredentialsRegist) -> UserDetails:
-        user_create = await self.create_command(
-            UserCreate(
-                firstname=payload.firstname,
-                lastname=payload.lastname,
-                email=payload.email,
-                password_hash=(await self.password_hash_service.hash(payload.password)),
-                avatar_attachment_id=None,
-                permissions={BasePermissions.user},
+        password_hash = await self.password_hash_service.hash(payload.password)
+        async with self.transaction.use():
+            user_create = await self.create_command(
+                UserCreate(
+                    firstname=payload.firstname,
+                    lastname=payload.lastname,
+                    email=payload.email,
+                    password_hash=password_hash,
+                    avatar_attachment_id=None,
+                    permissions={BasePermissions.user},
+                )
+            )
+            await self.email_outbox.enqueue(
+                EmailKinds.registration,
+                user_create.email,
+                dedupe_key=f"registration:{user_create.id}",
             )
-        )
 
-        await self.email_notification.send_first_registration(user_create.email)
+        await self.email_outbox.kick()
         return user_create
@@ -1,20 +1,14 @@
-import re
-import uuid
-from datetime import datetime
 from uuid import UUID
 
-from a8t_tools.storage.facade import FileStorage
-
 from app.domain.common.exceptions import NotFoundError
-from app.domain.storage.attachments.repositories import AttachmentRepository
-from app.domain.storage.attachments.schemas import (
-    AttachmentCreate,
-    AttachmentCreateFull,
+from app.domain.storage.attachments.schemas import AttachmentCreate
+from app.domain.storage.attachments.services import (
+    AttachmentIngestService,
+    AttachmentOwner,
 )
 from app.domain.users.core.repositories import StaffRepository
 from app.domain.users.staff import schemas
-from app.domain.users.staff.queries import StaffRetrieveQuery
-from app.domain.users.staff.schemas import StaffCreate, StaffPartialUpdate
+from app.domain.users.staff.schemas import StaffCreate
 
 
 class StaffCreateCommand:
@@ -80,70 +74,11 @@ class StaffPartialUpdateCommand:
 
 
 class StaffAvatarCreateCommand:
-    def __init__(
-        self,
-        repository: AttachmentRepository,
-        file_storage: FileStorage,
-        staff_retrieve_by_id_query: StaffRetrieveQuery,
-        staff_partial_update_command: StaffPartialUpdateCommand,
-        bucket: str,
-        max_name_len: int = 60,
-    ):
-        self.repository = repository
-        self.file_storage = file_storage
-        self.staff_retrieve_by_id_query = staff_retrieve_by_id_query
-        self.staff_partial_update_command = staff_partial_update_command
-        self.bucket = bucket
-        self.max_name_len = max_name_len
+    def __init__(self, ingest_service: AttachmentIngestService, owner: AttachmentOwner):
+        self.ingest_service = ingest_service
+        self.owner = owner
 
     async def __call__(
         self, staff_id: UUID, attachment_payload: AttachmentCreate
     ) -> schemas.Attachment:
-        current_staff = await self.staff_retrieve_by_id_query(staff_id)
-
-        name = attachment_payload.name or self._get_random_name()
-        path = self._generate_path(name)
-
-        uri = await self.file_storage.upload_file(
-            self.bucket, path, attachment_payload.file
-        )
-
-        if "/department-of-educational-programs-bucket/" in uri:
-            uri = uri.replace("/department-of-educational-programs-bucket/", "/")
-
-        id_container = await self.repository.create_attachment(
-            AttachmentCreateFull(
-                name=name,
-                path=path,
-                uri=uri,
-            )
-        )
-
-        attachment = await self.repository.get_attachment_or_none(id_container.id)
-        attachment_id = attachment.id
-
-        update_payload = StaffPartialUpdate(avatar_attachment_id=attachment_id)
-
-        await self.staff_partial_update_command(current_staff.id, update_payload)
-
-        assert attachment
-        return attachment
-
-    def _generate_path(self, name: str) -> str:
-        now = datetime.now()
-        folder = now.strftime("%Y/%m/%d")
-        timestamp = now.strftime("%s")
-        stripped_slugified_name = self._slugify(name)[: self.max_name_len]
-        return f"/{folder}/{timestamp}.{stripped_slugified_name}"
-
-    @classmethod
-    def _get_random_name(cls) -> str:
-        return str(uuid.uuid4())
-
-    @classmethod
-    def _slugify(cls, s: str) -> str:
-        s = s.lower().strip()
-        s = re.sub(r"[^\w\s\.-]", "", s)
-        s = re.sub(r"[\s_-]+", "-", s)
-        s = re.sub(r"^-+|-+$", "", s)
-        return s
+        return await self.ingest_service(attachment_payload, self.owner, staff_id)
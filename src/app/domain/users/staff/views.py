@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, Form, Header, UploadFile
 
 from app.api import deps
 from app.containers import Container
+from app.domain.common.pagination import OffsetPaginationResults
 from app.domain.storage.attachments import schemas as AttachmentSchema
 from app.domain.users.core import schemas
 from app.domain.users.management.queries import UserManagementListQuery
@@ -52,7 +53,7 @@ async def get_staff_by_id(
 
 @router.get(
     "/get/list",
-    response_model=pagination.CountPaginationResults[schemas.StaffDetails],
+    response_model=OffsetPaginationResults[schemas.StaffDetails],
 )
 @wiring.inject
 async def get_staff_list(
@@ -70,7 +71,7 @@ async def get_staff_list(
                 sorting.SortOrders.desc,
             )
         ),
-) -> pagination.Paginated[schemas.StaffDetails]:
+) -> OffsetPaginationResults[schemas.StaffDetails]:
     async with user_token(token):
         return await query(
             schemas.StaffListRequestSchema(pagination=pagination, sorting=sorting)
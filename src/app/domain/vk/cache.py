@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import httpx
+from loguru import logger
+
+
+class VkFollowersCache:
+    """Member count of the VK group, kept in memory.
+
+    A value younger than ``ttl_seconds`` is returned as is; an older one is
+    still returned right away while a single background request refreshes
+    it, so only the very first call waits for VK. A failed or slow refresh
+    keeps the last good value and is retried after ``retry_seconds``.
+    Requests go through one pooled ``httpx.AsyncClient``.
+    """
+
+    def __init__(
+        self,
+        api_uri: str,
+        token: str | None,
+        group_id: str | None,
+        version: str,
+        ttl_seconds: float = 300,
+        retry_seconds: float = 30,
+        timeout_seconds: float = 5,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.api_uri = api_uri.rstrip("/")
+        self.token = token
+        self.group_id = group_id
+        self.version = version
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self.timeout_seconds = timeout_seconds
+        self.transport = transport
+        self._count: int | None = None
+        self._expires_at = 0.0
+        self._refresh: asyncio.Task[None] | None = None
+        self._client: httpx.AsyncClient | None = None
+
+    async def get(self) -> int:
+        if self._count is None:
+            self._start_refresh()
+            assert self._refresh is not None
+            await asyncio.shield(self._refresh)
+        elif time.monotonic() >= self._expires_at:
+            self._start_refresh()
+        return self._count or 0
+
+    async def warm_up(self) -> None:
+        self._start_refresh()
+
+    async def refresh(self) -> None:
+        try:
+            count = await self._fetch()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Failed to refresh the VK followers count: {!r}", e)
+            self._expires_at = time.monotonic() + self.retry_seconds
+            return
+        self._count = count
+        self._expires_at = time.monotonic() + self.ttl_seconds
+
+    async def close(self) -> None:
+        if self._refresh is not None:
+            self._refresh.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _start_refresh(self) -> None:
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self.refresh())
+
+    async def _fetch(self) -> int:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_uri,
+                timeout=self.timeout_seconds,
+                transport=self.transport,
+            )
+        response = await self._client.get(
+            "/method/groups.getMembers",
+            params={
+                "group_id": self.group_id,
+                "access_token": self.token,
+                "v": self.version,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        try:
+            return int(data["response"]["count"])
+        except (KeyError, TypeError):
+            raise ValueError(f"Unexpected VK response: {data.get('error', data)}")
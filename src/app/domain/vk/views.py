@@ -1,12 +1,15 @@
 from dependency_injector import wiring
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.domain.vk.commands import get_vk_followers_count
+from app.containers import Container
+from app.domain.vk.cache import VkFollowersCache
 
 router = APIRouter()
 
 
 @router.get("/get", response_model=None)
 @wiring.inject
-async def get_followers_count():
-    return await get_vk_followers_count()
+async def get_followers_count(
+    followers: VkFollowersCache = Depends(wiring.Provide[Container.vk_followers]),
+) -> int:
+    return await followers.get()
@@ -8,6 +8,7 @@ import app
 import app.domain
 from app.api import endpoints, exception_handlers
 from app.api.deps import user_token_dep_factory
+from app.api.middlewares import ResponseCacheMiddleware
 from app.config import Settings
 from app.containers import Container
 
@@ -29,14 +30,25 @@ def create_fastapi_app(project_name: str, version: str, description: str) -> Fas
         version=version,
         description=description,
         docs_url=(config.api.prefix + "/docs") if config.api.show_docs else None,
-        openapi_url=(config.api.prefix + "/openapi.json")
-        if config.api.show_docs
-        else None,
+        openapi_url=(
+            (config.api.prefix + "/openapi.json") if config.api.show_docs else None
+        ),
         container=container,
         dependencies=[Depends(user_token_dep_factory(reusable_oauth2))],
         default_response_class=ORJSONResponse,
     )
 
+    # Serve repeated public reads from memory; added first so CORS wraps it
+    if config.response_cache.enabled:
+        fastapi_app.add_middleware(
+            ResponseCacheMiddleware,
+            cache=container.response_cache(),
+            routes={
+                config.api.prefix + path: scope
+                for path, scope in endpoints.cached_routes.items()
+            },
+        )
+
     # Integrate with Sentry
     if config.sentry.dsn:
         fastapi_app.add_middleware(SentryAsgiMiddleware)
@@ -54,6 +66,35 @@ def create_fastapi_app(project_name: str, version: str, description: str) -> Fas
     # Setup endpoints
     fastapi_app.include_router(endpoints.router, prefix=config.api.prefix)
 
+    # Drop cached users when another worker changes them
+    if config.user_cache.enabled and config.user_cache.broadcast_channel:
+        user_cache = container.user_cache()
+        fastapi_app.add_event_handler("startup", user_cache.start_listener)
+        fastapi_app.add_event_handler("shutdown", user_cache.stop_listener)
+
+    # Drop cached responses when another worker changes their data
+    if config.response_cache.enabled:
+        response_cache = container.response_cache()
+        fastapi_app.add_event_handler("startup", response_cache.start_listener)
+        fastapi_app.add_event_handler("shutdown", response_cache.stop_listener)
+
+    # Flush buffered like counters before the worker exits
+    if config.likes.buffer_enabled and config.likes.flush_on_shutdown:
+        fastapi_app.add_event_handler("shutdown", container.like_counter_buffer().close)
+
+    # Stop the password hashing workers
+    fastapi_app.add_event_handler(
+        "shutdown", container.password_hashing_executor().shutdown
+    )
+
+    # Close pooled SMTP connections
+    fastapi_app.add_event_handler("shutdown", container.mail_transport().close)
+
+    # Load the VK followers count in the background, close its HTTP client
+    vk_followers = container.vk_followers()
+    fastapi_app.add_event_handler("startup", vk_followers.warm_up)
+    fastapi_app.add_event_handler("shutdown", vk_followers.close)
+
     # Setup exception handlers
     for exc, handler in exception_handlers.registry:
         fastapi_app.add_exception_handler(exc, handler)
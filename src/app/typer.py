@@ -1,8 +1,11 @@
 import asyncio
 import functools
+import statistics
+import time
 from collections.abc import Callable
 from typing import Any
 
+import httpx
 import typer
 from a8t_tools.db.exceptions import DatabaseError
 from loguru import logger
@@ -97,3 +100,59 @@ async def create_staff(
 
     except DatabaseError as err:
         logger.warning(f"Employee creation error: {err}")
+
+
+@typer_app.command()
+@async_to_sync
+async def benchmark_login_storm(
+    email: str = typer.Argument(...),
+    password: str = typer.Argument(...),
+    base_url: str = typer.Option("http://localhost:8000"),
+    logins: int = typer.Option(200),
+    concurrency: int = typer.Option(50),
+    probe_interval_ms: int = typer.Option(20),
+) -> None:
+    """Fire concurrent logins and report how much they slow down a read endpoint."""
+    prefix = container.config.api.prefix()
+    login_url = f"{prefix}/authentication/v1/authentication"
+    probe_url = f"{prefix}/projects/v1/get/list"
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses: dict[int, int] = {}
+    latencies: list[float] = []
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+
+        async def login() -> None:
+            async with semaphore:
+                response = await client.post(
+                    login_url, json=dict(email=email, password=password)
+                )
+                statuses[response.status_code] = (
+                    statuses.get(response.status_code, 0) + 1
+                )
+
+        async def probe(done: asyncio.Event) -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get(probe_url)
+                latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(probe_interval_ms / 1000)
+
+        done = asyncio.Event()
+        prober = asyncio.create_task(probe(done))
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    if len(latencies) < 2:
+        logger.warning("Not enough probe samples, increase the number of logins")
+        return
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    logger.info(
+        f"{logins} logins in {elapsed:.2f}s, statuses {statuses}; "
+        f"probe p50={quantiles[49]:.1f}ms p99={quantiles[98]:.1f}ms "
+        f"({len(latencies)} samples)"
+    )
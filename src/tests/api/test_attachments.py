@@ -2,13 +2,29 @@ from unittest import mock
 
 import boto3
 import pytest
+import requests
 from unittest.mock import patch
 from moto import mock_aws
 
+from app.domain.storage.attachments import schemas as attachment_schemas
+from app.domain.storage.attachments.presigned import PresignedStorage
+from app.domain.storage.attachments.uploads import AsyncS3Client
 from app.domain.users.auth import schemas
 from tests import factories, utils
 
 
+@pytest.fixture()
+def presigned_s3(container, monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        boto3.client("s3").create_bucket(Bucket=container.config.storage.default_bucket())
+        storage = PresignedStorage(
+            use_s3=True, s3=AsyncS3Client(), signer=AsyncS3Client(), secret_key="test"
+        )
+        with container.presigned_storage.override(storage):
+            yield storage
+
+
 @utils.async_methods_in_db_transaction
 class TestAttachments:
     @pytest.fixture(autouse=True)
@@ -46,16 +62,42 @@ class TestAttachments:
         factories.AttachmentFactory.create_batch(10)
         response = await self.client.get("/api/storage/v1/attachments/get")
         assert response.status_code == 200, response.json()
-        assert response.json()["count"] == 10
+        assert response.json()["nextCursor"] is None
         assert len(response.json()["items"]) == 10
 
+    async def test_attachments_list_cursor(self):
+        attachments = factories.AttachmentFactory.create_batch(10)
+        url = "/api/storage/v1/attachments/get?sort=created_at&order=desc&limit=4"
+
+        ids, cursor = [], None
+        for _ in range(3):
+            response = await self.client.get(
+                url, params=dict(cursor=cursor) if cursor else None
+            )
+            assert response.status_code == 200, response.json()
+            ids += [item["id"] for item in response.json()["items"]]
+            cursor = response.json()["nextCursor"]
+
+        assert cursor is None
+        assert sorted(ids) == sorted(str(x.id) for x in attachments)
+
+    async def test_attachments_list_cursor_of_other_sorting(self):
+        factories.AttachmentFactory.create_batch(3)
+        response = await self.client.get("/api/storage/v1/attachments/get?limit=2")
+        cursor = response.json()["nextCursor"]
+
+        response = await self.client.get(
+            "/api/storage/v1/attachments/get",
+            params=dict(cursor=cursor, sort="created_at"),
+        )
+        assert response.status_code == 400, response.json()
+
     async def test_attachments_list_sorting(self):
         factories.AttachmentFactory.create_batch(10)
         response = await self.client.get(
             "/api/storage/v1/attachments/get?sort=created_at"
         )
         assert response.status_code == 200, response.json()
-        assert response.json()["count"] == 10
         assert len(response.json()["items"]) == 10
 
     async def test_attachments_list_sorting_unknown_field(self):
@@ -68,3 +110,43 @@ class TestAttachments:
         attachment = factories.AttachmentFactory.create()
         response = await self.client.get(f"/api/storage/v1/attachments/{attachment.id}")
         assert response.status_code == 200, response.json()
+
+    async def test_attachment_data_not_modified(self):
+        attachment = factories.AttachmentFactory.create(content_hash="abc")
+        response = await self.client.get(
+            f"/api/storage/v1/attachments/{attachment.id}/data",
+            headers={"If-None-Match": '"abc"'},
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"abc"'
+        assert response.headers["accept-ranges"] == "bytes"
+
+    async def test_presigned_upload_round_trip(self, token_data_factory, presigned_s3):
+        user = factories.UserFactory.create()
+        tokens: schemas.TokenResponse = await token_data_factory(user)
+        headers = {"token": tokens.access_token}
+
+        response = await self.client.post(
+            "/api/storage/v1/attachments/presigned",
+            json=dict(name="notes.pdf"),
+            headers=headers,
+        )
+        assert response.status_code == 200, response.json()
+        upload = attachment_schemas.PresignedUpload.model_validate(response.json())
+        assert requests.put(upload.upload_url, data=b"notes").status_code == 200
+
+        response = await self.client.post(
+            "/api/storage/v1/attachments/presigned/finalize",
+            json=dict(ticket=upload.ticket),
+            headers=headers,
+        )
+        assert response.status_code == 200, response.json()
+        attachment = attachment_schemas.Attachment.model_validate(response.json())
+        assert attachment.name == "notes.pdf"
+
+        response = await self.client.get(
+            f"/api/storage/v1/attachments/{attachment.id}/presigned"
+        )
+        assert response.status_code == 200, response.json()
+        download = attachment_schemas.PresignedDownload.model_validate(response.json())
+        assert requests.get(download.url).content == b"notes"
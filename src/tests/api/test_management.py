@@ -0,0 +1,34 @@
+import pytest
+
+from app.domain.users.permissions.schemas import BasePermissions
+from tests import factories, utils
+
+
+@utils.async_methods_in_db_transaction
+class TestManagement:
+    @pytest.fixture(autouse=True)
+    def setup(self, client: utils.TestClientSessionExpire) -> None:
+        self.client = client
+
+    async def test_runtime_stats(self, token_data_factory):
+        user = factories.UserFactory.create(permissions={BasePermissions.superuser})
+        tokens = await token_data_factory(user)
+
+        response = await self.client.get(
+            "/api/management/v1/stats", headers={"token": tokens.access_token}
+        )
+
+        assert response.status_code == 200, response.json()
+        assert "hit_ratio" in response.json()["token_cache"]
+        assert "hits" in response.json()["user_cache"]
+        assert response.json()["password_hashing"]["queue_depth"] == 0
+
+    async def test_runtime_stats_need_superuser(self, token_data_factory):
+        user = factories.UserFactory.create()
+        tokens = await token_data_factory(user)
+
+        response = await self.client.get(
+            "/api/management/v1/stats", headers={"token": tokens.access_token}
+        )
+
+        assert response.status_code == 403, response.json()
@@ -32,7 +32,7 @@ class TestProject:
         factories.ProjectFactory.create_batch(10)
         response = await self.client.get("/api/projects/v1/get/list")
         assert response.status_code == 200, response.json()
-        assert response.json()["count"] == 10
+        assert response.json()["nextCursor"] is None
         assert len(response.json()["items"]) == 10
 
     async def test_projects_list_sorting(self):
@@ -41,9 +41,25 @@ class TestProject:
             "/api/projects/v1/get/list?sort=created_at"
         )
         assert response.status_code == 200, response.json()
-        assert response.json()["count"] == 10
+        assert response.json()["nextCursor"] is None
         assert len(response.json()["items"]) == 10
 
+    async def test_projects_list_count_modes(self):
+        factories.ProjectFactory.create_batch(3)
+        url = "/api/projects/v1/get/list?limit=2"
+
+        response = await self.client.get(url)
+        assert response.status_code == 200, response.json()
+        assert response.json()["count"] is None
+        assert response.json()["hasMore"] is True
+
+        response = await self.client.get(url, params=dict(count="exact"))
+        assert response.json()["count"] == 3
+
+        response = await self.client.get(url, params=dict(count="estimated"))
+        assert response.status_code == 200, response.json()
+        assert isinstance(response.json()["count"], int)
+
     async def test_project_details(self):
         project = factories.ProjectFactory.create()
         response = await self.client.get(f"/api/projects/v1/get/{project.id}")
@@ -78,3 +94,42 @@ class TestProject:
             headers={"token": tokens.access_token},
         )
         assert response.status_code == 200, response.json()
+
+    async def test_project_like_toggle(self, token_data_factory, celery_app_mock):
+        user = factories.UserFactory.create()
+        tokens: schemas.TokenResponse = await token_data_factory(user)
+
+        project = factories.ProjectFactory.create(likes=0)
+
+        for expected_likes in (1, 0):
+            response = await self.client.post(
+                "/api/projects/v1/create/like",
+                json=dict(
+                    project_id=str(project.id)
+                ),
+                headers={"token": tokens.access_token},
+            )
+            assert response.status_code == 200, response.json()
+            assert response.json()["likes"] == expected_likes
+
+    async def test_projects_list_liked_flags(self, token_data_factory, celery_app_mock):
+        user = factories.UserFactory.create()
+        tokens: schemas.TokenResponse = await token_data_factory(user)
+
+        liked, other = factories.ProjectFactory.create_batch(2, likes=0)
+        response = await self.client.post(
+            "/api/projects/v1/create/like",
+            json=dict(
+                project_id=str(liked.id)
+            ),
+            headers={"token": tokens.access_token},
+        )
+        assert response.status_code == 200, response.json()
+
+        response = await self.client.get(
+            "/api/projects/v1/get/list",
+            headers={"token": tokens.access_token},
+        )
+        assert response.status_code == 200, response.json()
+        flags = {item["id"]: item["liked"] for item in response.json()["items"]}
+        assert flags == {str(liked.id): True, str(other.id): False}
@@ -1,14 +1,34 @@
+import httpx
 import pytest
 
+from app.domain.vk.cache import VkFollowersCache
 from tests import utils
 
 
+@pytest.fixture()
+def vk_api_mock(container):
+    def handle(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/method/groups.getMembers"
+        return httpx.Response(200, json={"response": {"count": 42}})
+
+    cache = VkFollowersCache(
+        api_uri="https://vk.test",
+        token="token",
+        group_id="1",
+        version="5.199",
+        transport=httpx.MockTransport(handle),
+    )
+    with container.vk_followers.override(cache):
+        yield cache
+
+
 @utils.async_methods_in_db_transaction
 class TestVK:
     @pytest.fixture(autouse=True)
-    def setup(self, client: utils.TestClientSessionExpire) -> None:
+    def setup(self, client: utils.TestClientSessionExpire, vk_api_mock) -> None:
         self.client = client
 
     async def test_vk_subscribes(self):
         response = await self.client.get("/api/vk/v1/get")
         assert response.status_code == 200, response.json()
+        assert response.json() == 42
@@ -1,3 +1,5 @@
+import datetime
+
 import factory
 
 from app.domain.common import enums, models
@@ -80,3 +82,24 @@ class PasswordResetCodeFactory(utils.AsyncSQLAlchemyModelFactory):
 
     class Meta:
         model = models.PasswordResetCode
+
+
+class NewsFactory(utils.AsyncSQLAlchemyModelFactory):
+    name = factory.Faker("sentence")
+    date = factory.Faker("future_datetime", tzinfo=datetime.timezone.utc)
+    description = factory.Faker("text")
+    avatar_attachment = factory.SubFactory(AttachmentFactory)
+
+    class Meta:
+        model = models.News
+
+
+class NewsReminderFactory(utils.AsyncSQLAlchemyModelFactory):
+    news = factory.SubFactory(NewsFactory)
+    user = factory.SubFactory(UserFactory)
+    notify_at = factory.LazyAttribute(
+        lambda o: o.news.date - datetime.timedelta(days=1)
+    )
+
+    class Meta:
+        model = models.NewsReminder
@@ -0,0 +1,158 @@
+import hashlib
+import io
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.containers import Container
+from app.domain.common.exceptions import NotFoundError
+from app.domain.projects.schemas import Like, ProjectAttachment
+from app.domain.storage.attachments.schemas import (
+    AttachmentCreate,
+    AttachmentListRequestSchema,
+)
+from app.domain.storage.attachments.uploads import StreamingUploader, UploadedObject
+from tests import factories, utils
+
+
+async def _upload_object(bucket, path, source, on_progress=None, skip_existing=None):
+    body = source.read()
+    content_hash = hashlib.sha256(body).hexdigest()
+    if skip_existing is not None and await skip_existing(content_hash):
+        return UploadedObject(content_hash, len(body), body=body)
+    return UploadedObject(content_hash, len(body), uri=f"http://test{path}")
+
+
+@pytest.fixture()
+def uploader_mock(container):
+    mock = Mock(StreamingUploader)
+    mock.upload_object = AsyncMock(side_effect=_upload_object)
+    mock.delete = AsyncMock()
+    with container.streaming_uploader.override(mock):
+        yield mock
+
+
+@utils.async_methods_in_db_transaction
+class TestAttachmentIngest:
+    async def test_project_attachment_is_linked(
+        self, container: Container, uploader_mock
+    ):
+        project = factories.ProjectFactory.create()
+
+        attachment = await container.attachment.project_create_attachment_command()(
+            Like(project_id=project.id),
+            AttachmentCreate(name="doc.pdf", file=io.BytesIO(b"data")),
+        )
+
+        assert attachment.name == "doc.pdf"
+        assert attachment.uri == f"http://test{attachment.path}"
+        repository = container.project.project_attachment_repository()
+        attachments = await repository.get_project_attachment(project.id)
+        assert [item.attachment.id for item in attachments.items] == [attachment.id]
+
+    async def test_missing_owner_rolls_back(self, container: Container, uploader_mock):
+        with pytest.raises(NotFoundError):
+            await container.attachment.news_create_command()(
+                Like(news_id=uuid.uuid4()),
+                AttachmentCreate(name="doc.pdf", file=io.BytesIO(b"data")),
+            )
+
+        uploader_mock.delete.assert_awaited_once()
+        attachments = await container.attachment.list_query()(
+            AttachmentListRequestSchema()
+        )
+        assert attachments.items == []
+
+    async def test_same_bytes_share_one_attachment(
+        self, container: Container, uploader_mock
+    ):
+        projects = factories.ProjectFactory.create_batch(2)
+        command = container.attachment.project_create_attachment_command()
+        unlink = container.attachment.project_attachment_unlink_command()
+
+        first = await command(
+            Like(project_id=projects[0].id),
+            AttachmentCreate(name="a.pdf", file=io.BytesIO(b"banner")),
+        )
+        second = await command(
+            Like(project_id=projects[1].id),
+            AttachmentCreate(name="b.pdf", file=io.BytesIO(b"banner")),
+        )
+
+        assert second.id == first.id
+        assert second.name == "b.pdf"
+        uploader_mock.delete.assert_not_awaited()
+
+        await unlink(
+            ProjectAttachment(project_id=projects[0].id, attachment_id=first.id)
+        )
+        uploader_mock.delete.assert_not_awaited()
+
+        await unlink(
+            ProjectAttachment(project_id=projects[1].id, attachment_id=first.id)
+        )
+        uploader_mock.delete.assert_awaited_once_with(
+            container.config.storage.default_bucket(), first.path
+        )
+
+    async def test_replaced_avatar_is_released(
+        self, container: Container, uploader_mock
+    ):
+        project = factories.ProjectFactory.create(avatar_attachment=None)
+        command = container.attachment.project_create_command()
+
+        first = await command(
+            Like(project_id=project.id),
+            AttachmentCreate(name="a.pdf", file=io.BytesIO(b"old")),
+        )
+        await command(
+            Like(project_id=project.id),
+            AttachmentCreate(name="a.pdf", file=io.BytesIO(b"old")),
+        )
+        uploader_mock.delete.assert_not_awaited()
+
+        await command(
+            Like(project_id=project.id),
+            AttachmentCreate(name="b.pdf", file=io.BytesIO(b"new")),
+        )
+
+        uploader_mock.delete.assert_awaited_once_with(
+            container.config.storage.default_bucket(), first.path
+        )
+        assert (
+            await container.attachment.repository().get_attachment_or_none(first.id)
+            is None
+        )
+
+    async def test_batch_upload_reports_each_file(
+        self, container: Container, uploader_mock
+    ):
+        class BrokenFile(io.BytesIO):
+            def read(self, *args):
+                raise ConnectionError("client disconnected")
+
+        project = factories.ProjectFactory.create()
+
+        result = await container.attachment.project_batch_create_attachment_command()(
+            Like(project_id=project.id),
+            [
+                AttachmentCreate(name="a.pdf", file=io.BytesIO(b"same")),
+                AttachmentCreate(name="b.pdf", file=io.BytesIO(b"same")),
+                AttachmentCreate(name="c.pdf", file=io.BytesIO(b"other")),
+                AttachmentCreate(name="d.pdf", file=BrokenFile()),
+            ],
+        )
+
+        first, second, third, broken = result.items
+        assert [x.name for x in result.items] == ["a.pdf", "b.pdf", "c.pdf", "d.pdf"]
+        assert first.attachment.id == second.attachment.id != third.attachment.id
+        assert second.attachment.name == "b.pdf"
+        assert broken.attachment is None and broken.error
+        uploader_mock.delete.assert_awaited_once()
+
+        repository = container.project.project_attachment_repository()
+        linked = await repository.get_project_attachment(project.id)
+        assert sorted(str(x.attachment.id) for x in linked.items) == sorted(
+            str(x.attachment.id) for x in (first, second, third)
+        )
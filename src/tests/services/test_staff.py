@@ -19,4 +19,14 @@ class TestStaff:
     async def test_retrieve(self, container: Container):
         staff = factories.StaffFactory.create()
         results = await container.user.staff_retrieve_by_id_query()(staff.id)
-        assert isinstance(results, StaffInternal)
\ No newline at end of file
+        assert isinstance(results, StaffInternal)
+
+    async def test_access_token_carries_principal_kind(self, container: Container):
+        staff = factories.StaffFactory.create()
+        staff_internal = await container.user.retrieve_by_email_query()(staff.email)
+        tokens = await container.user.token_create_command()(staff_internal)
+
+        payload = await container.user.token_payload_query()(tokens.access_token)
+
+        assert payload.sub == staff.id
+        assert payload.kind == enums.PrincipalKinds.staff
@@ -1,3 +1,5 @@
+from a8t_tools.db.transactions import _on_commit_registry
+
 from app.containers import Container
 from app.domain.common import enums
 from app.domain.users.core import schemas
@@ -31,6 +33,11 @@ class TestUsers:
             )
         )
 
+        # The activation waits for the commit, which these tests roll back
+        celery_app_mock.send_task.assert_not_called()
+        (enqueue_activation,) = _on_commit_registry.get([])
+        await enqueue_activation()
+
         celery_app_mock.send_task.assert_called_once_with(
             enums.TaskNames.activate_user,
             args=(),
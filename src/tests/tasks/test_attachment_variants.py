@@ -0,0 +1,84 @@
+import io
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from a8t_tools.storage.facade import FileStorage
+from PIL import Image
+
+from app.containers import Container
+from app.domain.common.enums import ResponseCacheScopes
+from app.domain.storage.attachments.tasks import generate_attachment_variants
+from app.domain.storage.attachments.uploads import StreamingUploader, UploadedObject
+from tests import factories, utils
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "teal").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture()
+def storage_mock(container):
+    mock = Mock(FileStorage)
+
+    @asynccontextmanager
+    async def receive_file(bucket, path):
+        yield io.BytesIO(_png(600, 400))
+
+    mock.receive_file = receive_file
+    with container.file_storage.override(mock):
+        yield mock
+
+
+@pytest.fixture()
+def uploader_mock(container):
+    async def upload_object(bucket, path, source, **kwargs):
+        return UploadedObject("", len(source.read()), uri=f"http://test{path}")
+
+    mock = Mock(StreamingUploader)
+    mock.upload_object = AsyncMock(side_effect=upload_object)
+    with container.streaming_uploader.override(mock):
+        yield mock
+
+
+@utils.async_methods_in_db_transaction
+class TestAttachmentVariants:
+    async def test_variants_are_generated_once(
+        self, container: Container, storage_mock, uploader_mock
+    ):
+        attachment = factories.AttachmentFactory.create(
+            name="cover.png", path="/cover.png"
+        )
+
+        await generate_attachment_variants(dict(id=attachment.id))
+        await generate_attachment_variants(dict(id=attachment.id))
+
+        stored = await container.attachment.repository().get_attachment_or_none(
+            attachment.id
+        )
+        assert [(x.size, x.width, x.height) for x in stored.variants] == [
+            (160, 160, 107),
+            (480, 480, 320),
+        ]
+        assert stored.variants[0].uri == "http://test/cover.png.160.webp"
+        assert stored.preview.size == 480
+        assert uploader_mock.upload_object.await_count == 2
+
+    async def test_owner_scope_is_invalidated(
+        self, container: Container, storage_mock, uploader_mock
+    ):
+        project = factories.ProjectFactory.create()
+        cache = container.response_cache()
+        versions = {scope: cache.version(scope) for scope in ResponseCacheScopes}
+
+        await generate_attachment_variants(dict(id=project.avatar_attachment.id))
+
+        assert {
+            scope: cache.version(scope) - version for scope, version in versions.items()
+        } == {
+            ResponseCacheScopes.projects: 1,
+            ResponseCacheScopes.news: 0,
+            ResponseCacheScopes.clips: 0,
+        }
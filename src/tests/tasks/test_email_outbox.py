@@ -0,0 +1,66 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy import select
+
+from app.containers import Container
+from app.domain.common import enums, models
+from app.domain.notifications.tasks import drain_email_outbox
+from app.domain.notifications.transport import SmtpConnectionPool
+from tests import utils
+
+
+@pytest.fixture()
+def transport_mock(container):
+    async def send(message):
+        if message["To"] == "broken@mail.ru":
+            raise ConnectionError()
+
+    mock = Mock(SmtpConnectionPool)
+    mock.send = AsyncMock(side_effect=send)
+    with container.mail_transport.override(mock):
+        yield mock
+
+
+@utils.async_methods_in_db_transaction
+class TestEmailOutbox:
+    async def test_enqueue_dedupes(self, container: Container, transport_mock):
+        outbox = container.user.email_outbox()
+        for _ in range(2):
+            await outbox.enqueue(
+                enums.EmailKinds.registration, "test@mail.ru", dedupe_key="same"
+            )
+
+        await drain_email_outbox()
+
+        assert transport_mock.send.await_count == 1
+
+    async def test_failed_message_is_retried_later(
+        self, container: Container, transport_mock
+    ):
+        outbox = container.user.email_outbox()
+        for email in ("test@mail.ru", "broken@mail.ru"):
+            await outbox.enqueue(
+                enums.EmailKinds.password_reset, email, params=dict(code="123456")
+            )
+
+        assert await container.user.email_outbox_drain_command()() == 1
+        # The failed one waits for its backoff, the sent one is done
+        assert await container.user.email_outbox_drain_command()() == 0
+        assert transport_mock.send.await_count == 2
+
+    async def test_sent_message_drops_its_params(
+        self, container: Container, transport_mock
+    ):
+        outbox = container.user.email_outbox()
+        await outbox.enqueue(
+            enums.EmailKinds.password_reset, "test@mail.ru", params=dict(code="1")
+        )
+
+        assert await container.user.email_outbox_drain_command()() == 1
+
+        async with self.db_transaction.use() as session:
+            query = select(models.EmailOutbox).execution_options(populate_existing=True)
+            item = (await session.execute(query)).scalar_one()
+        assert item.status == enums.EmailOutboxStatuses.sent
+        assert item.params == {}
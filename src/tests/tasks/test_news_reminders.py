@@ -0,0 +1,92 @@
+import datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy import select
+
+from app.containers import Container
+from app.domain.common import enums, models
+from app.domain.news.schemas import NewsPartialUpdate, ReminderGroup
+from app.domain.news.tasks import send_due_reminders, send_reminder_group
+from app.domain.notifications.transport import SmtpConnectionPool
+from tests import factories, utils
+
+
+@pytest.fixture()
+def transport_mock(container):
+    async def send(message):
+        if message["To"] == "broken@mail.ru":
+            raise ConnectionError()
+
+    mock = Mock(SmtpConnectionPool)
+    mock.send = AsyncMock(side_effect=send)
+    with container.mail_transport.override(mock):
+        yield mock
+
+
+@utils.async_methods_in_db_transaction
+class TestNewsReminders:
+    async def test_one_job_per_group_while_in_flight(
+        self, container: Container, celery_app_mock
+    ):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        news = factories.NewsFactory.create()
+        notify_at = now - datetime.timedelta(minutes=1)
+        factories.NewsReminderFactory.create_batch(3, news=news, notify_at=notify_at)
+        factories.NewsReminderFactory.create(notify_at=now + datetime.timedelta(days=1))
+
+        await send_due_reminders()
+        await send_due_reminders()
+
+        group = ReminderGroup(news_id=news.id, notify_at=notify_at)
+        celery_app_mock.send_task.assert_called_once_with(
+            enums.TaskNames.send_reminder_group,
+            args=(),
+            kwargs=dict(group_dict=group.json_dict()),
+            queue=enums.TaskQueues.main_queue,
+        )
+
+    async def test_group_is_sent_once_and_failures_are_retried(
+        self, container: Container, celery_app_mock, transport_mock
+    ):
+        news = factories.NewsFactory.create()
+        notify_at = datetime.datetime.now(datetime.timezone.utc)
+        factories.NewsReminderFactory.create_batch(2, news=news, notify_at=notify_at)
+        factories.NewsReminderFactory.create(
+            news=news, notify_at=notify_at, user__email="broken@mail.ru"
+        )
+        group_dict = ReminderGroup(news_id=news.id, notify_at=notify_at).json_dict()
+
+        await send_reminder_group(group_dict)
+        await send_reminder_group(group_dict)
+
+        assert transport_mock.send.await_count == 3
+        queued = await container.user.email_outbox_repository().claim_due(
+            10, datetime.timedelta(minutes=5)
+        )
+        assert [x.recipient for x in queued] == ["broken@mail.ru"]
+
+    async def test_new_date_moves_pending_reminders(self, container: Container):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        news = factories.NewsFactory.create()
+        pending = factories.NewsReminderFactory.create(news=news)
+        sent = factories.NewsReminderFactory.create(news=news, sent_at=now)
+        old_notify_at = sent.notify_at
+        date = now + datetime.timedelta(days=10)
+
+        await container.news.news_partial_update_command()(
+            news.id, NewsPartialUpdate(date=date)
+        )
+
+        async with self.db_transaction.use() as session:
+            query = select(models.NewsReminder.id, models.NewsReminder.notify_at).where(
+                models.NewsReminder.news_id == news.id
+            )
+            notify_at = dict((await session.execute(query)).all())
+        lead_time = datetime.timedelta(
+            hours=container.config.news.reminder_lead_hours()
+        )
+        assert notify_at == {
+            pending.id: date - lead_time,
+            sent.id: old_notify_at,
+        }
@@ -0,0 +1,100 @@
+import boto3
+import pytest
+from moto import mock_aws
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.domain.storage.attachments.downloads import (
+    ObjectReader,
+    ObjectResponse,
+    RangeNotSatisfiableError,
+    etag_matches,
+    resolve_range,
+    single_range,
+)
+from app.domain.storage.attachments.uploads import AsyncS3Client
+
+DATA = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="bucket")
+        client.put_object(Bucket="bucket", Key="/clip.mp4", Body=DATA)
+        yield client
+
+
+async def _read(body) -> bytes:
+    return b"".join([chunk async for chunk in body.chunks])
+
+
+class TestRanges:
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("bytes=0-9", (0, 9)),
+            ("bytes=1000-", (1000, 1023)),
+            ("bytes=-24", (1000, 1023)),
+            ("bytes=1000-5000", (1000, 1023)),
+        ],
+    )
+    def test_resolve(self, header, expected):
+        assert resolve_range(header, len(DATA)) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=1024-", "bytes=9-3", "bytes=-0"])
+    def test_not_satisfiable(self, header):
+        with pytest.raises(RangeNotSatisfiableError):
+            resolve_range(header, len(DATA))
+
+    @pytest.mark.parametrize("header", ["bytes=0-1,5-6", "items=0-1", "bytes=-"])
+    def test_unsupported_ranges_are_ignored(self, header):
+        assert single_range(header) is None
+
+    def test_etag_matches(self):
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert not etag_matches('W/"b"', '"b"', weak=False)
+        assert etag_matches("*", '"c"')
+
+
+class TestObjectReader:
+    async def test_s3_ranged_get(self, s3):
+        reader = ObjectReader(use_s3=True, s3=AsyncS3Client())
+
+        body = await reader.open("bucket", "/clip.mp4", "bytes=10-19")
+
+        assert body.partial
+        assert body.content_range == f"bytes 10-19/{len(DATA)}"
+        assert await _read(body) == DATA[10:20]
+
+    async def test_s3_invalid_range(self, s3):
+        reader = ObjectReader(use_s3=True, s3=AsyncS3Client())
+
+        with pytest.raises(RangeNotSatisfiableError) as e:
+            await reader.open("bucket", "/clip.mp4", "bytes=5000-")
+        assert e.value.size == len(DATA)
+
+    def test_local_file_response(self, tmp_path):
+        (tmp_path / "bucket").mkdir()
+        (tmp_path / "bucket" / "doc.pdf").write_bytes(DATA)
+        reader = ObjectReader(
+            use_s3=False, s3=AsyncS3Client(), local_base_path=str(tmp_path)
+        )
+
+        async def endpoint(request):
+            body = await reader.open("bucket", "/doc.pdf", request.headers.get("range"))
+            return ObjectResponse(body, media_type="application/pdf")
+
+        client = TestClient(Starlette(routes=[Route("/", endpoint)]))
+
+        partial = client.get("/", headers={"Range": "bytes=-100"})
+        assert partial.status_code == 206
+        assert partial.headers["content-range"] == f"bytes 924-1023/{len(DATA)}"
+        assert partial.content == DATA[-100:]
+
+        full = client.get("/")
+        assert full.status_code == 200
+        assert full.content == DATA
@@ -0,0 +1,41 @@
+from uuid import uuid4
+
+from app.domain.common.cache import TTLCache
+from app.domain.users.core.cache import UserCache
+
+
+class TestTTLCache:
+    def test_lru_eviction_and_counters(self):
+        cache: TTLCache[int] = TTLCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "size": 2}
+
+    def test_expired_entries_are_misses(self):
+        cache: TTLCache[int] = TTLCache(ttl=60)
+        cache.set("a", 1, ttl=0)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestUserCache:
+    def test_record_loaded_before_eviction_is_not_stored(self):
+        cache = UserCache()
+        user_id = uuid4()
+        user = object()
+
+        generation = cache.generation
+        cache.evict(user_id)
+        cache.set(user_id, user, generation)  # type: ignore [arg-type]
+        assert cache.get(user_id) is None
+
+        cache.set(user_id, user, cache.generation)  # type: ignore [arg-type]
+        assert cache.get(user_id) is user
@@ -0,0 +1,34 @@
+from app.domain.common.enums import EmailKinds
+from app.domain.notifications.templates import CompiledTemplate, EmailTemplates
+
+
+class TestEmailTemplates:
+    def test_compiled_template(self):
+        template = CompiledTemplate("$$${x} and $y", escape=str.upper)
+
+        assert template.fields == {"x", "y"}
+        assert template.render(dict(x="a", y="b")) == "$A and B"
+
+    def test_render_escapes_html_only(self):
+        templates = EmailTemplates.from_directory()
+        params = dict(name="<News>", description="Tom & Jerry")
+
+        message = templates.render(
+            EmailKinds.news_reminder, "noreply@mail.ru", "test@mail.ru", params
+        )
+
+        assert message["To"] == "test@mail.ru"
+        assert "<News>" in message["Subject"]
+        assert "<News>" in message.get_body(("plain",)).get_content()
+        assert "&lt;News&gt;" in message.get_body(("html",)).get_content()
+
+    def test_body_parts_are_shared_between_recipients(self):
+        templates = EmailTemplates.from_directory()
+
+        first, second = (
+            templates.render(EmailKinds.password_reset, "a@mail.ru", to, dict(code=1))
+            for to in ("b@mail.ru", "c@mail.ru")
+        )
+
+        assert first.get_payload()[0] is second.get_payload()[0]
+        assert first["To"] != second["To"]
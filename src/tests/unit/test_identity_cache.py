@@ -0,0 +1,26 @@
+from contextvars import ContextVar
+
+from app.domain.users.auth.identity import RequestIdentityCache
+
+
+class TestRequestIdentityCache:
+    async def test_loads_once_per_token(self):
+        token_ctx_var: ContextVar[str | None] = ContextVar("token", default=None)
+        cache = RequestIdentityCache(token_ctx_var)
+        calls: list[str | None] = []
+
+        async def loader() -> str | None:
+            calls.append(token_ctx_var.get())
+            return token_ctx_var.get()
+
+        token_ctx_var.set("first")
+        assert await cache.get_or_load("user", loader) == "first"
+        assert await cache.get_or_load("user", loader) == "first"
+
+        token_ctx_var.set("second")
+        assert await cache.get_or_load("user", loader) == "second"
+
+        cache.invalidate()
+        assert await cache.get_or_load("user", loader) == "second"
+
+        assert calls == ["first", "second", "second"]
@@ -0,0 +1,112 @@
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import literal
+
+from app.domain.common import models
+from app.domain.common.counters import LikeCounterBuffer
+from app.domain.common.repositories import LikeRepositoryMixin
+
+
+class _Item:
+    def __init__(self, id_: int, likes: int) -> None:
+        self.id = id_
+        self.likes = likes
+
+
+class _Transaction:
+    """Runs ``on_commit`` callbacks when the outermost ``use()`` exits cleanly."""
+
+    def __init__(self, row: SimpleNamespace) -> None:
+        self.row = row
+        self.callbacks: list = []
+        self.depth = 0
+
+    @contextlib.asynccontextmanager
+    async def use(self):
+        self.depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.callbacks = []
+            raise
+        finally:
+            self.depth -= 1
+        if not self.depth:
+            callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                callback()
+
+    def on_commit(self, callback) -> None:
+        self.callbacks.append(callback)
+
+    async def execute(self, stmt):
+        return SimpleNamespace(one_or_none=lambda: self.row)
+
+
+class _ClipLikes(LikeRepositoryMixin):
+    like_model = models.ClipLike
+    target_model = models.Clip
+    target_field = "clip_id"
+
+    def __init__(
+        self, transaction: _Transaction, counter_buffer: LikeCounterBuffer
+    ) -> None:
+        self.transaction = transaction  # type: ignore [assignment]
+        self.counter_buffer = counter_buffer
+
+
+class TestLikeCounterBuffer:
+    async def test_pending_deltas_are_merged(self):
+        buffer = LikeCounterBuffer(transaction=None, enabled=True)  # type: ignore [arg-type]
+        buffer._ensure_flusher = lambda: None  # type: ignore [method-assign]
+
+        buffer.add(models.Clip, 1, 1)
+        buffer.add(models.Clip, 1, 1)
+        buffer.add(models.Clip, 2, -1)
+
+        items = [_Item(1, 10), _Item(2, 5), _Item(3, 0)]
+        buffer.merge(models.Clip, items)
+
+        assert [item.likes for item in items] == [12, 4, 0]
+        assert buffer.pending(models.News, 1) == 0
+
+    async def test_disabled_buffer_does_not_merge(self):
+        buffer = LikeCounterBuffer(transaction=None)  # type: ignore [arg-type]
+        items = [_Item(1, 10)]
+
+        buffer.merge(models.Clip, items)
+
+        assert items[0].likes == 10
+
+
+class TestBufferedApplyDelta:
+    @pytest.fixture
+    def buffer(self) -> LikeCounterBuffer:
+        buffer = LikeCounterBuffer(transaction=None, enabled=True)  # type: ignore [arg-type]
+        buffer._ensure_flusher = lambda: None  # type: ignore [method-assign]
+        buffer.add(models.Clip, 1, 2)
+        return buffer
+
+    async def test_returns_counter_with_own_and_pending_deltas(self, buffer):
+        transaction = _Transaction(SimpleNamespace(likes=10, delta=1))
+        repository = _ClipLikes(transaction, buffer)
+
+        async with transaction.use():
+            likes = await repository._apply_delta(1, literal(1))
+            assert buffer.pending(models.Clip, 1) == 2
+
+        assert likes == 13
+        assert buffer.pending(models.Clip, 1) == 3
+
+    async def test_rolled_back_delta_is_not_buffered(self, buffer):
+        transaction = _Transaction(SimpleNamespace(likes=10, delta=-1))
+        repository = _ClipLikes(transaction, buffer)
+
+        with pytest.raises(RuntimeError):
+            async with transaction.use():
+                await repository._apply_delta(1, literal(-1))
+                raise RuntimeError
+
+        assert buffer.pending(models.Clip, 1) == 2
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+
+from app.domain.common.exceptions import ServiceBusyError
+from app.domain.users.auth.hashing import (
+    OffloadedPasswordHashService,
+    PasswordHashingExecutor,
+)
+
+
+class TestPasswordHashing:
+    async def test_hash_and_verify_run_in_pool(self):
+        executor = PasswordHashingExecutor(pool_size=2)
+        service = OffloadedPasswordHashService(
+            pwd_context=CryptContext(schemes=["bcrypt"], bcrypt__rounds=4),
+            executor=executor,
+        )
+
+        password_hash = await service.hash("secret")
+
+        assert await service.verify("secret", password_hash)
+        assert not await service.verify("other", password_hash)
+        assert executor.pending == 0
+        executor.shutdown()
+
+    async def test_rejects_when_saturated(self):
+        executor = PasswordHashingExecutor(pool_size=1, max_pending=1)
+        release = threading.Event()
+        blocked = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceBusyError):
+            await executor.run(lambda: None)
+        assert executor.stats() == {"pending": 1, "queue_depth": 0, "rejected": 1}
+
+        release.set()
+        assert await blocked
+        assert executor.rejected == 1
+        executor.shutdown()
@@ -0,0 +1,80 @@
+import uuid
+
+import boto3
+import pytest
+import requests
+from moto import mock_aws
+
+from app.domain.common.exceptions import AuthError, NotFoundError, UnsupportedError
+from app.domain.storage.attachments.presigned import (
+    PresignedStorage,
+    content_disposition,
+)
+from app.domain.storage.attachments.uploads import AsyncS3Client
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="bucket")
+        yield client
+
+
+def _storage(use_s3: bool = True, expires_in: int = 60) -> PresignedStorage:
+    return PresignedStorage(
+        use_s3=use_s3,
+        s3=AsyncS3Client(),
+        signer=AsyncS3Client(),
+        secret_key="secret",
+        expires_in=expires_in,
+    )
+
+
+class TestPresignedStorage:
+    async def test_upload_and_download_bypass_the_app(self, s3):
+        storage = _storage()
+
+        upload_url = await storage.upload_url("bucket", "/doc.pdf", "application/pdf")
+        response = requests.put(
+            upload_url, data=b"data", headers={"Content-Type": "application/pdf"}
+        )
+        assert response.status_code == 200
+        assert await storage.object_size("bucket", "/doc.pdf") == 4
+
+        download_url = await storage.download_url("bucket", "/doc.pdf", "doc.pdf")
+        assert requests.get(download_url).content == b"data"
+
+    async def test_missing_upload(self, s3):
+        with pytest.raises(NotFoundError):
+            await _storage().object_size("bucket", "/missing.pdf")
+
+    async def test_needs_s3(self):
+        with pytest.raises(UnsupportedError):
+            await _storage(use_s3=False).upload_url("bucket", "/doc.pdf")
+
+    def test_ticket_is_bound_to_principal(self):
+        storage = _storage()
+        principal_id = uuid.uuid4()
+        ticket = storage.issue_ticket("/doc.pdf", "doc.pdf", principal_id)
+
+        assert storage.read_ticket(ticket, principal_id) == ("/doc.pdf", "doc.pdf")
+        with pytest.raises(AuthError):
+            storage.read_ticket(ticket, uuid.uuid4())
+        with pytest.raises(AuthError):
+            storage.read_ticket(ticket + "x", principal_id)
+
+    def test_expired_ticket(self):
+        storage = _storage(expires_in=-60)
+        principal_id = uuid.uuid4()
+        ticket = storage.issue_ticket("/doc.pdf", "doc.pdf", principal_id)
+
+        with pytest.raises(AuthError):
+            storage.read_ticket(ticket, principal_id)
+
+    def test_content_disposition_escapes_the_name(self):
+        assert content_disposition('Отчёт "итог".pdf') == (
+            'inline; filename="_____ ______.pdf"; '
+            "filename*=UTF-8''%D0%9E%D1%82%D1%87%D1%91%D1%82%20%22%D0%B8%D1%82%D0%BE%D0%B3%22.pdf"
+        )
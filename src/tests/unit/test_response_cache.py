@@ -0,0 +1,104 @@
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from app.api.middlewares import ResponseCacheMiddleware
+from app.domain.common.enums import ResponseCacheScopes
+from app.domain.common.response_cache import ResponseCache
+
+
+class CountingApp:
+    """Tiny app whose handlers count how often they really run."""
+
+    def __init__(self, cache: ResponseCache) -> None:
+        self.calls = 0
+        self.items = ["first"]
+        app = Starlette(
+            routes=[
+                Route("/news/get/list", self.news_list),
+                Route("/news/get/broken", self.broken),
+                Route("/staff/get/list", self.news_list),
+            ]
+        )
+        self.asgi = ResponseCacheMiddleware(
+            app, cache=cache, routes={"/news/get": ResponseCacheScopes.news}
+        )
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.asgi), base_url="http://test"
+        )
+
+    async def news_list(self, request: Request) -> JSONResponse:
+        self.calls += 1
+        return JSONResponse({"items": self.items})
+
+    async def broken(self, request: Request) -> PlainTextResponse:
+        self.calls += 1
+        return PlainTextResponse("nope", status_code=500)
+
+
+def make_cache(**kwargs) -> ResponseCache:
+    return ResponseCache(transaction=None, **kwargs)  # type: ignore[arg-type]
+
+
+class TestResponseCacheMiddleware:
+    async def test_repeated_get_is_served_from_cache(self):
+        app = CountingApp(make_cache())
+
+        first = await app.client.get("/news/get/list?limit=10")
+        second = await app.client.get("/news/get/list?limit=10")
+
+        assert app.calls == 1
+        assert second.json() == first.json() == {"items": ["first"]}
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["cache-control"] == "no-cache"
+
+    async def test_matching_etag_gets_not_modified(self):
+        app = CountingApp(make_cache())
+        etag = (await app.client.get("/news/get/list")).headers["etag"]
+
+        response = await app.client.get(
+            "/news/get/list", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert app.calls == 1
+
+    async def test_invalidated_scope_is_rendered_again(self):
+        cache = make_cache()
+        app = CountingApp(cache)
+        etag = (await app.client.get("/news/get/list")).headers["etag"]
+
+        app.items = ["first", "second"]
+        await cache.invalidate(ResponseCacheScopes.news)
+        response = await app.client.get(
+            "/news/get/list", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"items": ["first", "second"]}
+        assert response.headers["etag"] != etag
+        assert app.calls == 2
+
+    async def test_authenticated_callers_pass_through(self):
+        app = CountingApp(make_cache())
+
+        await app.client.get("/news/get/list")
+        for token in ("a", "a"):
+            response = await app.client.get("/news/get/list", headers={"Token": token})
+
+        assert app.calls == 3
+        assert "etag" not in response.headers
+
+    async def test_other_responses_pass_through(self):
+        app = CountingApp(make_cache())
+
+        for _ in range(2):
+            assert (await app.client.get("/news/get/broken")).status_code == 500
+            await app.client.get("/staff/get/list")
+            await app.client.post("/news/get/list")
+
+        assert app.calls == 4
@@ -0,0 +1,84 @@
+import socket
+from email.message import EmailMessage
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.domain.notifications.transport import SmtpConnectionPool
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.messages: list[bytes] = []
+        self.sessions: set[int] = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        self.messages.append(envelope.content)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+def make_message(subject: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = "noreply@example.com"
+    message["To"] = "user@example.com"
+    message.set_content("Hello")
+    return message
+
+
+def make_pool(controller: Controller, **kwargs) -> SmtpConnectionPool:
+    return SmtpConnectionPool(
+        hostname=controller.hostname,
+        port=controller.port,
+        use_tls=False,
+        **kwargs,
+    )
+
+
+class TestSmtpConnectionPool:
+    async def test_reuses_connection(self, smtp_server):
+        pool = make_pool(smtp_server)
+
+        await pool.send(make_message("first"))
+        await pool.send(make_message("second"))
+        await pool.close()
+
+        assert len(smtp_server.handler.messages) == 2
+        assert len(smtp_server.handler.sessions) == 1
+
+    async def test_reconnects_after_disconnect(self, smtp_server):
+        pool = make_pool(smtp_server)
+        await pool.send(make_message("first"))
+        client, _ = pool._idle[0]
+        client.close()
+
+        await pool.send(make_message("second"))
+        await pool.close()
+
+        assert len(smtp_server.handler.messages) == 2
+        assert len(smtp_server.handler.sessions) == 2
+
+    async def test_replaces_idle_connection(self, smtp_server):
+        pool = make_pool(smtp_server, idle_timeout=0)
+
+        await pool.send(make_message("first"))
+        await pool.send(make_message("second"))
+        await pool.close()
+
+        assert len(smtp_server.handler.sessions) == 2
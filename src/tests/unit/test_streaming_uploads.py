@@ -0,0 +1,92 @@
+import hashlib
+import io
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from app.domain.storage.attachments.uploads import MIN_PART_SIZE, StreamingUploader
+
+
+async def _chunks(total: int, fail_after: int | None = None):
+    sent = 0
+    while sent < total:
+        if fail_after is not None and sent >= fail_after:
+            raise ConnectionError("client disconnected")
+        chunk = b"x" * min(1024 * 1024, total - sent)
+        sent += len(chunk)
+        yield chunk
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="bucket")
+        yield client
+
+
+def _uploader() -> StreamingUploader:
+    return StreamingUploader(
+        file_storage=None,  # type: ignore [arg-type]
+        use_s3=True,
+        access_key_id="test",
+        secret_access_key="test",
+        public_storage_uri="https://storage.test",
+        part_size=MIN_PART_SIZE,
+        max_in_flight=2,
+    )
+
+
+class TestStreamingUploader:
+    async def test_large_body_is_sent_in_parts(self, s3):
+        progress: list[int] = []
+        total = 2 * MIN_PART_SIZE + 123
+
+        uri = await _uploader().upload(
+            "bucket", "/2024/01/01/clip.mp4", _chunks(total), progress.append
+        )
+
+        head = s3.head_object(Bucket="bucket", Key="/2024/01/01/clip.mp4")
+        assert head["ContentLength"] == total
+        assert head["ETag"].strip('"').endswith("-3")
+        assert progress[-1] == total
+        assert uri == "https://storage.test/bucket/2024/01/01/clip.mp4"
+
+    async def test_disconnect_aborts_multipart_upload(self, s3):
+        with pytest.raises(ConnectionError):
+            await _uploader().upload(
+                "bucket",
+                "/clip.mp4",
+                _chunks(3 * MIN_PART_SIZE, fail_after=MIN_PART_SIZE),
+            )
+
+        assert "Uploads" not in s3.list_multipart_uploads(Bucket="bucket")
+        assert "Contents" not in s3.list_objects_v2(Bucket="bucket")
+
+    async def test_known_small_body_is_not_sent(self, s3):
+        digest = hashlib.sha256(b"data").hexdigest()
+
+        async def exists(content_hash: str) -> bool:
+            return content_hash == digest
+
+        uploaded = await _uploader().upload_object(
+            "bucket", "/doc.pdf", io.BytesIO(b"data"), skip_existing=exists
+        )
+
+        assert uploaded.content_hash == digest
+        assert not uploaded.stored
+        assert uploaded.body == b"data"
+        assert "Contents" not in s3.list_objects_v2(Bucket="bucket")
+
+    async def test_large_body_is_hashed_while_streaming(self, s3):
+        total = MIN_PART_SIZE + 10
+
+        uploaded = await _uploader().upload_object(
+            "bucket", "/clip.mp4", _chunks(total)
+        )
+
+        assert uploaded.content_hash == hashlib.sha256(b"x" * total).hexdigest()
+        assert uploaded.size == total
+        assert uploaded.stored
@@ -0,0 +1,44 @@
+import time
+import uuid
+
+from app.domain.users.auth.cache import VerifiedTokenCache
+from app.domain.users.auth.queries import TokenPayloadQuery
+
+
+class _JwtService:
+    def __init__(self, exp: float) -> None:
+        self.exp = exp
+        self.calls = 0
+        self.sub = str(uuid.uuid4())
+
+    async def decode(self, token: str, validate: bool = True) -> dict:
+        self.calls += 1
+        return {"sub": self.sub, "kind": "user", "exp": self.exp}
+
+
+class TestVerifiedTokenCache:
+    async def test_repeated_token_skips_verification(self):
+        jwt_service = _JwtService(exp=time.time() + 60)
+        cache = VerifiedTokenCache()
+        query = TokenPayloadQuery(jwt_service=jwt_service, token_cache=cache)  # type: ignore [arg-type]
+
+        first = await query("token")
+        second = await query("token")
+        await query("token", validate=False)
+
+        assert first == second
+        assert jwt_service.calls == 2
+        stats = cache.stats()
+        assert stats["hit_ratio"] == 0.5
+        assert stats["verifications"] == 1
+
+    async def test_expired_tokens_are_not_cached(self):
+        jwt_service = _JwtService(exp=time.time() - 1)
+        cache = VerifiedTokenCache()
+        query = TokenPayloadQuery(jwt_service=jwt_service, token_cache=cache)  # type: ignore [arg-type]
+
+        await query("token")
+        await query("token")
+
+        assert jwt_service.calls == 2
+        assert len(cache.records) == 0
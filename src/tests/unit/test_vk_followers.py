@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+
+from app.domain.vk.cache import VkFollowersCache
+
+
+class FakeVkApi:
+    """Stand-in for ``groups.getMembers`` served through ``httpx.MockTransport``."""
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.calls = 0
+        self.broken = False
+        self.transport = httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        assert request.url.path == "/method/groups.getMembers"
+        if self.broken:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"response": {"count": self.count}})
+
+
+def make_cache(api: FakeVkApi, **kwargs) -> VkFollowersCache:
+    return VkFollowersCache(
+        api_uri="https://vk.test",
+        token="token",
+        group_id="1",
+        version="5.199",
+        transport=api.transport,
+        **kwargs,
+    )
+
+
+class TestVkFollowersCache:
+    async def test_fresh_value_is_served_from_memory(self):
+        api = FakeVkApi(count=10)
+        cache = make_cache(api)
+
+        assert await cache.get() == 10
+        assert await cache.get() == 10
+        await cache.close()
+
+        assert api.calls == 1
+
+    async def test_stale_value_is_served_while_refreshing(self):
+        api = FakeVkApi(count=10)
+        cache = make_cache(api, ttl_seconds=0)
+        await cache.get()
+        api.count = 20
+
+        assert await cache.get() == 10
+        await asyncio.sleep(0.01)
+        assert await cache.get() == 20
+        await cache.close()
+
+    async def test_keeps_last_good_value_when_vk_fails(self):
+        api = FakeVkApi(count=10)
+        cache = make_cache(api, ttl_seconds=0, retry_seconds=60)
+        await cache.get()
+        api.broken = True
+
+        await cache.refresh()
+
+        assert await cache.get() == 10
+        await cache.close()
+
+    async def test_first_load_failure_returns_zero(self):
+        api = FakeVkApi(count=10)
+        api.broken = True
+        cache = make_cache(api)
+
+        assert await cache.get() == 0
+        await cache.close()